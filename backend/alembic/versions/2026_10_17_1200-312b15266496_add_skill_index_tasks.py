@@ -0,0 +1,43 @@
+"""Add skill index tasks
+
+Revision ID: 312b15266496
+Revises: 659e24c62baf
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "312b15266496"
+down_revision: str | None = "659e24c62baf"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "skill_index_tasks",
+        sa.Column("skill_id", sa.Integer(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_skill_index_tasks")),
+    )
+    op.create_index(op.f("ix_skill_index_tasks_available_at"), "skill_index_tasks", ["available_at"], unique=False)
+    op.create_index(op.f("ix_skill_index_tasks_id"), "skill_index_tasks", ["id"], unique=False)
+    op.create_index(op.f("ix_skill_index_tasks_skill_id"), "skill_index_tasks", ["skill_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_skill_index_tasks_skill_id"), table_name="skill_index_tasks")
+    op.drop_index(op.f("ix_skill_index_tasks_id"), table_name="skill_index_tasks")
+    op.drop_index(op.f("ix_skill_index_tasks_available_at"), table_name="skill_index_tasks")
+    op.drop_table("skill_index_tasks")
@@ -0,0 +1,38 @@
+"""Add messages keyset index
+
+Revision ID: 8f4c2d1a9b7e
+Revises: 312b15266496
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8f4c2d1a9b7e"
+down_revision: str | None = "312b15266496"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Built concurrently so a large messages table stays writable, the composite index also covers chat_id lookups
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_messages_chat_id_created_at_id",
+            "messages",
+            ["chat_id", "created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(op.f("ix_messages_chat_id"), table_name="messages", postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f("ix_messages_chat_id"), "messages", ["chat_id"], unique=False, postgresql_concurrently=True
+        )
+        op.drop_index("ix_messages_chat_id_created_at_id", table_name="messages", postgresql_concurrently=True)
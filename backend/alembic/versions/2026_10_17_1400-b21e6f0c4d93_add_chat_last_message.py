@@ -0,0 +1,50 @@
+"""Add chat last message
+
+Revision ID: b21e6f0c4d93
+Revises: 8f4c2d1a9b7e
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b21e6f0c4d93"
+down_revision: str | None = "8f4c2d1a9b7e"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("chats", sa.Column("last_message_id", sa.Integer(), nullable=True))
+    op.add_column("chats", sa.Column("last_message_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_foreign_key(
+        op.f("fk_chats_last_message_id_messages"),
+        "chats",
+        "messages",
+        ["last_message_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    op.execute(
+        """
+        UPDATE chats
+        SET last_message_id = last_messages.id, last_message_at = last_messages.created_at
+        FROM (
+            SELECT DISTINCT ON (chat_id) chat_id, id, created_at
+            FROM messages
+            ORDER BY chat_id, created_at DESC, id DESC
+        ) AS last_messages
+        WHERE last_messages.chat_id = chats.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(op.f("fk_chats_last_message_id_messages"), "chats", type_="foreignkey")
+    op.drop_column("chats", "last_message_at")
+    op.drop_column("chats", "last_message_id")
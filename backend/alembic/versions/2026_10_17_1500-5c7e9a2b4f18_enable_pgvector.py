@@ -0,0 +1,32 @@
+"""Enable pgvector
+
+Revision ID: 5c7e9a2b4f18
+Revises: b21e6f0c4d93
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c7e9a2b4f18"
+down_revision: str | None = "b21e6f0c4d93"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Only VECTOR_STORE=pgvector needs the extension, servers without it keep migrating.
+    # The skill_embeddings tables are created by the app, their dimension depends on the embeddings model.
+    available = op.get_bind().scalar(sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'vector'"))
+    if available:
+        op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+
+
+def downgrade() -> None:
+    # Also drops the skill_embeddings tables, they only hold vectors a reindex can rebuild
+    op.execute("DROP EXTENSION IF EXISTS vector CASCADE")
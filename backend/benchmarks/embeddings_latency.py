@@ -0,0 +1,52 @@
+"""Measure embedding latency of the local ONNX backend for single texts and batches.
+
+Needs onnxruntime and tokenizers. Texts are synthetic skill names of a few words, like the ones users search for.
+Run from the backend directory:
+
+    python -m benchmarks.embeddings_latency --model /models/multilingual-e5-small/model.onnx --batch-size 1 8 32
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.repositories.embeddings_onnx import OnnxEmbeddingsBackend
+
+WORDS = ["python", "гитара", "английский", "machine", "learning", "рисование", "шахматы", "design", "React", "йога"]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", type=Path, required=True)
+    parser.add_argument("--tokenizer", type=Path)
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    backend = OnnxEmbeddingsBackend(args.model, tokenizer_path=args.tokenizer, intra_op_threads=args.threads)
+    print(f"{backend.model_id}, dimension {backend.dimension}")
+    await backend.embed_documents(["warmup"])
+
+    print(f"{'batch':>6} {'p50 ms':>8} {'p95 ms':>8} {'texts/s':>9}")
+    for batch_size in args.batch_size:
+        latencies = []
+        for _ in range(args.iterations):
+            texts = [" ".join(rng.choice(WORDS, size=rng.integers(1, 5))) for _ in range(batch_size)]
+            started_at = time.perf_counter()
+            await backend.embed_documents(texts)
+            latencies.append((time.perf_counter() - started_at) * 1000)
+        p95 = statistics.quantiles(latencies, n=20)[-1]
+        throughput = batch_size * len(latencies) / sum(latencies) * 1000
+        print(f"{batch_size:>6} {statistics.median(latencies):>8.2f} {p95:>8.2f} {throughput:>9.0f}")
+    await backend.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
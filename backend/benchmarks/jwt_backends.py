@@ -0,0 +1,62 @@
+"""Compare access token encode/verify cost of the available JWT backends.
+
+Run from the backend directory: ``python -m benchmarks.jwt_backends``.
+"""
+
+import argparse
+import itertools
+import timeit
+from datetime import UTC, datetime, timedelta
+
+from src.core.jwt import CachingJWTBackend, HMACJWTBackend, JoseJWTBackend, JWTBackend
+
+SECRET_KEY = "benchmark-secret-key"  # noqa: S105
+
+
+def build_token(backend: JWTBackend, user_id: int) -> str:
+    return backend.encode(
+        {"sub": str(user_id), "type": "access", "exp": datetime.now(UTC) + timedelta(minutes=30)},
+    )
+
+
+def report(name: str, seconds: float, number: int) -> None:
+    print(f"{name:<28} {seconds / number * 1_000_000:>9.2f} us/op")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20_000, help="operations per measurement")
+    parser.add_argument("--algorithm", default="HS256")
+    parser.add_argument("--tokens", type=int, default=1_000, help="distinct tokens verified by the cached backend")
+    args = parser.parse_args()
+
+    backends: dict[str, JWTBackend] = {
+        "jose": JoseJWTBackend(SECRET_KEY, args.algorithm),
+        "hmac": HMACJWTBackend(SECRET_KEY, args.algorithm),
+    }
+    token = build_token(backends["jose"], 1)
+    for name, backend in backends.items():
+        report(
+            f"{name} encode",
+            timeit.timeit(lambda backend=backend: build_token(backend, 1), number=args.number),
+            args.number,
+        )
+        report(
+            f"{name} decode",
+            timeit.timeit(lambda backend=backend: backend.decode(token), number=args.number),
+            args.number,
+        )
+
+    # Warm cache: the same few tokens are verified over and over, as with a client polling the API
+    tokens = [build_token(backends["hmac"], user_id) for user_id in range(args.tokens)]
+    for name, backend in backends.items():
+        cached = CachingJWTBackend(backend, maxsize=args.tokens)
+        for cached_token in tokens:
+            cached.decode(cached_token)
+        cycle = itertools.cycle(tokens)
+        seconds = timeit.timeit(lambda cached=cached, cycle=cycle: cached.decode(next(cycle)), number=args.number)
+        report(f"cached {name} decode", seconds, args.number)
+
+
+if __name__ == "__main__":
+    main()
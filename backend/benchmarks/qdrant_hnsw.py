@@ -0,0 +1,134 @@
+"""Measure filtered search recall and latency of the skills collection for different HNSW settings.
+
+Needs a running Qdrant server (local mode always does exact search). Every (m, ef_construct) pair gets its own
+temporary collection with the production payload indexes, filled with synthetic clustered vectors; recall@k is
+measured against exact search for each hnsw_ef. Run from the backend directory:
+
+    python -m benchmarks.qdrant_hnsw --url http://localhost:6333 --points 100000 --m 16 32 --ef 64 128 256
+"""
+
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+
+import numpy as np
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http import models
+
+from src.enums.skill_type import SkillType
+from src.repositories.vector_search import PAYLOAD_INDEXES
+
+DIMENSION = 1024
+FILTER_TYPE = next(iter(SkillType))
+
+
+def generate_vectors(rng: np.random.Generator, count: int, clusters: int) -> np.ndarray:
+    # Skill names cluster by topic, uniform random vectors would make HNSW look much worse than it is
+    centers = rng.normal(size=(clusters, DIMENSION))
+    vectors = centers[rng.integers(clusters, size=count)] + rng.normal(scale=0.35, size=(count, DIMENSION))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+async def wait_until_indexed(client: AsyncQdrantClient, collection_name: str) -> None:
+    while True:
+        info = await client.get_collection(collection_name)
+        if info.status == models.CollectionStatus.GREEN:
+            return
+        await asyncio.sleep(1)
+
+
+async def fill_collection(
+    client: AsyncQdrantClient, collection_name: str, vectors: np.ndarray, hnsw_config: models.HnswConfigDiff
+) -> float:
+    await client.create_collection(
+        collection_name,
+        vectors_config=models.VectorParams(size=DIMENSION, distance=models.Distance.COSINE),
+        hnsw_config=hnsw_config,
+    )
+    for field_name, field_schema in PAYLOAD_INDEXES.items():
+        await client.create_payload_index(collection_name, field_name, field_schema=field_schema)
+
+    skill_types = list(SkillType)
+    started_at = time.perf_counter()
+    for offset in range(0, len(vectors), 1000):
+        await client.upsert(
+            collection_name,
+            points=[
+                models.PointStruct(
+                    id=point_id,
+                    vector=vectors[point_id].tolist(),
+                    payload={"type": skill_types[point_id % len(skill_types)].value, "user_id": point_id // 20},
+                )
+                for point_id in range(offset, min(offset + 1000, len(vectors)))
+            ],
+            wait=False,
+        )
+    await wait_until_indexed(client, collection_name)
+    return time.perf_counter() - started_at
+
+
+async def search(
+    client: AsyncQdrantClient, collection_name: str, query: np.ndarray, limit: int, params: models.SearchParams
+) -> tuple[set[int], float]:
+    query_filter = models.Filter(
+        must=[models.FieldCondition(key="type", match=models.MatchValue(value=FILTER_TYPE.value))]
+    )
+    started_at = time.perf_counter()
+    response = await client.query_points(
+        collection_name, query=query.tolist(), query_filter=query_filter, search_params=params, limit=limit
+    )
+    return {int(point.id) for point in response.points}, time.perf_counter() - started_at
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:6333")
+    parser.add_argument("--points", type=int, default=50_000)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=100, help="k for recall@k, the search window of the API")
+    parser.add_argument("--m", type=int, nargs="+", default=[16, 32])
+    parser.add_argument("--ef-construct", type=int, nargs="+", default=[100, 200])
+    parser.add_argument("--ef", type=int, nargs="+", default=[64, 128, 256, 512])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    vectors = generate_vectors(rng, args.points, args.clusters)
+    queries = generate_vectors(rng, args.queries, args.clusters)
+    client = AsyncQdrantClient(url=args.url, timeout=300)
+
+    print(f"{'m':>4} {'ef_constr':>9} {'build s':>8} {'hnsw_ef':>8} {'recall':>7} {'p50 ms':>7} {'p95 ms':>7}")
+    for m, ef_construct in itertools.product(args.m, args.ef_construct):
+        collection_name = f"bench_skills_m{m}_ef{ef_construct}"
+        await client.delete_collection(collection_name)
+        try:
+            build_time = await fill_collection(
+                client, collection_name, vectors, models.HnswConfigDiff(m=m, ef_construct=ef_construct)
+            )
+            exact_params = models.SearchParams(exact=True)
+            expected = [
+                (await search(client, collection_name, query, args.limit, exact_params))[0] for query in queries
+            ]
+
+            for hnsw_ef in args.ef:
+                params = models.SearchParams(hnsw_ef=hnsw_ef)
+                recalls, latencies = [], []
+                for query, exact_ids in zip(queries, expected, strict=True):
+                    found_ids, latency = await search(client, collection_name, query, args.limit, params)
+                    recalls.append(len(found_ids & exact_ids) / max(len(exact_ids), 1))
+                    latencies.append(latency * 1000)
+                p95 = statistics.quantiles(latencies, n=20)[-1]
+                print(
+                    f"{m:>4} {ef_construct:>9} {build_time:>8.1f} {hnsw_ef:>8} "
+                    f"{statistics.mean(recalls):>7.3f} {statistics.median(latencies):>7.2f} {p95:>7.2f}"
+                )
+        finally:
+            await client.delete_collection(collection_name)
+    await client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
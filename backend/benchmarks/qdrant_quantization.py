@@ -0,0 +1,105 @@
+"""Compare RAM footprint and recall of the skills collection with and without vector quantization.
+
+Needs a running Qdrant server (local mode ignores quantization). Each mode gets a temporary collection configured
+the way VectorSearchRepository creates it, filled with the same synthetic clustered corpus; recall@k is measured
+against exact search on the original vectors for every oversampling factor, with and without rescoring.
+Run from the backend directory:
+
+    python -m benchmarks.qdrant_quantization --url http://localhost:6333 --points 100000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import get_args
+
+import numpy as np
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http import models
+
+from benchmarks.qdrant_hnsw import DIMENSION, generate_vectors, wait_until_indexed
+from src.repositories.vector_search import QdrantVectorSearchRepository, QuantizationMode
+
+# Bytes per dimension kept in RAM for the HNSW traversal
+RAM_BYTES_PER_DIMENSION = {"none": 4.0, "scalar": 1.0, "binary": 1 / 8}
+
+
+async def fill_collection(
+    client: AsyncQdrantClient, collection_name: str, vectors: np.ndarray, quantization: QuantizationMode
+) -> None:
+    repository = QdrantVectorSearchRepository(client, quantization=quantization)
+    await repository.create_shadow_collection(collection_name)
+    for offset in range(0, len(vectors), 1000):
+        await client.upsert(
+            collection_name,
+            points=[
+                models.PointStruct(id=point_id, vector=vectors[point_id].tolist(), payload={"user_id": point_id})
+                for point_id in range(offset, min(offset + 1000, len(vectors)))
+            ],
+            wait=False,
+        )
+    await wait_until_indexed(client, collection_name)
+
+
+async def search(
+    client: AsyncQdrantClient, collection_name: str, query: np.ndarray, limit: int, params: models.SearchParams
+) -> tuple[set[int], float]:
+    started_at = time.perf_counter()
+    response = await client.query_points(collection_name, query=query.tolist(), search_params=params, limit=limit)
+    return {int(point.id) for point in response.points}, time.perf_counter() - started_at
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:6333")
+    parser.add_argument("--points", type=int, default=50_000)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--oversampling", type=float, nargs="+", default=[1.0, 2.0, 4.0])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    vectors = generate_vectors(rng, args.points, args.clusters)
+    queries = generate_vectors(rng, args.queries, args.clusters)
+    client = AsyncQdrantClient(url=args.url, timeout=300)
+    exact_params = models.SearchParams(exact=True, quantization=models.QuantizationSearchParams(ignore=True))
+
+    print(f"{'mode':>7} {'RAM MiB':>8} {'saved':>6} {'oversmp':>7} {'rescore':>7} {'recall':>7} {'p50 ms':>7}")
+    baseline_ram = args.points * DIMENSION * RAM_BYTES_PER_DIMENSION["none"] / 2**20
+    for quantization in get_args(QuantizationMode):
+        collection_name = f"bench_skills_{quantization}"
+        await client.delete_collection(collection_name)
+        try:
+            await fill_collection(client, collection_name, vectors, quantization)
+            expected = [
+                (await search(client, collection_name, query, args.limit, exact_params))[0] for query in queries
+            ]
+            # Vector storage only: the HNSW graph and payloads cost the same in every mode
+            ram = args.points * DIMENSION * RAM_BYTES_PER_DIMENSION[quantization] / 2**20
+            variants = (
+                [(1.0, False)] if quantization == "none" else [(x, r) for x in args.oversampling for r in (False, True)]
+            )
+
+            for oversampling, rescore in variants:
+                params = models.SearchParams(
+                    quantization=models.QuantizationSearchParams(rescore=rescore, oversampling=oversampling)
+                )
+                recalls, latencies = [], []
+                for query, exact_ids in zip(queries, expected, strict=True):
+                    found_ids, latency = await search(client, collection_name, query, args.limit, params)
+                    recalls.append(len(found_ids & exact_ids) / max(len(exact_ids), 1))
+                    latencies.append(latency * 1000)
+                print(
+                    f"{quantization:>7} {ram:>8.1f} {1 - ram / baseline_ram:>6.0%} {oversampling:>7.1f} "
+                    f"{rescore!s:>7} {statistics.mean(recalls):>7.3f} {statistics.median(latencies):>7.2f}"
+                )
+        finally:
+            await client.delete_collection(collection_name)
+    await client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
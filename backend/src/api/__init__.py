@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from src.api.v1 import auth, chats, skills, users
+from src.api.v1 import auth, chats, matches, metrics, skills, users
 
 router = APIRouter(prefix="/v1")
 router.include_router(auth.router)
@@ -8,3 +8,5 @@ router.include_router(users.router)
 router.include_router(skills.router)
 router.include_router(chats.router)
 router.include_router(chats.ws_router)
+router.include_router(matches.router)
+router.include_router(metrics.router)
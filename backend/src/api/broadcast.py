@@ -0,0 +1,92 @@
+import asyncio
+import contextlib
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[int, str], Awaitable[None]]
+
+
+class BroadcastBackend(ABC):
+    @abstractmethod
+    async def start(self, deliver: Deliver) -> None: ...
+
+    @abstractmethod
+    async def stop(self) -> None: ...
+
+    @abstractmethod
+    async def publish(self, chat_id: int, payload: str) -> None: ...
+
+
+class LocalBroadcastBackend(BroadcastBackend):
+    def __init__(self) -> None:
+        self._deliver: Deliver | None = None
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    async def stop(self) -> None:
+        self._deliver = None
+
+    async def publish(self, chat_id: int, payload: str) -> None:
+        if self._deliver is not None:
+            await self._deliver(chat_id, payload)
+
+
+class RedisBroadcastBackend(BroadcastBackend):
+    def __init__(self, redis: Redis, channel_prefix: str = "chat", reconnect_delay: float = 1.0) -> None:
+        self._redis = redis
+        self._channel_prefix = channel_prefix
+        self._reconnect_delay = reconnect_delay
+        self._deliver: Deliver | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    def _channel(self, chat_id: int) -> str:
+        return f"{self._channel_prefix}:{chat_id}"
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        self._deliver = None
+
+    async def publish(self, chat_id: int, payload: str) -> None:
+        await self._redis.publish(self._channel(chat_id), payload)
+
+    async def _listen(self) -> None:
+        # One pattern subscription per worker, every chat event is fanned out to the local connections only
+        while True:
+            try:
+                async with self._redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.psubscribe(f"{self._channel_prefix}:*")
+                    async for event in pubsub.listen():
+                        await self._handle(event)
+            except RedisError:
+                logger.exception("Chat broadcast subscription lost, reconnecting")
+                await asyncio.sleep(self._reconnect_delay)
+
+    async def _handle(self, event: dict) -> None:
+        if event.get("type") != "pmessage" or self._deliver is None:
+            return
+        try:
+            chat_id = int(event["channel"].rsplit(b":", 1)[1])
+            payload = event["data"].decode()
+        except (ValueError, IndexError):
+            logger.warning("Malformed chat broadcast event on %s", event.get("channel"))
+            return
+        try:
+            await self._deliver(chat_id, payload)
+        except Exception:
+            logger.exception("Failed to deliver chat %s broadcast", chat_id)
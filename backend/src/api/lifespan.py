@@ -4,8 +4,16 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from redis.asyncio import Redis
 
+from src.api.broadcast import BroadcastBackend, LocalBroadcastBackend, RedisBroadcastBackend
+from src.api.websocket import manager
+from src.core.config import Settings
 from src.db.manager import DatabaseManager
+from src.repositories.principal_cache import PrincipalCacheRepository
 from src.repositories.vector_search import VectorSearchRepository
+from src.services.message_writer import MessageWriter
+from src.services.refresh_token_audit import RefreshTokenAuditWriter
+from src.workers.match_recommendations import MatchRecommendationsWorker
+from src.workers.skill_indexing import SkillIndexingWorker
 
 
 @asynccontextmanager
@@ -17,8 +25,43 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         vector_search_repository: VectorSearchRepository = await request_container.get(VectorSearchRepository)
         await vector_search_repository.create_collection()
 
+        settings: Settings = await request_container.get(Settings)
+        message_writer: MessageWriter = await request_container.get(MessageWriter)
+        refresh_token_audit_writer: RefreshTokenAuditWriter = await request_container.get(RefreshTokenAuditWriter)
+        principal_cache: PrincipalCacheRepository = await request_container.get(PrincipalCacheRepository)
+
+    broadcast_backend: BroadcastBackend = (
+        RedisBroadcastBackend(redis_client, channel_prefix=settings.websocket.channel_prefix)
+        if settings.websocket.broadcast_backend == "redis"
+        else LocalBroadcastBackend()
+    )
+    await manager.start(broadcast_backend)
+    await message_writer.start()
+    await refresh_token_audit_writer.start()
+    await principal_cache.start()
+
+    skill_indexing_worker = SkillIndexingWorker(
+        app.state.dishka_container,
+        batch_size=settings.indexing.batch_size,
+        poll_interval=settings.indexing.poll_interval,
+    )
+    skill_indexing_worker.start()
+    match_recommendations_worker = MatchRecommendationsWorker(
+        app.state.dishka_container,
+        batch_size=settings.matching.refresh_batch_size,
+        poll_interval=settings.matching.refresh_poll_interval,
+    )
+    match_recommendations_worker.start()
+
     yield
 
+    await manager.stop()
+    await message_writer.stop()
+    await refresh_token_audit_writer.stop()
+    await principal_cache.stop()
+    await match_recommendations_worker.stop()
+    await skill_indexing_worker.stop()
+
     async with app.state.dishka_container() as request_container:
         db_manager: DatabaseManager = await request_container.get(DatabaseManager)
         await db_manager.dispose()
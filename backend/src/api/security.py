@@ -1,16 +1,19 @@
+import hmac
 from typing import Annotated
 
 from dishka.integrations.fastapi import FromDishka, inject
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from src.core.config import Settings
 from src.exceptions.auth import (
     InactiveOrNotExistingUserError,
     InvalidJWTError,
+    InvalidMetricsTokenError,
     InvalidTokenError,
     JWTSignatureExpiredError,
 )
-from src.models.user import User
+from src.schemas.user import UserRead
 from src.services.token import TokenService
 
 bearer_scheme = HTTPBearer(auto_error=False)
@@ -19,7 +22,7 @@ bearer_scheme = HTTPBearer(auto_error=False)
 async def _get_current_user(
     token_service: TokenService,
     credentials: HTTPAuthorizationCredentials | None,
-) -> User:
+) -> UserRead:
     try:
         return await token_service.get_current_user(
             token=credentials.credentials if credentials else None,
@@ -39,7 +42,7 @@ async def _get_current_user(
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(bearer_scheme)],
     token_service: FromDishka[TokenService],
-) -> User:
+) -> UserRead:
     return await _get_current_user(token_service, credentials)
 
 
@@ -47,11 +50,34 @@ async def get_current_user(
 async def get_current_user_or_none(
     credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(bearer_scheme)],
     token_service: FromDishka[TokenService],
-) -> User | None:
+) -> UserRead | None:
     if not credentials:
         return None
     return await _get_current_user(token_service, credentials)
 
 
-CurrentUserDependency = Annotated[User, Depends(get_current_user)]
-CurrentUserOrNoneDependency = Annotated[User | None, Depends(get_current_user_or_none)]
+@inject
+async def require_metrics_token(
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(bearer_scheme)],
+    settings: FromDishka[Settings],
+) -> None:
+    # Operational metrics are meant for monitoring, not for users: they stay disabled until a token is configured
+    token = settings.metrics.token
+    if token is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    if credentials is None or not hmac.compare_digest(
+        credentials.credentials.encode(), token.get_secret_value().encode()
+    ):
+        e = InvalidMetricsTokenError("Could not validate credentials: invalid metrics token")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail={
+                "error_key": e.error_key,
+                "message": e.message,
+            },
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+CurrentUserDependency = Annotated[UserRead, Depends(get_current_user)]
+CurrentUserOrNoneDependency = Annotated[UserRead | None, Depends(get_current_user_or_none)]
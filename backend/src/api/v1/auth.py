@@ -4,7 +4,7 @@ from dishka.integrations.fastapi import DishkaRoute, FromDishka
 from fastapi import APIRouter, Body, HTTPException, status
 
 from src.db.uow import SQLAlchemyUnitOfWork
-from src.exceptions.auth import InvalidTokenError
+from src.exceptions.auth import InvalidTokenError, PasswordHashingOverloadedError
 from src.exceptions.user import (
     IncorrectCredentialsError,
     UserEmailAlreadyExistsError,
@@ -67,11 +67,23 @@ router = APIRouter(route_class=DishkaRoute, prefix="/auth", tags=["Auth"])
                 }
             },
         },
+        503: {
+            "description": "Сервис хеширования паролей перегружен, повторите запрос позже",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "error_key": "password_hashing_overloaded",
+                        "message": "Too many password hashing requests, try again later",
+                    }
+                }
+            },
+        },
     },
 )
 async def register(
     user_in: UserCreate,
     user_service: FromDishka[UserService],
+    security_service: FromDishka[SecurityService],
     uow: FromDishka[SQLAlchemyUnitOfWork],
 ) -> UserRead:
     async with uow:
@@ -79,7 +91,7 @@ async def register(
             user = await user_service.create(
                 username=user_in.username,
                 email=user_in.email,
-                hashed_password=SecurityService.get_password_hash(user_in.password),
+                hashed_password=await security_service.get_password_hash(user_in.password),
             )
             await uow.commit()
             return user
@@ -99,6 +111,15 @@ async def register(
                     "message": e.message,
                 },
             ) from e
+        except PasswordHashingOverloadedError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail={
+                    "error_key": e.error_key,
+                    "message": e.message,
+                },
+                headers={"Retry-After": "1"},
+            ) from e
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -146,6 +167,17 @@ async def register(
                 }
             },
         },
+        503: {
+            "description": "Сервис хеширования паролей перегружен, повторите запрос позже",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "error_key": "password_hashing_overloaded",
+                        "message": "Too many password hashing requests, try again later",
+                    }
+                }
+            },
+        },
     },
 )
 async def login(
@@ -163,6 +195,7 @@ async def login(
             )
             tokens = await token_service.create_tokens(int(user.id))
             await uow.commit()
+            await token_service.activate_refresh_token(int(user.id), tokens.refresh_token)
             return tokens
         except IncorrectCredentialsError as e:
             raise HTTPException(
@@ -172,6 +205,15 @@ async def login(
                     "message": e.message,
                 },
             ) from e
+        except PasswordHashingOverloadedError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail={
+                    "error_key": e.error_key,
+                    "message": e.message,
+                },
+                headers={"Retry-After": "1"},
+            ) from e
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -209,12 +251,22 @@ async def login(
             },
         },
         401: {
-            "description": "Невалидный или истёкший refresh токен",
+            "description": "Невалидный, истёкший или повторно использованный refresh токен",
             "content": {
                 "application/json": {
-                    "example": {
-                        "error_key": "invalid_refresh_token",
-                        "message": "Invalid refresh token",
+                    "examples": {
+                        "invalid_refresh_token": {
+                            "value": {
+                                "error_key": "invalid_refresh_token",
+                                "message": "Invalid refresh token",
+                            }
+                        },
+                        "refresh_token_reused": {
+                            "value": {
+                                "error_key": "refresh_token_reused",
+                                "message": "Refresh token has already been used, all sessions were revoked",
+                            }
+                        },
                     }
                 }
             },
@@ -10,8 +10,10 @@ from src.api.security import CurrentUserDependency
 from src.api.websocket import manager
 from src.db.uow import SQLAlchemyUnitOfWork
 from src.exceptions.chat import ChatAccessDeniedError, ChatNotFoundError, InvalidChatMembersError
-from src.schemas.chat import ChatCreate, ChatRead, MessageCreate, MessageRead
+from src.exceptions.pagination import InvalidCursorError
+from src.schemas.chat import ChatCreate, ChatRead, MessageCreate, MessageRead, MessagesPage
 from src.services.chat import ChatService
+from src.services.message_writer import MessageWriter
 from src.services.token import TokenService
 
 logger = logging.getLogger(__name__)
@@ -120,23 +122,36 @@ async def get_chat(
 @router.get(
     "/{chat_id}/messages",
     summary="Получение истории сообщений",
-    description="Получение сообщений чата с пагинацией",
+    description="Получение сообщений чата от новых к старым. Для бесконечной прокрутки передавайте before_cursor "
+    "из предыдущего ответа в параметр before (более старые сообщения) или after_cursor в параметр after "
+    "(более новые). Пагинация через offset сохранена для совместимости",
     responses={
-        200: {"description": "История сообщений", "model": dict},
+        200: {"description": "История сообщений", "model": MessagesPage},
+        400: {"description": "Некорректный курсор"},
         401: {"description": "Не аутентифицирован"},
         403: {"description": "Нет доступа к чату"},
         404: {"description": "Чат не найден"},
     },
 )
 async def get_chat_messages(
+    *,
     chat_id: Annotated[int, Path(gt=0)],
     current_user: CurrentUserDependency,
     chat_service: FromDishka[ChatService],
     limit: Annotated[int, Query(ge=1, le=100)] = 100,
     offset: Annotated[int, Query(ge=0)] = 0,
-) -> dict:
+    before: Annotated[str | None, Query(description="Курсор: сообщения старше указанного")] = None,
+    after: Annotated[str | None, Query(description="Курсор: сообщения новее указанного")] = None,
+) -> MessagesPage:
     try:
-        messages, total = await chat_service.get_chat_messages(chat_id, current_user.id, limit, offset)
+        page = await chat_service.get_chat_messages_page(
+            chat_id, current_user.id, limit, offset, before=before, after=after
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error_key": e.error_key, "message": str(e)},
+        ) from e
     except ChatNotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -148,7 +163,7 @@ async def get_chat_messages(
             detail={"error_key": e.error_key, "message": str(e)},
         ) from e
     else:
-        return {"items": messages, "total": total}
+        return page
 
 
 @router.post(
@@ -222,6 +237,8 @@ async def websocket_chat_endpoint(
         logger.warning("WebSocket user (%s) denied access to chat (%s)", current_user.id, chat_id)
         return
 
+    message_writer = await container.get(MessageWriter)
+
     try:
         await manager.connect(chat_id, websocket)
 
@@ -266,11 +283,7 @@ async def websocket_chat_endpoint(
                         continue
 
                     try:
-                        async with container() as request_container:
-                            chat_service = await request_container.get(ChatService)
-                            uow = await request_container.get(SQLAlchemyUnitOfWork)
-                            message = await chat_service.create_message(chat_id, current_user.id, text, current_user.id)
-                            await uow.commit()
+                        message = await message_writer.write(chat_id, current_user.id, text)
                         await manager.broadcast(
                             chat_id,
                             {
@@ -0,0 +1,51 @@
+from typing import Annotated
+
+from dishka.integrations.fastapi import DishkaRoute, FromDishka
+from fastapi import APIRouter, Query, Response
+
+from src.api.security import CurrentUserDependency
+from src.db.uow import SQLAlchemyUnitOfWork
+from src.schemas.match import MatchRead
+from src.services.match import MatchService
+
+router = APIRouter(route_class=DishkaRoute, prefix="/matches", tags=["Matches"])
+
+
+@router.get(
+    "",
+    summary="Подбор партнеров для обмена навыками",
+    description="Пользователи, которые умеют то, чему хочет научиться текущий пользователь (OUTGOING ↔ INCOMING), "
+    "и хотят научиться тому, что умеет он. Результаты отсортированы по взаимной оценке совпадения. "
+    "Общее количество найденных партнеров возвращается в заголовке X-Total-Count",
+    responses={
+        200: {
+            "description": "Список подходящих партнеров",
+            "model": list[MatchRead],
+            "headers": {"X-Total-Count": {"description": "Общее количество партнеров (без учета пагинации)"}},
+        },
+        401: {
+            "description": "Не аутентифицирован",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "error_key": "invalid_refresh_token",
+                        "message": "Could not validate credentials: no scheme or token in Authorization header",
+                    }
+                }
+            },
+        },
+    },
+)
+async def get_matches(
+    *,
+    response: Response,
+    current_user: CurrentUserDependency,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    match_service: FromDishka[MatchService] = None,
+    uow: FromDishka[SQLAlchemyUnitOfWork] = None,
+) -> list[MatchRead]:
+    async with uow:
+        matches, total = await match_service.get_matches(current_user.id, limit, offset)
+        response.headers["X-Total-Count"] = str(total)
+        return matches
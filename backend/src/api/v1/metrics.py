@@ -0,0 +1,63 @@
+from dishka.integrations.fastapi import DishkaRoute, FromDishka
+from fastapi import APIRouter, Depends
+
+from src.api.security import require_metrics_token
+from src.schemas.indexing import IndexingLagRead
+from src.schemas.security import PasswordHashingStatsRead
+from src.services.security import SecurityService
+from src.services.skill_indexing import SkillIndexingService
+
+router = APIRouter(
+    route_class=DishkaRoute,
+    prefix="/metrics",
+    tags=["Metrics"],
+    dependencies=[Depends(require_metrics_token)],
+    responses={
+        401: {
+            "description": "Неверный токен метрик (METRICS__TOKEN)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "error_key": "invalid_metrics_token",
+                        "message": "Could not validate credentials: invalid metrics token",
+                    }
+                }
+            },
+        },
+        404: {"description": "Метрики отключены: METRICS__TOKEN не задан"},
+    },
+)
+
+
+@router.get(
+    "/indexing",
+    summary="Отставание индексации навыков",
+    description="Количество навыков, ожидающих индексации в векторной базе, и возраст самой старой задачи",
+    responses={
+        200: {
+            "description": "Состояние очереди индексации",
+            "model": IndexingLagRead,
+        },
+    },
+)
+async def get_indexing_lag(
+    indexing_service: FromDishka[SkillIndexingService],
+) -> IndexingLagRead:
+    return await indexing_service.get_lag()
+
+
+@router.get(
+    "/password-hashing",
+    summary="Нагрузка на хеширование паролей",
+    description="Состояние пула потоков, хеширующих пароли при регистрации и входе: очередь, отказы и задержки",
+    responses={
+        200: {
+            "description": "Состояние пула хеширования паролей",
+            "model": PasswordHashingStatsRead,
+        },
+    },
+)
+async def get_password_hashing_stats(
+    security_service: FromDishka[SecurityService],
+) -> PasswordHashingStatsRead:
+    return security_service.get_stats()
@@ -7,7 +7,7 @@ from src.api.security import CurrentUserDependency
 from src.db.uow import SQLAlchemyUnitOfWork
 from src.enums.skill_type import SkillType
 from src.exceptions.skill import SkillAccessDeniedError, SkillNotFoundError
-from src.schemas.skills import SkillBulkDelete, SkillCreate, SkillRead, SkillUpdate
+from src.schemas.skills import SkillBulkCreate, SkillBulkDelete, SkillCreate, SkillRead, SkillSearchRead, SkillUpdate
 from src.services.skill import SkillService
 
 router = APIRouter(route_class=DishkaRoute, prefix="/skills", tags=["Skills"])
@@ -76,6 +76,58 @@ async def create_skill(
             ) from e
 
 
+@router.post(
+    "/bulk",
+    summary="Массовое создание навыков",
+    description="Добавление нескольких навыков текущего пользователя одним запросом (до 100 навыков)",
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        201: {
+            "description": "Навыки успешно созданы",
+            "model": list[SkillRead],
+        },
+        400: {
+            "description": "Ошибка валидации данных",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": [
+                            {
+                                "type": "too_short",
+                                "loc": ["body", "skills"],
+                                "msg": "List should have at least 1 item after validation, not 0",
+                                "input": [],
+                            }
+                        ]
+                    }
+                }
+            },
+        },
+        401: {
+            "description": "Не аутентифицирован",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "error_key": "invalid_refresh_token",
+                        "message": "Could not validate credentials: no scheme or token in Authorization header",
+                    }
+                }
+            },
+        },
+    },
+)
+async def bulk_create_skills(
+    bulk_create: SkillBulkCreate,
+    current_user: CurrentUserDependency,
+    skill_service: FromDishka[SkillService],
+    uow: FromDishka[SQLAlchemyUnitOfWork],
+) -> list[SkillRead]:
+    async with uow:
+        skills = await skill_service.bulk_create_skills(current_user.id, bulk_create.skills)
+        await uow.commit()
+        return list(skills)
+
+
 @router.get(
     "/users/{user_id}",
     summary="Получение списка навыков пользователя",
@@ -335,7 +387,24 @@ async def bulk_delete_skills(
             ) from e
 
 
-@router.get("/vector-search")
+@router.get(
+    "/vector-search",
+    summary="Векторный поиск навыков",
+    description=(
+        "Поиск навыков, близких по смыслу к запросу. Результаты берутся из окна лучших кандидатов размером "
+        "QDRANT__SEARCH_WINDOW_SIZE (PGVECTOR__SEARCH_WINDOW_SIZE), поэтому страницы с offset за пределами окна "
+        "пусты. Общее количество результатов в заголовке X-Total-Count не превышает размер окна"
+    ),
+    responses={
+        200: {
+            "description": "Найденные навыки в порядке убывания релевантности",
+            "model": list[SkillSearchRead],
+            "headers": {
+                "X-Total-Count": {"description": "Количество доступных результатов, не больше размера окна поиска"}
+            },
+        },
+    },
+)
 async def get_skills_by_vector_search(
     response: Response,
     query: Annotated[str, Query()],
@@ -343,7 +412,7 @@ async def get_skills_by_vector_search(
     offset: Annotated[int, Query(ge=0)] = 0,
     skill_type: Annotated[SkillType | None, Query()] = None,
     skill_service: FromDishka[SkillService] = None,
-) -> list[SkillRead]:
+) -> list[SkillSearchRead]:
     result, total = await skill_service.search_skills_by_query(query, skill_type=skill_type, limit=limit, offset=offset)
     response.headers["X-Total-Count"] = str(total)
     return result
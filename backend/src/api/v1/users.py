@@ -1,7 +1,7 @@
 from typing import Annotated
 
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
-from fastapi import APIRouter, HTTPException, Path, status
+from fastapi import APIRouter, HTTPException, Path, Query, Response, status
 
 from src.api.security import CurrentUserDependency
 from src.db.uow import SQLAlchemyUnitOfWork
@@ -12,7 +12,9 @@ from src.exceptions.user import (
     UserNicknameAlreadyExistsError,
     UserNotFoundError,
 )
+from src.schemas.match import MatchRead
 from src.schemas.user import UserPatch, UserRead, UserUpdate
+from src.services.match import MatchService
 from src.services.user import UserService
 
 router = APIRouter(route_class=DishkaRoute, prefix="/users", tags=["Users"])
@@ -107,6 +109,7 @@ async def update_user(
                 email=user_in.email,
             )
             await uow.commit()
+            await user_service.invalidate_principal(user.id)
             return user
         except UserNotFoundError as e:
             raise HTTPException(
@@ -184,7 +187,47 @@ async def update_user(
 async def get_current_user_profile(
     current_user: CurrentUserDependency,
 ) -> UserRead:
-    return UserRead.model_validate(current_user)
+    return current_user
+
+
+@router.get(
+    "/me/matches",
+    summary="Рекомендованные партнеры текущего пользователя",
+    description="Предварительно рассчитанный список партнеров для обмена навыками. Список пересчитывается в фоне "
+    "при изменении навыков пользователя и его соседей. Общее количество возвращается в заголовке X-Total-Count",
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {
+            "description": "Список рекомендованных партнеров",
+            "model": list[MatchRead],
+            "headers": {"X-Total-Count": {"description": "Общее количество партнеров (без учета пагинации)"}},
+        },
+        401: {
+            "description": "Не аутентифицирован",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "error_key": "invalid_refresh_token",
+                        "message": "Could not validate credentials: no scheme or token in Authorization header",
+                    }
+                }
+            },
+        },
+    },
+)
+async def get_current_user_matches(
+    *,
+    response: Response,
+    current_user: CurrentUserDependency,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    match_service: FromDishka[MatchService],
+    uow: FromDishka[SQLAlchemyUnitOfWork],
+) -> list[MatchRead]:
+    async with uow:
+        matches, total = await match_service.get_recommendations(current_user.id, limit, offset)
+        response.headers["X-Total-Count"] = str(total)
+        return matches
 
 
 @router.patch(
@@ -264,6 +307,7 @@ async def update_current_user_profile(
                 email=user_in.email,
             )
             await uow.commit()
+            await user_service.invalidate_principal(user.id)
             return user
         except UserNicknameAlreadyExistsError as e:
             raise HTTPException(
@@ -388,6 +432,7 @@ async def edit_user(
                 email=user_in.email,
             )
             await uow.commit()
+            await user_service.invalidate_principal(user.id)
             return user
         except UserNotFoundError as e:
             raise HTTPException(
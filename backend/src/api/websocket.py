@@ -1,44 +1,129 @@
+import asyncio
+import contextlib
+import json
 import logging
 
-from fastapi import WebSocket
+from fastapi import WebSocket, status
+
+from src.api.broadcast import BroadcastBackend, LocalBroadcastBackend
+from src.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+class ConnectionWriter:
+    def __init__(self, websocket: WebSocket, queue_size: int = 100, send_timeout: float = 5.0) -> None:
+        self.websocket = websocket
+        self._send_timeout = send_timeout
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=queue_size)
+        self._task = asyncio.create_task(self._run())
+        self.closed = False
+
+    def send(self, payload: str) -> bool:
+        if self.closed:
+            return False
+        try:
+            self._queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            logger.warning("WebSocket outbound queue overflow, dropping slow client")
+            self.close(status.WS_1013_TRY_AGAIN_LATER, "Client is too slow")
+            return False
+        return True
+
+    def close(self, code: int, reason: str) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self._task.cancel()
+        task = asyncio.create_task(self._close(code, reason))
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+
+    async def stop(self) -> None:
+        self.closed = True
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+
+    async def _close(self, code: int, reason: str) -> None:
+        with contextlib.suppress(Exception):
+            await asyncio.wait_for(self.websocket.close(code=code, reason=reason), self._send_timeout)
+
+    async def _run(self) -> None:
+        while True:
+            payload = await self._queue.get()
+            try:
+                await asyncio.wait_for(self.websocket.send_text(payload), self._send_timeout)
+            except TimeoutError:
+                logger.warning("WebSocket send timed out, dropping slow client")
+                self.close(status.WS_1013_TRY_AGAIN_LATER, "Client is too slow")
+                return
+            except Exception:
+                logger.exception("Error sending message to connection")
+                self.closed = True
+                return
+
+
 class ConnectionManager:
-    def __init__(self) -> None:
-        self.active_connections: dict[int, list[WebSocket]] = {}
+    def __init__(
+        self, backend: BroadcastBackend | None = None, queue_size: int = 100, send_timeout: float = 5.0
+    ) -> None:
+        self.active_connections: dict[int, dict[WebSocket, ConnectionWriter]] = {}
+        self.backend = backend or LocalBroadcastBackend()
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+
+    async def start(self, backend: BroadcastBackend | None = None) -> None:
+        if backend is not None:
+            self.backend = backend
+        await self.backend.start(self.deliver)
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+        writers = [writer for connections in self.active_connections.values() for writer in connections.values()]
+        await asyncio.gather(*(writer.stop() for writer in writers))
 
     async def connect(self, chat_id: int, websocket: WebSocket) -> None:
         await websocket.accept()
-        if chat_id not in self.active_connections:
-            self.active_connections[chat_id] = []
-        self.active_connections[chat_id].append(websocket)
+        self.active_connections.setdefault(chat_id, {})[websocket] = ConnectionWriter(
+            websocket, queue_size=self.queue_size, send_timeout=self.send_timeout
+        )
 
     def disconnect(self, chat_id: int, websocket: WebSocket) -> None:
-        if chat_id in self.active_connections:
-            self.active_connections[chat_id].remove(websocket)
-            if not self.active_connections[chat_id]:
-                del self.active_connections[chat_id]
+        connections = self.active_connections.get(chat_id)
+        if connections is None:
+            return
+        writer = connections.pop(websocket, None)
+        if writer is not None:
+            writer.close(status.WS_1000_NORMAL_CLOSURE, "")
+        if not connections:
+            del self.active_connections[chat_id]
 
     async def broadcast(self, chat_id: int, message: dict) -> None:
-        if chat_id in self.active_connections:
-            disconnected = []
-            for connection in self.active_connections[chat_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception:
-                    logger.exception("Error sending message to connection")
-                    disconnected.append(connection)
-
-            for connection in disconnected:
-                self.disconnect(chat_id, connection)
+        await self.backend.publish(chat_id, json.dumps(message))
+
+    async def deliver(self, chat_id: int, payload: str) -> None:
+        # Only enqueues: every socket has its own writer, so a stalled client never delays the others
+        connections = self.active_connections.get(chat_id)
+        if not connections:
+            return
+        for websocket, writer in list(connections.items()):
+            if not writer.send(payload):
+                self.disconnect(chat_id, websocket)
 
     async def send_personal(self, websocket: WebSocket, message: dict) -> None:
+        # Goes through the connection's writer when there is one, so it never races a broadcast on the same socket
+        for connections in self.active_connections.values():
+            writer = connections.get(websocket)
+            if writer is not None:
+                writer.send(json.dumps(message))
+                return
         try:
             await websocket.send_json(message)
         except Exception:
             logger.exception("Error sending personal message")
 
 
-manager = ConnectionManager()
+manager = ConnectionManager(
+    queue_size=settings.websocket.send_queue_size,
+    send_timeout=settings.websocket.send_timeout,
+)
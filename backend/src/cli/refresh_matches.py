@@ -0,0 +1,45 @@
+import argparse
+import asyncio
+import logging
+
+from src.core.di.container import container
+from src.db.manager import DatabaseManager
+from src.repositories.match_recommendations import MatchRecommendationsRepository
+from src.repositories.user import UserRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def enqueue_all_users(batch_size: int) -> int:
+    db_manager = await container.get(DatabaseManager)
+    recommendations_repository = await container.get(MatchRecommendationsRepository)
+
+    total = 0
+    last_user_id = 0
+    async with db_manager.session_factory() as session:
+        user_repository = UserRepository(session)
+        while user_ids := await user_repository.get_ids_after(last_user_id, batch_size):
+            await recommendations_repository.mark_dirty(list(user_ids), include_matched_by=False)
+            last_user_id = user_ids[-1]
+            total += len(user_ids)
+    return total
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Queue every user for a match recommendations refresh by the running application"
+    )
+    parser.add_argument("--batch-size", type=int, default=1000, help="users read from Postgres per query")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        total = await enqueue_all_users(args.batch_size)
+        logger.info("Queued %s users for a match recommendations refresh", total)
+    finally:
+        await (await container.get(DatabaseManager)).dispose()
+        await container.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,210 @@
+import argparse
+import asyncio
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from dishka import AsyncContainer
+
+from src.core.di.container import container
+from src.db.manager import DatabaseManager
+from src.db.uow import SQLAlchemyUnitOfWork
+from src.repositories.embeddings_batcher import EmbeddingsBatcher
+from src.repositories.skill import SkillRepository
+from src.repositories.skill_index_task import SkillIndexTaskRepository
+from src.repositories.vector_search import VectorSearchRepository
+from src.services.skill_indexing import SkillIndexingService
+
+logger = logging.getLogger(__name__)
+
+SkillDocument = tuple[int, str, dict[str, Any]]
+
+
+@dataclass
+class ReindexCheckpoint:
+    collection: str
+    last_skill_id: int
+    started_at: datetime
+
+    @classmethod
+    def load(cls, path: Path) -> "ReindexCheckpoint | None":
+        if not path.exists():
+            return None
+        data = json.loads(path.read_text())
+        return cls(
+            collection=data["collection"],
+            last_skill_id=data["last_skill_id"],
+            started_at=datetime.fromisoformat(data["started_at"]),
+        )
+
+    def save(self, path: Path) -> None:
+        data = {
+            "collection": self.collection,
+            "last_skill_id": self.last_skill_id,
+            "started_at": self.started_at.isoformat(),
+        }
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data))
+        tmp_path.replace(path)
+
+
+class SkillsReindexer:
+    def __init__(
+        self,
+        container: AsyncContainer,
+        checkpoint_path: Path,
+        *,
+        batch_size: int = 512,
+        concurrency: int = 4,
+    ) -> None:
+        self._container = container
+        self._checkpoint_path = checkpoint_path
+        self._batch_size = batch_size
+        self._concurrency = concurrency
+
+    async def run(self, *, keep_previous: bool = False) -> None:
+        vector_search_repository = await self._container.get(VectorSearchRepository)
+
+        checkpoint = ReindexCheckpoint.load(self._checkpoint_path)
+        if checkpoint is None:
+            started_at = datetime.now(UTC)
+            checkpoint = ReindexCheckpoint(
+                collection=f"{vector_search_repository.collection_name}_{started_at:%Y%m%d%H%M%S}",
+                last_skill_id=0,
+                started_at=started_at,
+            )
+            checkpoint.save(self._checkpoint_path)
+        else:
+            logger.info("Resuming reindex into %s after skill %s", checkpoint.collection, checkpoint.last_skill_id)
+
+        await vector_search_repository.create_shadow_collection(checkpoint.collection)
+        await self._fill(checkpoint)
+
+        previous = await vector_search_repository.swap_collection(checkpoint.collection)
+        logger.info("Alias %s now points to %s", vector_search_repository.collection_name, checkpoint.collection)
+
+        # Skills written while the shadow collection was being filled went to the previous collection,
+        # hand them over to the indexing worker so they land in the new one too.
+        await self._enqueue_changed_since(checkpoint.started_at)
+        await self._enqueue_deleted()
+
+        if previous is not None and not keep_previous:
+            await vector_search_repository.drop_collection(previous)
+            logger.info("Dropped previous collection %s", previous)
+
+        self._checkpoint_path.unlink(missing_ok=True)
+
+    async def _fill(self, checkpoint: ReindexCheckpoint) -> None:
+        db_manager = await self._container.get(DatabaseManager)
+        semaphore = asyncio.Semaphore(self._concurrency)
+        pending: deque[tuple[int, asyncio.Task[None]]] = deque()
+
+        try:
+            async with db_manager.session_factory() as session:
+                skill_repository = SkillRepository(session)
+                async for batch in skill_repository.stream_batches(self._batch_size, checkpoint.last_skill_id):
+                    documents = [(skill.id, skill.name, SkillIndexingService.build_payload(skill)) for skill in batch]
+                    await semaphore.acquire()
+                    task = asyncio.create_task(self._index_batch(checkpoint.collection, documents))
+                    task.add_done_callback(lambda _: semaphore.release())
+                    pending.append((documents[-1][0], task))
+                    self._advance_checkpoint(checkpoint, pending)
+
+            await asyncio.gather(*(task for _, task in pending))
+            self._advance_checkpoint(checkpoint, pending)
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    async def _index_batch(self, collection_name: str, documents: list[SkillDocument]) -> None:
+        # The cache is bypassed: every skill name would be written to Redis once and push the hot entries out
+        embeddings_batcher = await self._container.get(EmbeddingsBatcher)
+        vector_search_repository = await self._container.get(VectorSearchRepository)
+
+        embeddings = await embeddings_batcher.embed_many([name for _, name, _ in documents])
+        await vector_search_repository.add_skills(
+            [
+                (skill_id, embedding, payload)
+                for (skill_id, _, payload), embedding in zip(documents, embeddings, strict=True)
+            ],
+            collection_name=collection_name,
+        )
+
+    def _advance_checkpoint(
+        self, checkpoint: ReindexCheckpoint, pending: deque[tuple[int, asyncio.Task[None]]]
+    ) -> None:
+        # Batches finish out of order, the checkpoint only moves past a contiguous prefix of finished ones
+        advanced = False
+        while pending and pending[0][1].done():
+            last_skill_id, task = pending.popleft()
+            task.result()
+            checkpoint.last_skill_id = last_skill_id
+            advanced = True
+
+        if advanced:
+            checkpoint.save(self._checkpoint_path)
+            logger.info("Indexed skills up to id %s", checkpoint.last_skill_id)
+
+    async def _enqueue_changed_since(self, since: datetime) -> None:
+        async with self._container() as request_container:
+            skill_repository = await request_container.get(SkillRepository)
+            skill_index_task_repository = await request_container.get(SkillIndexTaskRepository)
+            uow = await request_container.get(SQLAlchemyUnitOfWork)
+            async with uow:
+                skill_ids = await skill_repository.get_ids_updated_since(since)
+                await skill_index_task_repository.enqueue(list(skill_ids))
+                await uow.commit()
+        logger.info("Queued %s skills changed during the reindex", len(skill_ids))
+
+    async def _enqueue_deleted(self) -> None:
+        # Skills deleted during the reindex were removed from the previous collection only, their rows are gone
+        # so they can't be found by updated_at. The worker deletes a point whose skill no longer exists.
+        vector_search_repository = await self._container.get(VectorSearchRepository)
+        deleted_count = 0
+        async for skill_ids in vector_search_repository.stream_skill_ids(self._batch_size):
+            async with self._container() as request_container:
+                skill_repository = await request_container.get(SkillRepository)
+                skill_index_task_repository = await request_container.get(SkillIndexTaskRepository)
+                uow = await request_container.get(SQLAlchemyUnitOfWork)
+                async with uow:
+                    existing_ids = await skill_repository.get_owner_ids(skill_ids)
+                    deleted_ids = [skill_id for skill_id in skill_ids if skill_id not in existing_ids]
+                    await skill_index_task_repository.enqueue(deleted_ids)
+                    await uow.commit()
+            deleted_count += len(deleted_ids)
+        logger.info("Queued %s skills deleted during the reindex", deleted_count)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild the skills vector collection from Postgres")
+    parser.add_argument("--batch-size", type=int, default=512, help="skills embedded and upserted per batch")
+    parser.add_argument("--concurrency", type=int, default=4, help="batches processed at the same time")
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=Path("reindex_skills.checkpoint.json"),
+        help="file used to resume an interrupted reindex",
+    )
+    parser.add_argument("--keep-previous", action="store_true", help="don't drop the collection replaced by the swap")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    reindexer = SkillsReindexer(
+        container,
+        args.checkpoint,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+    )
+    try:
+        await reindexer.run(keep_previous=args.keep_previous)
+    finally:
+        await (await container.get(DatabaseManager)).dispose()
+        await container.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -29,11 +29,24 @@ class PostgresConfig(BaseModel):
         )
 
 
+class AuthConfig(BaseModel):
+    principal_cache_size: int = 10_000
+    principal_cache_ttl: int = 30
+    principal_cache_redis: bool = False
+    password_hashing_workers: int = 4
+    password_hashing_queue_size: int = 32
+    refresh_reuse_grace_period: int = 10
+    refresh_audit_flush_interval: float = 0.05
+    refresh_audit_flush_max_size: int = 500
+
+
 class JWTConfig(BaseModel):
     secret_key: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
+    backend: Literal["jose", "hmac"] = "jose"
+    verification_cache_size: int = 10_000
 
 
 class RedisConfig(BaseModel):
@@ -44,11 +57,78 @@ class RedisConfig(BaseModel):
 
 class GigaChatEmbeddingsConfig(BaseModel):
     api_key: SecretStr
+    model: str = "Embeddings"
+    verify_ssl_certs: bool = False
+
+
+class EmbeddingsConfig(BaseModel):
+    backend: Literal["gigachat", "onnx"] = "gigachat"
+    onnx_model_path: Path | None = None
+    onnx_tokenizer_path: Path | None = None
+    onnx_max_length: int = 128
+    onnx_threads: int = 0
+    onnx_workers: int = 1
+    cache_size: int = 10_000
+    cache_ttl: int | None = 30 * 24 * 60 * 60
+    batch_max_size: int = 32
+    batch_max_delay: float = 0.005
 
 
 class QdrantConfig(BaseModel):
     host: str
     port: int
+    search_window_size: int = 1000
+    count_cache_ttl: float = 60
+    verify_search_results: bool = False
+    hnsw_m: int = 16
+    hnsw_ef_construct: int = 100
+    hnsw_ef: int | None = None
+    quantization: Literal["none", "scalar", "binary"] = "none"
+    quantization_oversampling: float = 2.0
+    quantization_rescore: bool = True
+
+
+class PgVectorConfig(BaseModel):
+    search_window_size: int = 1000
+    count_cache_ttl: float = 60
+    hnsw_m: int = 16
+    hnsw_ef_construction: int = 64
+    hnsw_ef_search: int = 100
+    iterative_scan: bool = True
+
+
+class IndexingConfig(BaseModel):
+    batch_size: int = 128
+    poll_interval: float = 0.5
+    max_attempts: int = 10
+    retry_base_delay: float = 1.0
+    retry_max_delay: float = 300.0
+
+
+class MatchingConfig(BaseModel):
+    candidates_per_skill: int = 50
+    top_k: int = 100
+    refresh_batch_size: int = 32
+    refresh_poll_interval: float = 1.0
+
+
+class WebSocketConfig(BaseModel):
+    broadcast_backend: Literal["local", "redis"] = "redis"
+    channel_prefix: str = "chat"
+    send_queue_size: int = 100
+    send_timeout: float = 5.0
+
+
+class ChatConfig(BaseModel):
+    write_mode: Literal["immediate", "write_behind"] = "immediate"
+    ack_after_flush: bool = True
+    flush_interval: float = 0.005
+    flush_max_size: int = 500
+    id_block_size: int = 100
+
+
+class MetricsConfig(BaseModel):
+    token: SecretStr | None = None
 
 
 class ServerConfig(BaseModel):
@@ -67,11 +147,20 @@ class Settings(BaseSettings):
     )
 
     server: ServerConfig
-    gigachat_embeddings: GigaChatEmbeddingsConfig
+    gigachat_embeddings: GigaChatEmbeddingsConfig | None = None
+    embeddings: EmbeddingsConfig = EmbeddingsConfig()
     postgres: PostgresConfig
     jwt: JWTConfig
+    auth: AuthConfig = AuthConfig()
     redis: RedisConfig
-    qdrant: QdrantConfig
+    vector_store: Literal["qdrant", "pgvector"] = "qdrant"
+    qdrant: QdrantConfig | None = None
+    pgvector: PgVectorConfig = PgVectorConfig()
+    indexing: IndexingConfig = IndexingConfig()
+    matching: MatchingConfig = MatchingConfig()
+    websocket: WebSocketConfig = WebSocketConfig()
+    chat: ChatConfig = ChatConfig()
+    metrics: MetricsConfig = MetricsConfig()
     mode: Literal["dev", "test", "prod"] = Field(default="prod", description="Application mode")
 
 
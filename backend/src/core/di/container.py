@@ -1,11 +1,14 @@
 from dishka import make_async_container
 from dishka.integrations.fastapi import FastapiProvider
 
+from src.core.config import settings
 from src.core.di.providers import (
     ConfigProvider,
     DatabaseProvider,
-    GigaChatEmbeddingsProvider,
+    EmbeddingsProvider,
+    PgVectorSearchProvider,
     QdrantProvider,
+    QdrantVectorSearchProvider,
     RedisProvider,
     RepositoriesProvider,
     ServicesProvider,
@@ -14,10 +17,11 @@ from src.core.di.providers import (
 container = make_async_container(
     ConfigProvider(),
     DatabaseProvider(),
-    GigaChatEmbeddingsProvider(),
+    EmbeddingsProvider(),
     QdrantProvider(),
     RedisProvider(),
     RepositoriesProvider(),
+    PgVectorSearchProvider() if settings.vector_store == "pgvector" else QdrantVectorSearchProvider(),
     ServicesProvider(),
     FastapiProvider(),
 )
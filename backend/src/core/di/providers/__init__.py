@@ -1,16 +1,19 @@
 from src.core.di.providers.config import ConfigProvider
 from src.core.di.providers.database import DatabaseProvider
-from src.core.di.providers.embeddings import GigaChatEmbeddingsProvider
+from src.core.di.providers.embeddings import EmbeddingsProvider
 from src.core.di.providers.qdrant import QdrantProvider
 from src.core.di.providers.redis import RedisProvider
 from src.core.di.providers.repositories import RepositoriesProvider
 from src.core.di.providers.services import ServicesProvider
+from src.core.di.providers.vector_search import PgVectorSearchProvider, QdrantVectorSearchProvider
 
 __all__ = [
     "ConfigProvider",
     "DatabaseProvider",
-    "GigaChatEmbeddingsProvider",
+    "EmbeddingsProvider",
+    "PgVectorSearchProvider",
     "QdrantProvider",
+    "QdrantVectorSearchProvider",
     "RedisProvider",
     "RepositoriesProvider",
     "ServicesProvider",
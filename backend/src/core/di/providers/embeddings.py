@@ -1,15 +1,43 @@
+from collections.abc import AsyncIterator
+
 from dishka import Provider, Scope, provide
 from langchain_gigachat.embeddings import GigaChatEmbeddings
 
 from src.core.config import Settings
+from src.repositories.embeddings_backend import EmbeddingsBackend, GigaChatEmbeddingsBackend
+from src.repositories.embeddings_onnx import OnnxEmbeddingsBackend
 
 
-class GigaChatEmbeddingsProvider(Provider):
+class EmbeddingsProvider(Provider):
     scope = Scope.APP
 
     @provide
-    def get_gigachat_embeddings(self, settings: Settings) -> GigaChatEmbeddings:
-        return GigaChatEmbeddings(
-            credentials=settings.gigachat_embeddings.api_key.get_secret_value(),
-            verify_ssl_certs=False,
+    async def get_embeddings_backend(self, settings: Settings) -> AsyncIterator[EmbeddingsBackend]:
+        backend = self._create_backend(settings)
+        yield backend
+        await backend.close()
+
+    @staticmethod
+    def _create_backend(settings: Settings) -> EmbeddingsBackend:
+        if settings.embeddings.backend == "onnx":
+            if settings.embeddings.onnx_model_path is None:
+                msg = "EMBEDDINGS__ONNX_MODEL_PATH is required for the onnx embeddings backend"
+                raise RuntimeError(msg)
+            return OnnxEmbeddingsBackend(
+                settings.embeddings.onnx_model_path,
+                tokenizer_path=settings.embeddings.onnx_tokenizer_path,
+                max_length=settings.embeddings.onnx_max_length,
+                intra_op_threads=settings.embeddings.onnx_threads,
+                max_workers=settings.embeddings.onnx_workers,
+            )
+
+        if settings.gigachat_embeddings is None:
+            msg = "GIGACHAT_EMBEDDINGS__API_KEY is required for the gigachat embeddings backend"
+            raise RuntimeError(msg)
+        return GigaChatEmbeddingsBackend(
+            GigaChatEmbeddings(
+                credentials=settings.gigachat_embeddings.api_key.get_secret_value(),
+                model=settings.gigachat_embeddings.model,
+                verify_ssl_certs=settings.gigachat_embeddings.verify_ssl_certs,
+            )
         )
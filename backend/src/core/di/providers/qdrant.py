@@ -9,4 +9,7 @@ class QdrantProvider(Provider):
 
     @provide
     def get_qdrant(self, settings: Settings) -> AsyncQdrantClient:
+        if settings.qdrant is None:
+            msg = "QDRANT__HOST and QDRANT__PORT are required for the qdrant vector store"
+            raise RuntimeError(msg)
         return AsyncQdrantClient(host=settings.qdrant.host, port=settings.qdrant.port)
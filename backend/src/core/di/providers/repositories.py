@@ -1,15 +1,20 @@
 from dishka import Provider, Scope, provide
-from langchain_gigachat.embeddings import GigaChatEmbeddings
-from qdrant_client.async_qdrant_client import AsyncQdrantClient
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.config import Settings
 from src.repositories.chat import ChatRepository, MessageRepository
 from src.repositories.embeddings import EmbeddingsRepository
+from src.repositories.embeddings_backend import EmbeddingsBackend
+from src.repositories.embeddings_batcher import EmbeddingsBatcher
+from src.repositories.embeddings_cache import EmbeddingsCacheRepository
+from src.repositories.match_recommendations import MatchRecommendationsRepository
+from src.repositories.principal_cache import PrincipalCacheRepository
 from src.repositories.refresh_token import RefreshTokenRepository
+from src.repositories.refresh_token_cache import RefreshTokenCacheRepository
 from src.repositories.skill import SkillRepository
+from src.repositories.skill_index_task import SkillIndexTaskRepository
 from src.repositories.user import UserRepository
-from src.repositories.vector_search import VectorSearchRepository
 
 
 class RepositoriesProvider(Provider):
@@ -22,16 +27,54 @@ class RepositoriesProvider(Provider):
         return SkillRepository(session)
 
     @provide(scope=Scope.REQUEST)
-    def get_refresh_token_repository(self, session: AsyncSession, redis: Redis) -> RefreshTokenRepository:
-        return RefreshTokenRepository(session, redis)
+    def get_skill_index_task_repository(self, session: AsyncSession) -> SkillIndexTaskRepository:
+        return SkillIndexTaskRepository(session)
+
+    @provide(scope=Scope.REQUEST)
+    def get_refresh_token_repository(self, session: AsyncSession) -> RefreshTokenRepository:
+        return RefreshTokenRepository(session)
+
+    @provide(scope=Scope.APP)
+    def get_refresh_token_cache_repository(self, redis: Redis, settings: Settings) -> RefreshTokenCacheRepository:
+        return RefreshTokenCacheRepository(redis, reuse_grace_period=settings.auth.refresh_reuse_grace_period)
+
+    @provide(scope=Scope.APP)
+    def get_principal_cache_repository(self, redis: Redis, settings: Settings) -> PrincipalCacheRepository:
+        return PrincipalCacheRepository(
+            redis if settings.auth.principal_cache_redis else None,
+            lru_size=settings.auth.principal_cache_size,
+            ttl=settings.auth.principal_cache_ttl,
+            broadcast_redis=redis,
+        )
+
+    @provide(scope=Scope.APP)
+    def get_embeddings_cache_repository(
+        self, redis: Redis, backend: EmbeddingsBackend, settings: Settings
+    ) -> EmbeddingsCacheRepository:
+        return EmbeddingsCacheRepository(
+            redis,
+            model_id=backend.model_id,
+            lru_size=settings.embeddings.cache_size,
+            ttl=settings.embeddings.cache_ttl,
+        )
+
+    @provide(scope=Scope.APP)
+    def get_embeddings_batcher(self, backend: EmbeddingsBackend, settings: Settings) -> EmbeddingsBatcher:
+        return EmbeddingsBatcher(
+            backend.embed_documents,
+            max_batch_size=settings.embeddings.batch_max_size,
+            max_delay=settings.embeddings.batch_max_delay,
+        )
 
     @provide(scope=Scope.APP)
-    def get_embeddings_repository(self, embeddings: GigaChatEmbeddings) -> EmbeddingsRepository:
-        return EmbeddingsRepository(embeddings)
+    def get_embeddings_repository(
+        self, batcher: EmbeddingsBatcher, cache: EmbeddingsCacheRepository
+    ) -> EmbeddingsRepository:
+        return EmbeddingsRepository(batcher, cache)
 
     @provide(scope=Scope.APP)
-    def get_vector_search_repository(self, client: AsyncQdrantClient) -> VectorSearchRepository:
-        return VectorSearchRepository(client)
+    def get_match_recommendations_repository(self, redis: Redis) -> MatchRecommendationsRepository:
+        return MatchRecommendationsRepository(redis)
 
     @provide(scope=Scope.REQUEST)
     def get_chat_repository(self, session: AsyncSession) -> ChatRepository:
@@ -1,22 +1,50 @@
+from collections.abc import Iterator
+
 from dishka import Provider, Scope, provide
 
-from src.db.uow import SQLAlchemyUnitOfWork
+from src.core.config import Settings
+from src.core.jwt import HMAC_ALGORITHMS, CachingJWTBackend, HMACJWTBackend, JoseJWTBackend, JWTBackend
+from src.db.manager import DatabaseManager
 from src.repositories.chat import ChatRepository, MessageRepository
 from src.repositories.embeddings import EmbeddingsRepository
+from src.repositories.match_recommendations import MatchRecommendationsRepository
+from src.repositories.principal_cache import PrincipalCacheRepository
 from src.repositories.refresh_token import RefreshTokenRepository
+from src.repositories.refresh_token_cache import RefreshTokenCacheRepository
 from src.repositories.skill import SkillRepository
+from src.repositories.skill_index_task import SkillIndexTaskRepository
 from src.repositories.user import UserRepository
 from src.repositories.vector_search import VectorSearchRepository
 from src.services.chat import ChatService
+from src.services.match import MatchService
+from src.services.message_writer import ImmediateMessageWriter, MessageWriter, WriteBehindMessageWriter
+from src.services.refresh_token_audit import RefreshTokenAuditWriter
+from src.services.security import SecurityService
 from src.services.skill import SkillService
+from src.services.skill_indexing import SkillIndexingService
 from src.services.token import RefreshTokenService, TokenService
 from src.services.user import UserService
 
 
 class ServicesProvider(Provider):
+    @provide(scope=Scope.APP)
+    def get_security_service(self, settings: Settings) -> Iterator[SecurityService]:
+        security_service = SecurityService(
+            max_workers=settings.auth.password_hashing_workers,
+            max_queue_size=settings.auth.password_hashing_queue_size,
+        )
+        yield security_service
+        security_service.shutdown()
+
     @provide(scope=Scope.REQUEST)
-    def get_user_service(self, user_repo: UserRepository) -> UserService:
-        return UserService(user_repo)
+    def get_user_service(
+        self,
+        user_repo: UserRepository,
+        principal_cache_repo: PrincipalCacheRepository,
+        security_service: SecurityService,
+        skill_index_task_repo: SkillIndexTaskRepository,
+    ) -> UserService:
+        return UserService(user_repo, principal_cache_repo, security_service, skill_index_task_repo)
 
     @provide(scope=Scope.REQUEST)
     def get_skill_service(
@@ -24,21 +52,113 @@ class ServicesProvider(Provider):
         skill_repo: SkillRepository,
         vector_search_repo: VectorSearchRepository,
         embeddings_repo: EmbeddingsRepository,
+        skill_index_task_repo: SkillIndexTaskRepository,
+        settings: Settings,
     ) -> SkillService:
-        return SkillService(skill_repo, vector_search_repo, embeddings_repo)
+        return SkillService(
+            skill_repo,
+            vector_search_repo,
+            embeddings_repo,
+            skill_index_task_repo,
+            # pgvector hits are joined with the skill rows, there is no snapshot to verify
+            verify_search_results=settings.qdrant is not None and settings.qdrant.verify_search_results,
+        )
+
+    @provide(scope=Scope.REQUEST)
+    def get_skill_indexing_service(
+        self,
+        *,
+        skill_index_task_repo: SkillIndexTaskRepository,
+        skill_repo: SkillRepository,
+        embeddings_repo: EmbeddingsRepository,
+        vector_search_repo: VectorSearchRepository,
+        match_recommendations_repo: MatchRecommendationsRepository,
+        settings: Settings,
+    ) -> SkillIndexingService:
+        return SkillIndexingService(
+            skill_index_task_repo,
+            skill_repo,
+            embeddings_repo,
+            vector_search_repo,
+            match_recommendations_repo,
+            neighbours_limit=settings.matching.candidates_per_skill,
+            max_attempts=settings.indexing.max_attempts,
+            retry_base_delay=settings.indexing.retry_base_delay,
+            retry_max_delay=settings.indexing.retry_max_delay,
+        )
+
+    @provide(scope=Scope.REQUEST)
+    def get_match_service(
+        self,
+        *,
+        skill_repo: SkillRepository,
+        user_repo: UserRepository,
+        vector_search_repo: VectorSearchRepository,
+        embeddings_repo: EmbeddingsRepository,
+        match_recommendations_repo: MatchRecommendationsRepository,
+        settings: Settings,
+    ) -> MatchService:
+        return MatchService(
+            skill_repo,
+            user_repo,
+            vector_search_repo,
+            embeddings_repo,
+            match_recommendations_repo,
+            candidates_per_skill=settings.matching.candidates_per_skill,
+            top_k=settings.matching.top_k,
+        )
+
+    @provide(scope=Scope.APP)
+    def get_jwt_backend(self, settings: Settings) -> JWTBackend:
+        # The stdlib backend only signs HS*, anything else stays on jose
+        if settings.jwt.backend == "hmac" and settings.jwt.algorithm in HMAC_ALGORITHMS:
+            backend: JWTBackend = HMACJWTBackend(settings.jwt.secret_key, settings.jwt.algorithm)
+        else:
+            backend = JoseJWTBackend(settings.jwt.secret_key, settings.jwt.algorithm)
+        if settings.jwt.verification_cache_size <= 0:
+            return backend
+        return CachingJWTBackend(backend, maxsize=settings.jwt.verification_cache_size)
 
     @provide(scope=Scope.REQUEST)
     def get_token_service(
         self,
+        *,
         refresh_repo: RefreshTokenRepository,
+        refresh_cache_repo: RefreshTokenCacheRepository,
         user_repo: UserRepository,
+        principal_cache_repo: PrincipalCacheRepository,
+        jwt_backend: JWTBackend,
     ) -> TokenService:
-        return TokenService(refresh_repo, user_repo)
+        return TokenService(refresh_repo, refresh_cache_repo, user_repo, principal_cache_repo, jwt_backend)
 
-    @provide(scope=Scope.REQUEST)
-    def get_refresh_token_service(self, refresh_repo: RefreshTokenRepository) -> RefreshTokenService:
-        return RefreshTokenService(refresh_repo)
+    @provide(scope=Scope.APP)
+    def get_refresh_token_audit_writer(
+        self, db_manager: DatabaseManager, settings: Settings
+    ) -> RefreshTokenAuditWriter:
+        return RefreshTokenAuditWriter(
+            db_manager,
+            flush_interval=settings.auth.refresh_audit_flush_interval,
+            max_batch_size=settings.auth.refresh_audit_flush_max_size,
+        )
+
+    @provide(scope=Scope.APP)
+    def get_refresh_token_service(
+        self, refresh_cache_repo: RefreshTokenCacheRepository, audit_writer: RefreshTokenAuditWriter
+    ) -> RefreshTokenService:
+        return RefreshTokenService(refresh_cache_repo, audit_writer)
 
     @provide(scope=Scope.REQUEST)
     def get_chat_service(self, chat_repo: ChatRepository, message_repo: MessageRepository) -> ChatService:
         return ChatService(chat_repo, message_repo)
+
+    @provide(scope=Scope.APP)
+    def get_message_writer(self, db_manager: DatabaseManager, settings: Settings) -> MessageWriter:
+        if settings.chat.write_mode == "write_behind":
+            return WriteBehindMessageWriter(
+                db_manager,
+                ack_after_flush=settings.chat.ack_after_flush,
+                flush_interval=settings.chat.flush_interval,
+                max_batch_size=settings.chat.flush_max_size,
+                id_block_size=settings.chat.id_block_size,
+            )
+        return ImmediateMessageWriter(db_manager)
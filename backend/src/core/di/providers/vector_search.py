@@ -0,0 +1,52 @@
+from dishka import Provider, Scope, provide
+from qdrant_client.async_qdrant_client import AsyncQdrantClient
+
+from src.core.config import Settings
+from src.db.manager import DatabaseManager
+from src.repositories.embeddings_backend import EmbeddingsBackend
+from src.repositories.vector_search import QdrantVectorSearchRepository, VectorSearchRepository
+from src.repositories.vector_search_pgvector import PgVectorSearchRepository
+
+
+class QdrantVectorSearchProvider(Provider):
+    scope = Scope.APP
+
+    @provide(provides=VectorSearchRepository)
+    def get_vector_search_repository(
+        self, client: AsyncQdrantClient, backend: EmbeddingsBackend, settings: Settings
+    ) -> QdrantVectorSearchRepository:
+        qdrant = settings.qdrant
+        if qdrant is None:
+            msg = "QDRANT__HOST and QDRANT__PORT are required for the qdrant vector store"
+            raise RuntimeError(msg)
+        return QdrantVectorSearchRepository(
+            client,
+            search_window_size=qdrant.search_window_size,
+            count_cache_ttl=qdrant.count_cache_ttl,
+            vector_size=backend.dimension,
+            hnsw_m=qdrant.hnsw_m,
+            hnsw_ef_construct=qdrant.hnsw_ef_construct,
+            hnsw_ef=qdrant.hnsw_ef,
+            quantization=qdrant.quantization,
+            quantization_oversampling=qdrant.quantization_oversampling,
+            quantization_rescore=qdrant.quantization_rescore,
+        )
+
+
+class PgVectorSearchProvider(Provider):
+    scope = Scope.APP
+
+    @provide(provides=VectorSearchRepository)
+    def get_vector_search_repository(
+        self, db_manager: DatabaseManager, backend: EmbeddingsBackend, settings: Settings
+    ) -> PgVectorSearchRepository:
+        return PgVectorSearchRepository(
+            db_manager,
+            search_window_size=settings.pgvector.search_window_size,
+            count_cache_ttl=settings.pgvector.count_cache_ttl,
+            vector_size=backend.dimension,
+            hnsw_m=settings.pgvector.hnsw_m,
+            hnsw_ef_construction=settings.pgvector.hnsw_ef_construction,
+            hnsw_ef_search=settings.pgvector.hnsw_ef_search,
+            iterative_scan=settings.pgvector.iterative_scan,
+        )
@@ -0,0 +1,126 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+from jose import ExpiredSignatureError, JWTError, jwt
+
+from src.core.cache import LRUCache
+from src.exceptions.auth import InvalidJWTError, JWTSignatureExpiredError
+
+HMAC_ALGORITHMS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+
+class JWTBackend(ABC):
+    @abstractmethod
+    def encode(self, claims: dict) -> str: ...
+
+    @abstractmethod
+    def decode(self, token: str) -> dict: ...
+
+
+class JoseJWTBackend(JWTBackend):
+    def __init__(self, secret_key: str, algorithm: str = "HS256") -> None:
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+
+    def encode(self, claims: dict) -> str:
+        return jwt.encode(claims, self.secret_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> dict:
+        try:
+            return jwt.decode(token, self.secret_key, algorithms=self.algorithm)
+        except ExpiredSignatureError:
+            msg = "Could not validate credentials: token has expired"
+            raise JWTSignatureExpiredError(msg) from None
+        except JWTError:
+            msg = "Could not validate credentials: invalid jwt"
+            raise InvalidJWTError(msg) from None
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+class HMACJWTBackend(JWTBackend):
+    def __init__(self, secret_key: str, algorithm: str = "HS256") -> None:
+        if algorithm not in HMAC_ALGORITHMS:
+            msg = f"HMAC JWT backend does not support {algorithm}"
+            raise ValueError(msg)
+        self.secret_key = secret_key.encode()
+        self.algorithm = algorithm
+        self._digest = HMAC_ALGORITHMS[algorithm]
+        self._header = _b64encode(json.dumps({"alg": algorithm, "typ": "JWT"}, separators=(",", ":")).encode())
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        return _b64encode(hmac.new(self.secret_key, signing_input, self._digest).digest())
+
+    def encode(self, claims: dict) -> str:
+        payload = {
+            key: int(value.timestamp()) if isinstance(value, datetime) else value for key, value in claims.items()
+        }
+        signing_input = self._header + b"." + _b64encode(json.dumps(payload, separators=(",", ":")).encode())
+        return (signing_input + b"." + self._sign(signing_input)).decode()
+
+    def decode(self, token: str) -> dict:
+        try:
+            signing_input, signature = token.encode().rsplit(b".", 1)
+            header_segment, payload_segment = signing_input.split(b".")
+            header = json.loads(_b64decode(header_segment))
+            payload = json.loads(_b64decode(payload_segment))
+        except (ValueError, UnicodeError):
+            msg = "Could not validate credentials: invalid jwt"
+            raise InvalidJWTError(msg) from None
+
+        if (
+            not isinstance(header, dict)
+            or not isinstance(payload, dict)
+            or header.get("alg") != self.algorithm
+            or not hmac.compare_digest(signature, self._sign(signing_input))
+        ):
+            msg = "Could not validate credentials: invalid jwt"
+            raise InvalidJWTError(msg)
+
+        now = time.time()
+        if "exp" in payload and not (isinstance(payload["exp"], int | float) and now < payload["exp"]):
+            msg = "Could not validate credentials: token has expired"
+            raise JWTSignatureExpiredError(msg)
+        if "nbf" in payload and not (isinstance(payload["nbf"], int | float) and now >= payload["nbf"]):
+            msg = "Could not validate credentials: invalid jwt"
+            raise InvalidJWTError(msg)
+        return payload
+
+
+class CachingJWTBackend(JWTBackend):
+    def __init__(self, backend: JWTBackend, maxsize: int = 10_000) -> None:
+        self.backend = backend
+        self._cache: LRUCache[bytes, dict] = LRUCache(maxsize)
+
+    def encode(self, claims: dict) -> str:
+        return self.backend.encode(claims)
+
+    def decode(self, token: str) -> dict:
+        # Verified claims are kept until the token's own exp, so an expired token is never served from the cache
+        key = hashlib.sha256(token.encode()).digest()
+        claims = self._cache.get(key)
+        if claims is not None:
+            return dict(claims)
+
+        claims = self.backend.decode(token)
+        exp = claims.get("exp")
+        if isinstance(exp, int | float):
+            ttl = exp - time.time()
+            if ttl > 0:
+                self._cache.set(key, claims, ttl=ttl)
+        return dict(claims)
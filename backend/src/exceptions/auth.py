@@ -15,3 +15,15 @@ class JWTSignatureExpiredError(BaseAppError):
 
 class InactiveOrNotExistingUserError(BaseAppError):
     error_key = "inactive_or_not_existing_user"
+
+
+class PasswordHashingOverloadedError(BaseAppError):
+    error_key = "password_hashing_overloaded"
+
+
+class RefreshTokenReusedError(InvalidTokenError):
+    error_key = "refresh_token_reused"
+
+
+class InvalidMetricsTokenError(BaseAppError):
+    error_key = "invalid_metrics_token"
@@ -0,0 +1,5 @@
+from src.exceptions.base import BaseAppError
+
+
+class InvalidCursorError(BaseAppError):
+    error_key = "invalid_cursor"
@@ -2,8 +2,9 @@ from src.enums.skill_type import SkillType
 from src.models.base import Base
 from src.models.chat import Chat
 from src.models.message import Message
+from src.models.skill_index_task import SkillIndexTask
 from src.models.skills import Skill
 from src.models.token import RefreshToken
 from src.models.user import User
 
-__all__ = ["Base", "Chat", "Message", "RefreshToken", "Skill", "SkillType", "User"]
+__all__ = ["Base", "Chat", "Message", "RefreshToken", "Skill", "SkillIndexTask", "SkillType", "User"]
@@ -1,6 +1,7 @@
+from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import CheckConstraint, ForeignKey, UniqueConstraint
+from sqlalchemy import CheckConstraint, DateTime, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.base import Base
@@ -15,10 +16,17 @@ class Chat(Base):
 
     user1_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
     user2_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
+    last_message_id: Mapped[int | None] = mapped_column(
+        ForeignKey("messages.id", use_alter=True, ondelete="SET NULL"), nullable=True
+    )
+    last_message_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     user1: Mapped["User"] = relationship("User", foreign_keys=[user1_id])
     user2: Mapped["User"] = relationship("User", foreign_keys=[user2_id])
-    messages: Mapped[list["Message"]] = relationship(back_populates="chat", cascade="all, delete-orphan")
+    messages: Mapped[list["Message"]] = relationship(
+        back_populates="chat", cascade="all, delete-orphan", foreign_keys="Message.chat_id"
+    )
+    last_message: Mapped["Message | None"] = relationship("Message", foreign_keys=[last_message_id], post_update=True)
 
     __table_args__ = (
         UniqueConstraint("user1_id", "user2_id", name="uq_chat_users"),
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Text
+from sqlalchemy import ForeignKey, Index, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.base import Base
@@ -13,12 +13,14 @@ if TYPE_CHECKING:
 class Message(Base):
     __tablename__ = "messages"
 
-    chat_id: Mapped[int] = mapped_column(ForeignKey("chats.id"), index=True)
+    chat_id: Mapped[int] = mapped_column(ForeignKey("chats.id"))
     sender_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
     text: Mapped[str] = mapped_column(Text)
 
-    chat: Mapped["Chat"] = relationship("Chat", back_populates="messages")
+    chat: Mapped["Chat"] = relationship("Chat", back_populates="messages", foreign_keys=[chat_id])
     sender: Mapped["User"] = relationship("User")
 
+    __table_args__ = (Index("ix_messages_chat_id_created_at_id", "chat_id", "created_at", "id"),)
+
     def __repr__(self) -> str:
         return f"<Message(id={self.id}, chat_id={self.chat_id}, sender_id={self.sender_id})>"
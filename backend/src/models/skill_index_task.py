@@ -0,0 +1,22 @@
+from datetime import UTC, datetime
+
+from sqlalchemy import DateTime, Integer, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+
+class SkillIndexTask(Base):
+    __tablename__ = "skill_index_tasks"
+
+    skill_id: Mapped[int] = mapped_column(Integer, index=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        index=True,
+    )
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<SkillIndexTask(id={self.id}, skill_id={self.skill_id}, attempts={self.attempts})>"
@@ -1,11 +1,15 @@
 from collections.abc import Sequence
+from datetime import UTC, datetime
 
-from sqlalchemy import and_, or_, select
+from sqlalchemy import and_, func, insert, or_, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from src.models.chat import Chat
 from src.models.message import Message
+from src.models.user import User
+from src.repositories.pagination import paginate
 
 
 class ChatRepository:
@@ -52,17 +56,23 @@ class ChatRepository:
             select(Chat)
             .where(or_(Chat.user1_id == user_id, Chat.user2_id == user_id))
             .options(joinedload(Chat.user1), joinedload(Chat.user2))
-            .limit(limit)
-            .offset(offset)
         )
-        result = await self.session.scalars(stmt)
-        chats = result.all()
-
-        count_stmt = select(Chat).where(or_(Chat.user1_id == user_id, Chat.user2_id == user_id))
-        count_result = await self.session.scalars(count_stmt)
-        total = len(count_result.all())
+        return await paginate(self.session, stmt, limit, offset)
 
-        return chats, total
+    async def get_user_chats_with_last_message(
+        self, user_id: int, limit: int = 50, offset: int = 0
+    ) -> tuple[Sequence[Chat], int]:
+        stmt = (
+            select(Chat)
+            .where(or_(Chat.user1_id == user_id, Chat.user2_id == user_id))
+            .options(
+                joinedload(Chat.user1),
+                joinedload(Chat.user2),
+                joinedload(Chat.last_message).joinedload(Message.sender),
+            )
+            .order_by(func.coalesce(Chat.last_message_at, Chat.created_at).desc(), Chat.id.desc())
+        )
+        return await paginate(self.session, stmt, limit, offset)
 
 
 class MessageRepository:
@@ -70,12 +80,71 @@ class MessageRepository:
         self.session = session
 
     async def create(self, chat_id: int, sender_id: int, text: str) -> Message:
-        message = Message(chat_id=chat_id, sender_id=sender_id, text=text)
-        self.session.add(message)
-        await self.session.flush()
-        await self.session.refresh(message)
+        # The insert and the chat's last message pointer go out as one statement with a writable CTE
+        now = datetime.now(UTC)
+        inserted = (
+            insert(Message)
+            .values(chat_id=chat_id, sender_id=sender_id, text=text, created_at=now, updated_at=now)
+            .returning(
+                Message.id, Message.chat_id, Message.sender_id, Message.text, Message.created_at, Message.updated_at
+            )
+            .cte("inserted_message")
+        )
+        # Concurrent senders may commit out of order, only ever move the pointer forward
+        bump_chat = (
+            update(Chat)
+            .where(
+                Chat.id == inserted.c.chat_id,
+                or_(
+                    Chat.last_message_at.is_(None),
+                    tuple_(Chat.last_message_at, Chat.last_message_id) < tuple_(inserted.c.created_at, inserted.c.id),
+                ),
+            )
+            .values(last_message_id=inserted.c.id, last_message_at=inserted.c.created_at)
+            .cte("bump_chat")
+        )
+        # The sender is read in the same statement, the response embeds it
+        result = await self.session.execute(
+            select(User, *inserted.c).join(User, User.id == inserted.c.sender_id).add_cte(bump_chat)
+        )
+        sender, *values = result.one()
+        message = Message(**dict(zip(inserted.c.keys(), values, strict=True)))
+        set_committed_value(message, "sender", sender)
         return message
 
+    async def allocate_ids(self, count: int) -> list[int]:
+        stmt = select(func.nextval(func.pg_get_serial_sequence(Message.__tablename__, "id"))).select_from(
+            func.generate_series(1, count)
+        )
+        result = await self.session.scalars(stmt)
+        return list(result.all())
+
+    async def bulk_create(self, rows: list[dict]) -> None:
+        # Rows carry ids taken from allocate_ids, one multi-row insert per flush also moves every touched chat's
+        # last message pointer to the newest message of the batch
+        inserted = (
+            insert(Message).values(rows).returning(Message.id, Message.chat_id, Message.created_at).cte("inserted")
+        )
+        latest = (
+            select(inserted.c.chat_id, inserted.c.id, inserted.c.created_at)
+            .distinct(inserted.c.chat_id)
+            .order_by(inserted.c.chat_id, inserted.c.created_at.desc(), inserted.c.id.desc())
+            .cte("latest")
+        )
+        await self.session.execute(
+            update(Chat)
+            .where(
+                Chat.id == latest.c.chat_id,
+                or_(
+                    Chat.last_message_at.is_(None),
+                    tuple_(Chat.last_message_at, Chat.last_message_id) < tuple_(latest.c.created_at, latest.c.id),
+                ),
+            )
+            .values(last_message_id=latest.c.id, last_message_at=latest.c.created_at)
+            .add_cte(inserted)
+            .execution_options(synchronize_session=False)
+        )
+
     async def get(self, message_id: int) -> Message | None:
         stmt = select(Message).where(Message.id == message_id).options(joinedload(Message.sender))
         result = await self.session.scalars(stmt)
@@ -86,15 +155,32 @@ class MessageRepository:
             select(Message)
             .where(Message.chat_id == chat_id)
             .options(joinedload(Message.sender))
-            .order_by(Message.created_at.desc())
-            .limit(limit)
-            .offset(offset)
+            # The id tiebreak keeps messages written in the same instant in one order across pages, as the cursors do
+            .order_by(Message.created_at.desc(), Message.id.desc())
         )
-        result = await self.session.scalars(stmt)
-        messages = result.all()
-
-        count_stmt = select(Message).where(Message.chat_id == chat_id)
-        count_result = await self.session.scalars(count_stmt)
-        total = len(count_result.all())
-
-        return messages, total
+        return await paginate(self.session, stmt, limit, offset)
+
+    async def get_chat_messages_by_cursor(
+        self,
+        chat_id: int,
+        limit: int = 100,
+        before: tuple[datetime, int] | None = None,
+        after: tuple[datetime, int] | None = None,
+    ) -> tuple[Sequence[Message], bool]:
+        # Seeks on the (chat_id, created_at, id) index, so every page costs the same however deep it is
+        key = tuple_(Message.created_at, Message.id)
+        stmt = select(Message).where(Message.chat_id == chat_id).options(joinedload(Message.sender))
+        if after is not None:
+            stmt = stmt.where(key > tuple_(*after)).order_by(Message.created_at, Message.id)
+        else:
+            if before is not None:
+                stmt = stmt.where(key < tuple_(*before))
+            stmt = stmt.order_by(Message.created_at.desc(), Message.id.desc())
+
+        result = await self.session.scalars(stmt.limit(limit + 1))
+        messages = list(result.all())
+        has_more = len(messages) > limit
+        messages = messages[:limit]
+        if after is not None:
+            messages.reverse()
+        return messages, has_more
@@ -1,9 +1,25 @@
-from langchain_gigachat.embeddings import GigaChatEmbeddings
+from src.repositories.embeddings_batcher import EmbeddingsBatcher
+from src.repositories.embeddings_cache import EmbeddingsCacheRepository
 
 
 class EmbeddingsRepository:
-    def __init__(self, embeddings: GigaChatEmbeddings) -> None:
-        self._embeddings = embeddings
+    def __init__(self, batcher: EmbeddingsBatcher, cache: EmbeddingsCacheRepository) -> None:
+        self._batcher = batcher
+        self._cache = cache
 
     async def get_embedding(self, text: str) -> list[float]:
-        return await self._embeddings.aembed_query(text)
+        return (await self.get_embeddings([text]))[0]
+
+    async def get_embeddings(self, texts: list[str]) -> list[list[float]]:
+        embeddings = await self._cache.get_many(texts)
+        missing = [index for index, embedding in enumerate(embeddings) if embedding is None]
+        if not missing:
+            return embeddings
+
+        missing_texts = [texts[index] for index in missing]
+        computed = await self._batcher.embed_many(missing_texts)
+        await self._cache.set_many(missing_texts, computed)
+
+        for index, embedding in zip(missing, computed, strict=True):
+            embeddings[index] = embedding
+        return embeddings
@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+
+from langchain_gigachat.embeddings import GigaChatEmbeddings
+
+
+class EmbeddingsBackend(ABC):
+    # Identifies the vector space, cached embeddings of another model are never reused
+    model_id: str
+    dimension: int
+
+    @abstractmethod
+    async def embed_documents(self, texts: list[str]) -> list[list[float]]: ...
+
+    async def close(self) -> None:  # noqa: B027
+        pass
+
+
+class GigaChatEmbeddingsBackend(EmbeddingsBackend):
+    def __init__(self, embeddings: GigaChatEmbeddings, dimension: int = 1024) -> None:
+        self._embeddings = embeddings
+        self.model_id = f"gigachat:{embeddings.model}"
+        self.dimension = dimension
+
+    async def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return await self._embeddings.aembed_documents(texts)
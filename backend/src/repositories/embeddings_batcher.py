@@ -0,0 +1,84 @@
+import asyncio
+import functools
+from collections.abc import Awaitable, Callable
+
+from src.repositories.embeddings_cache import normalize_text
+
+EmbedDocuments = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+
+class EmbeddingsBatcher:
+    def __init__(self, embed_documents: EmbedDocuments, max_batch_size: int = 32, max_delay: float = 0.005) -> None:
+        self._embed_documents = embed_documents
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay
+        self._futures: dict[str, asyncio.Future[list[float]]] = {}
+        self._queue: list[tuple[str, str]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def embed(self, text: str) -> list[float]:
+        key = normalize_text(text)
+        future = self._futures.get(key)
+        if future is None:
+            future = self._enqueue(key, text)
+        return await asyncio.shield(future)
+
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        return list(await asyncio.gather(*(self.embed(text) for text in texts)))
+
+    def _enqueue(self, key: str, text: str) -> asyncio.Future[list[float]]:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[list[float]] = loop.create_future()
+        # Waiters may all be cancelled, so make sure a failed batch never logs an unretrieved exception
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._futures[key] = future
+        self._queue.append((key, text))
+
+        if len(self._queue) >= self._max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._max_delay, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._queue = self._queue, []
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(functools.partial(self._on_batch_done, batch))
+
+    def _on_batch_done(self, batch: list[tuple[str, str]], task: asyncio.Task[None]) -> None:
+        self._tasks.discard(task)
+        if task.cancelled():
+            # Also covers a task cancelled before its first step, when _run never got to settle the batch
+            for key, _ in batch:
+                self._futures.pop(key).cancel()
+
+    async def _run(self, batch: list[tuple[str, str]]) -> None:
+        # Every future of the batch is settled whatever happens, an unsettled one would hang all of its waiters
+        try:
+            embeddings = await self._embed_batch([text for _, text in batch])
+        except Exception as e:  # noqa: BLE001
+            for key, _ in batch:
+                future = self._futures.pop(key)
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (key, _), embedding in zip(batch, embeddings, strict=True):
+                future = self._futures.pop(key)
+                if not future.done():
+                    future.set_result(embedding)
+
+    async def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        embeddings = await self._embed_documents(texts)
+        if len(embeddings) != len(texts):
+            msg = f"Embeddings backend returned {len(embeddings)} vectors for {len(texts)} texts"
+            raise RuntimeError(msg)
+        return embeddings
@@ -0,0 +1,75 @@
+import hashlib
+import logging
+from array import array
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.core.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split()).casefold()
+
+
+class EmbeddingsCacheRepository:
+    def __init__(self, redis: Redis, model_id: str, lru_size: int = 10_000, ttl: int | None = None) -> None:
+        self.redis = redis
+        self.model_id = model_id
+        self.ttl = ttl
+        self._lru: LRUCache[str, list[float]] = LRUCache(lru_size)
+
+    def _key(self, text: str) -> str:
+        digest = hashlib.sha256(f"{self.model_id}\0{normalize_text(text)}".encode()).hexdigest()
+        return f"embedding:{digest}"
+
+    @staticmethod
+    def _pack(embedding: list[float]) -> bytes:
+        return array("f", embedding).tobytes()
+
+    @staticmethod
+    def _unpack(data: bytes) -> list[float]:
+        vector = array("f")
+        vector.frombytes(data)
+        return vector.tolist()
+
+    async def get(self, text: str) -> list[float] | None:
+        return (await self.get_many([text]))[0]
+
+    async def get_many(self, texts: list[str]) -> list[list[float] | None]:
+        keys = [self._key(text) for text in texts]
+        result = [self._lru.get(key) for key in keys]
+
+        missing = [index for index, embedding in enumerate(result) if embedding is None]
+        if not missing:
+            return result
+
+        try:
+            values = await self.redis.mget([keys[index] for index in missing])
+        except RedisError:
+            logger.warning("Embeddings cache is unavailable", exc_info=True)
+            return result
+
+        for index, value in zip(missing, values, strict=True):
+            if value is not None:
+                embedding = self._unpack(value)
+                self._lru.set(keys[index], embedding)
+                result[index] = embedding
+        return result
+
+    async def set(self, text: str, embedding: list[float]) -> None:
+        await self.set_many([text], [embedding])
+
+    async def set_many(self, texts: list[str], embeddings: list[list[float]]) -> None:
+        pipeline = self.redis.pipeline(transaction=False)
+        for text, embedding in zip(texts, embeddings, strict=True):
+            key = self._key(text)
+            self._lru.set(key, embedding)
+            pipeline.set(key, self._pack(embedding), ex=self.ttl)
+
+        try:
+            await pipeline.execute()
+        except RedisError:
+            logger.warning("Embeddings cache is unavailable", exc_info=True)
@@ -0,0 +1,77 @@
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from src.repositories.embeddings_backend import EmbeddingsBackend
+
+try:
+    import onnxruntime
+    from tokenizers import Tokenizer
+except ImportError:  # optional, only the onnx backend needs them
+    onnxruntime = None
+
+
+class OnnxEmbeddingsBackend(EmbeddingsBackend):
+    """Sentence-embedding model exported to ONNX, run on CPU next to the API.
+
+    Expects a transformer encoder taking input_ids/attention_mask (and optionally token_type_ids) and a HuggingFace
+    tokenizer.json. Token embeddings are mean-pooled over the attention mask and L2-normalized.
+    """
+
+    def __init__(
+        self,
+        model_path: Path,
+        *,
+        tokenizer_path: Path | None = None,
+        max_length: int = 128,
+        intra_op_threads: int = 0,
+        max_workers: int = 1,
+    ) -> None:
+        if onnxruntime is None:
+            msg = "The onnx embeddings backend needs the onnx extra: uv sync --extra onnx"
+            raise RuntimeError(msg)
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        self._session = onnxruntime.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+        self._input_names = {model_input.name for model_input in self._session.get_inputs()}
+
+        tokenizer_path = tokenizer_path or model_path.with_name("tokenizer.json")
+        self._tokenizer = Tokenizer.from_file(str(tokenizer_path))
+        self._tokenizer.enable_truncation(max_length)
+        self._tokenizer.enable_padding()
+
+        # onnxruntime releases the GIL and parallelizes a batch itself, extra workers only help small batches
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="onnx-embeddings")
+        # Exports are usually all named model.onnx, the cache namespace comes from the files' contents instead
+        fingerprint = hashlib.sha256(f"{max_length}".encode())
+        for path in (model_path, tokenizer_path):
+            with path.open("rb") as file:
+                fingerprint.update(hashlib.file_digest(file, "sha256").digest())
+        self.model_id = f"onnx:{model_path.parent.name}:{fingerprint.hexdigest()[:16]}"
+        self.dimension = int(self._session.get_outputs()[0].shape[-1])
+
+    async def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._embed, texts)
+
+    async def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _embed(self, texts: list[str]) -> list[list[float]]:
+        encodings = self._tokenizer.encode_batch(texts)
+        input_ids = np.array([encoding.ids for encoding in encodings], dtype=np.int64)
+        attention_mask = np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64)
+        inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            inputs["token_type_ids"] = np.zeros_like(input_ids)
+
+        output = self._session.run(None, inputs)[0]
+        if output.ndim == 3:  # noqa: PLR2004
+            mask = attention_mask[..., np.newaxis].astype(output.dtype)
+            output = (output * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        output /= np.clip(np.linalg.norm(output, axis=1, keepdims=True), 1e-12, None)
+        return output.tolist()
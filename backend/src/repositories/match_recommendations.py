@@ -0,0 +1,81 @@
+from collections.abc import Sequence
+from datetime import UTC, datetime
+
+from redis.asyncio import Redis
+
+from src.schemas.match import MatchRead
+
+DIRTY_USERS_KEY = "matches:dirty"
+
+
+class MatchRecommendationsRepository:
+    def __init__(self, redis: Redis) -> None:
+        self.redis = redis
+
+    @staticmethod
+    def _scores_key(user_id: int) -> str:
+        return f"matches:{user_id}"
+
+    @staticmethod
+    def _items_key(user_id: int) -> str:
+        return f"matches:{user_id}:items"
+
+    @staticmethod
+    def _computed_at_key(user_id: int) -> str:
+        return f"matches:{user_id}:computed_at"
+
+    @staticmethod
+    def _matched_by_key(candidate_id: int) -> str:
+        return f"matches:matched_by:{candidate_id}"
+
+    async def get(self, user_id: int, limit: int, offset: int) -> tuple[list[MatchRead], int] | None:
+        pipeline = self.redis.pipeline(transaction=False)
+        pipeline.exists(self._computed_at_key(user_id))
+        pipeline.zrevrange(self._scores_key(user_id), offset, offset + limit - 1)
+        pipeline.zcard(self._scores_key(user_id))
+        computed, candidate_ids, total = await pipeline.execute()
+        if not computed:
+            return None
+        if not candidate_ids:
+            return [], total
+
+        items = await self.redis.hmget(self._items_key(user_id), candidate_ids)
+        return [MatchRead.model_validate_json(item) for item in items if item is not None], total
+
+    async def replace(self, user_id: int, matches: Sequence[MatchRead]) -> None:
+        previous = {int(candidate_id) for candidate_id in await self.redis.zrange(self._scores_key(user_id), 0, -1)}
+        current = {match.user.id for match in matches}
+
+        pipeline = self.redis.pipeline(transaction=True)
+        pipeline.delete(self._scores_key(user_id), self._items_key(user_id))
+        if matches:
+            pipeline.zadd(self._scores_key(user_id), {str(match.user.id): match.score for match in matches})
+            pipeline.hset(
+                self._items_key(user_id),
+                mapping={str(match.user.id): match.model_dump_json() for match in matches},
+            )
+        pipeline.set(self._computed_at_key(user_id), datetime.now(UTC).isoformat())
+        # Reverse index: whoever appears in this list gets this user re-scored when their own skills change
+        for candidate_id in previous - current:
+            pipeline.srem(self._matched_by_key(candidate_id), user_id)
+        for candidate_id in current - previous:
+            pipeline.sadd(self._matched_by_key(candidate_id), user_id)
+        await pipeline.execute()
+
+    async def mark_dirty(self, user_ids: Sequence[int], *, include_matched_by: bool = True) -> None:
+        if not user_ids:
+            return
+        pipeline = self.redis.pipeline(transaction=True)
+        pipeline.sadd(DIRTY_USERS_KEY, *user_ids)
+        if include_matched_by:
+            pipeline.sunionstore(
+                f"{DIRTY_USERS_KEY}:tmp",
+                [self._matched_by_key(user_id) for user_id in user_ids],
+            )
+            pipeline.sunionstore(DIRTY_USERS_KEY, [DIRTY_USERS_KEY, f"{DIRTY_USERS_KEY}:tmp"])
+            pipeline.delete(f"{DIRTY_USERS_KEY}:tmp")
+        await pipeline.execute()
+
+    async def pop_dirty(self, count: int) -> list[int]:
+        user_ids = await self.redis.spop(DIRTY_USERS_KEY, count)
+        return [int(user_id) for user_id in user_ids or []]
@@ -0,0 +1,68 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, TypeVar
+
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.exceptions.pagination import InvalidCursorError
+
+T = TypeVar("T")
+
+ESTIMATED_COUNT_THRESHOLD = 100_000
+
+
+async def paginate(session: AsyncSession, stmt: Select[tuple[T]], limit: int, offset: int) -> tuple[Sequence[T], int]:
+    # The total comes from a window function evaluated by the same query, so rows are never hydrated just to be counted
+    result = await session.execute(stmt.add_columns(func.count().over()).limit(limit).offset(offset))
+    rows = result.all()
+    if rows:
+        return [row[0] for row in rows], rows[0][1]
+    if offset == 0:
+        return [], 0
+
+    # A page past the end has no rows to carry the window count
+    return [], await count(session, stmt)
+
+
+async def count(session: AsyncSession, stmt: Select[Any]) -> int:
+    count_stmt = select(func.count()).select_from(stmt.order_by(None).limit(None).offset(None).subquery())
+    return await session.scalar(count_stmt) or 0
+
+
+async def estimate_count(session: AsyncSession, table_name: str) -> int:
+    # Planner statistics refreshed by autovacuum/ANALYZE, -1 means the table was never analyzed
+    estimate = await session.scalar(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+        {"table_name": table_name},
+    )
+    return max(estimate or 0, 0)
+
+
+async def paginate_estimated(
+    session: AsyncSession, stmt: Select[tuple[T]], table_name: str, limit: int, offset: int
+) -> tuple[Sequence[T], int]:
+    estimate = await estimate_count(session, table_name)
+    if estimate < ESTIMATED_COUNT_THRESHOLD:
+        return await paginate(session, stmt, limit, offset)
+
+    result = await session.scalars(stmt.limit(limit).offset(offset))
+    return result.all(), estimate
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(payload)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        msg = "Invalid pagination cursor"
+        raise InvalidCursorError(msg) from e
@@ -0,0 +1,110 @@
+import asyncio
+import contextlib
+import logging
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.core.cache import LRUCache
+from src.schemas.user import UserRead
+
+logger = logging.getLogger(__name__)
+
+
+class PrincipalCacheRepository:
+    def __init__(
+        self,
+        redis: Redis | None = None,
+        lru_size: int = 10_000,
+        ttl: int = 30,
+        *,
+        broadcast_redis: Redis | None = None,
+        channel: str = "principal:invalidate",
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        self.redis = redis
+        self.ttl = ttl
+        self._lru: LRUCache[int, UserRead] = LRUCache(lru_size, ttl=ttl)
+        self._broadcast_redis = broadcast_redis
+        self._channel = channel
+        self._reconnect_delay = reconnect_delay
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        if self._broadcast_redis is not None and self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"principal:{user_id}"
+
+    async def get(self, user_id: int) -> UserRead | None:
+        user = self._lru.get(user_id)
+        if user is not None or self.redis is None:
+            return user
+
+        try:
+            data = await self.redis.get(self._key(user_id))
+        except RedisError:
+            logger.warning("Principal cache is unavailable", exc_info=True)
+            return None
+        if data is None:
+            return None
+
+        user = UserRead.model_validate_json(data)
+        self._lru.set(user_id, user)
+        return user
+
+    async def set(self, user: UserRead) -> None:
+        self._lru.set(user.id, user)
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(self._key(user.id), user.model_dump_json(), ex=self.ttl)
+        except RedisError:
+            logger.warning("Principal cache is unavailable", exc_info=True)
+
+    async def invalidate(self, user_id: int) -> None:
+        # Must run after the change is committed, otherwise a concurrent miss can cache the old row again
+        self._lru.delete(user_id)
+        if self.redis is not None:
+            try:
+                await self.redis.delete(self._key(user_id))
+            except RedisError:
+                logger.warning("Principal cache is unavailable", exc_info=True)
+        if self._broadcast_redis is not None:
+            try:
+                await self._broadcast_redis.publish(self._channel, str(user_id))
+            except RedisError:
+                logger.warning("Failed to broadcast principal %s invalidation", user_id, exc_info=True)
+
+    async def _listen(self) -> None:
+        # Every worker drops its in-process entry, including the one that published
+        while True:
+            try:
+                async with self._broadcast_redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.subscribe(self._channel)
+                    async for event in pubsub.listen():
+                        self._handle(event)
+            except RedisError:
+                logger.exception("Principal invalidation subscription lost, reconnecting")
+                # Invalidations published while disconnected are lost, the cached entries can't be trusted
+                self._lru.clear()
+                await asyncio.sleep(self._reconnect_delay)
+
+    def _handle(self, event: dict) -> None:
+        if event.get("type") != "message":
+            return
+        try:
+            user_id = int(event["data"])
+        except (TypeError, ValueError):
+            logger.warning("Malformed principal invalidation event %r", event.get("data"))
+            return
+        self._lru.delete(user_id)
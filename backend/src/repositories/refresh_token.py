@@ -1,16 +1,15 @@
+from collections.abc import Sequence
 from datetime import UTC, datetime
 
-from redis.asyncio import Redis
-from sqlalchemy import select
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.token import RefreshToken
 
 
 class RefreshTokenRepository:
-    def __init__(self, session: AsyncSession, redis: Redis) -> None:
+    def __init__(self, session: AsyncSession) -> None:
         self.session = session
-        self.redis = redis
 
     async def get_by_token(self, token: str, *, active_only: bool = True) -> RefreshToken | None:
         query = select(RefreshToken).where(RefreshToken.token == token)
@@ -45,16 +44,23 @@ class RefreshTokenRepository:
         refresh_token.is_active = False
         await self.session.flush()
 
-    async def cache_refresh_token(self, token: str, expires_in: int) -> None:
-        await self.redis.set(
-            f"refresh_token:{token}",
-            "1",
-            ex=expires_in,
+    async def rotate_many(self, rotations: Sequence[tuple[str, str, datetime]]) -> None:
+        # Core table update so one executemany applies every (old, new, expires_at) rotation in order
+        table = RefreshToken.__table__
+        await self.session.execute(
+            update(table)
+            .where(table.c.token == bindparam("old_token"))
+            .values(token=bindparam("new_token"), expires_at=bindparam("new_expires_at")),
+            [
+                {"old_token": old_token, "new_token": new_token, "new_expires_at": expires_at}
+                for old_token, new_token, expires_at in rotations
+            ],
         )
 
-    async def get_cached_refresh_token(self, token: str) -> str | None:
-        result = await self.redis.get(f"refresh_token:{token}")
-        return result if result else None
-
-    async def delete_cached_refresh_token(self, token: str) -> None:
-        await self.redis.delete(f"refresh_token:{token}")
+    async def deactivate_by_user_ids(self, user_ids: Sequence[int]) -> None:
+        await self.session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.user_id.in_(user_ids), RefreshToken.is_active.is_(True))
+            .values(is_active=False)
+            .execution_options(synchronize_session=False)
+        )
@@ -0,0 +1,75 @@
+from enum import IntEnum
+
+from redis.asyncio import Redis
+
+KEY_PREFIX = "refresh_token:"
+ROTATED_KEY_PREFIX = "refresh_token:rotated:"
+USER_KEY_PREFIX = "refresh_tokens:user:"
+
+# KEYS: old token, old token tombstone, new token, user's live tokens
+# ARGV: old token, new token, user id, new token ttl, reuse grace period, token key prefix
+ROTATE_SCRIPT = """
+local ttl = redis.call('PTTL', KEYS[1])
+if ttl > 0 then
+    local now = redis.call('TIME')[1]
+    redis.call('DEL', KEYS[1])
+    redis.call('SET', KEYS[2], now, 'PX', ttl)
+    redis.call('SET', KEYS[3], ARGV[3], 'EX', ARGV[4])
+    redis.call('SREM', KEYS[4], ARGV[1])
+    redis.call('SADD', KEYS[4], ARGV[2])
+    redis.call('EXPIRE', KEYS[4], ARGV[4])
+    return 1
+end
+
+local rotated_at = redis.call('GET', KEYS[2])
+if not rotated_at then
+    return 0
+end
+if tonumber(redis.call('TIME')[1]) - tonumber(rotated_at) <= tonumber(ARGV[5]) then
+    return 2
+end
+
+for _, token in ipairs(redis.call('SMEMBERS', KEYS[4])) do
+    redis.call('DEL', ARGV[6] .. token)
+end
+redis.call('DEL', KEYS[2], KEYS[4])
+return 3
+"""
+
+
+class RotationResult(IntEnum):
+    NOT_FOUND = 0
+    ROTATED = 1
+    CONCURRENT = 2
+    REUSED = 3
+
+
+class RefreshTokenCacheRepository:
+    def __init__(self, redis: Redis, reuse_grace_period: int = 10) -> None:
+        self.redis = redis
+        self.reuse_grace_period = reuse_grace_period
+        self._rotate = redis.register_script(ROTATE_SCRIPT)
+
+    async def add(self, token: str, user_id: int, expires_in: int) -> None:
+        pipeline = self.redis.pipeline(transaction=True)
+        pipeline.set(f"{KEY_PREFIX}{token}", user_id, ex=expires_in)
+        pipeline.sadd(f"{USER_KEY_PREFIX}{user_id}", token)
+        pipeline.expire(f"{USER_KEY_PREFIX}{user_id}", expires_in)
+        await pipeline.execute()
+
+    async def rotate(self, old_token: str, new_token: str, user_id: int, expires_in: int) -> RotationResult:
+        """Swap a live refresh token for a new one in a single round trip.
+
+        A rotated token leaves a tombstone for the rest of its lifetime. Presenting it again after the grace period
+        means it was stolen or replayed, so every live token of the user is revoked.
+        """
+        result = await self._rotate(
+            keys=[
+                f"{KEY_PREFIX}{old_token}",
+                f"{ROTATED_KEY_PREFIX}{old_token}",
+                f"{KEY_PREFIX}{new_token}",
+                f"{USER_KEY_PREFIX}{user_id}",
+            ],
+            args=[old_token, new_token, user_id, expires_in, self.reuse_grace_period, KEY_PREFIX],
+        )
+        return RotationResult(int(result))
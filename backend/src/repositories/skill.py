@@ -1,11 +1,13 @@
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
 
-from sqlalchemy import and_, select
+from sqlalchemy import ARRAY, Integer, and_, any_, cast, delete, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
 from src.enums.skill_type import SkillType
 from src.models.skills import Skill
+from src.repositories.pagination import paginate, paginate_estimated
 
 
 class SkillRepository:
@@ -21,19 +23,23 @@ class SkillRepository:
         skill = Skill(user_id=user_id, name=name, type=type, description=description)
         self.session.add(skill)
         await self.session.flush()
-        await self.session.refresh(skill)
+        # The owner is no longer guaranteed to be in the identity map (principals are cached), load it eagerly
+        await self.session.refresh(skill, ["user"])
         return skill
 
-    async def get_by_user_id(self, user_id: int, limit: int = 100, offset: int = 0) -> tuple[Sequence[Skill], int]:
-        stmt = select(Skill).where(Skill.user_id == user_id).options(joinedload(Skill.user)).limit(limit).offset(offset)
-        result = await self.session.scalars(stmt)
-        skills = result.all()
-
-        count_stmt = select(Skill).where(Skill.user_id == user_id)
-        count_result = await self.session.scalars(count_stmt)
-        total = len(count_result.all())
+    async def bulk_create(self, user_id: int, skills: list[dict]) -> Sequence[Skill]:
+        # One multi-row INSERT ... RETURNING, then one query that loads the rows back with their owner
+        result = await self.session.scalars(
+            insert(Skill).values([{**skill, "user_id": user_id} for skill in skills]).returning(Skill.id)
+        )
+        skill_ids = result.all()
+        stmt = select(Skill).where(Skill.id == any_(cast(skill_ids, ARRAY(Integer)))).options(joinedload(Skill.user))
+        result = await self.session.scalars(stmt.order_by(Skill.id))
+        return result.all()
 
-        return skills, total
+    async def get_by_user_id(self, user_id: int, limit: int = 100, offset: int = 0) -> tuple[Sequence[Skill], int]:
+        stmt = select(Skill).where(Skill.user_id == user_id).options(joinedload(Skill.user))
+        return await paginate(self.session, stmt, limit, offset)
 
     async def get_by_user_and_type(
         self, user_id: int, skill_type: SkillType, limit: int = 100, offset: int = 0
@@ -42,46 +48,45 @@ class SkillRepository:
             select(Skill)
             .where(and_(Skill.user_id == user_id, Skill.type == skill_type))
             .options(joinedload(Skill.user))
-            .limit(limit)
-            .offset(offset)
         )
-        result = await self.session.scalars(stmt)
-        skills = result.all()
-
-        count_stmt = select(Skill).where(and_(Skill.user_id == user_id, Skill.type == skill_type))
-        count_result = await self.session.scalars(count_stmt)
-        total = len(count_result.all())
+        return await paginate(self.session, stmt, limit, offset)
 
-        return skills, total
+    async def get_all_by_user_id(self, user_id: int) -> Sequence[Skill]:
+        stmt = select(Skill).where(Skill.user_id == user_id).order_by(Skill.id)
+        result = await self.session.scalars(stmt)
+        return result.all()
 
     async def get_by_ids(self, skill_ids: list[int]) -> Sequence[Skill]:
         stmt = select(Skill).where(Skill.id.in_(skill_ids)).options(joinedload(Skill.user))
         result = await self.session.scalars(stmt)
         return result.all()
 
+    async def stream_batches(self, batch_size: int, after_id: int = 0) -> AsyncIterator[Sequence[Skill]]:
+        stmt = (
+            select(Skill)
+            .where(Skill.id > after_id)
+            .order_by(Skill.id)
+            .options(joinedload(Skill.user))
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream_scalars(stmt)
+        async for batch in result.partitions(batch_size):
+            yield batch
+
+    async def get_ids_updated_since(self, since: datetime) -> Sequence[int]:
+        stmt = select(Skill.id).where(Skill.updated_at >= since)
+        result = await self.session.scalars(stmt)
+        return result.all()
+
     async def get_all(
         self, skill_type: SkillType | None = None, limit: int = 100, offset: int = 0
     ) -> tuple[Sequence[Skill], int]:
         if skill_type:
-            stmt = (
-                select(Skill)
-                .where(Skill.type == skill_type)
-                .options(joinedload(Skill.user))
-                .limit(limit)
-                .offset(offset)
-            )
-            count_stmt = select(Skill).where(Skill.type == skill_type)
-        else:
-            stmt = select(Skill).options(joinedload(Skill.user)).limit(limit).offset(offset)
-            count_stmt = select(Skill)
-
-        result = await self.session.scalars(stmt)
-        skills = result.all()
+            stmt = select(Skill).where(Skill.type == skill_type).options(joinedload(Skill.user))
+            return await paginate(self.session, stmt, limit, offset)
 
-        count_result = await self.session.scalars(count_stmt)
-        total = len(count_result.all())
-
-        return skills, total
+        stmt = select(Skill).options(joinedload(Skill.user))
+        return await paginate_estimated(self.session, stmt, Skill.__tablename__, limit, offset)
 
     async def update(self, skill_id: int, name: str | None = None, description: str | None = None) -> Skill | None:
         skill = await self.get(skill_id)
@@ -103,11 +108,18 @@ class SkillRepository:
         await self.session.flush()
         return True
 
-    async def bulk_delete(self, skill_ids: list[int]) -> int:
-        stmt = select(Skill).where(Skill.id.in_(skill_ids))
+    async def get_owner_ids(self, skill_ids: list[int]) -> dict[int, int]:
+        # A single array parameter keeps one prepared statement regardless of how many ids are passed
+        stmt = select(Skill.id, Skill.user_id).where(Skill.id == any_(cast(skill_ids, ARRAY(Integer))))
+        result = await self.session.execute(stmt)
+        return dict(result.tuples().all())
+
+    async def bulk_delete(self, skill_ids: list[int], user_id: int) -> Sequence[int]:
+        stmt = (
+            delete(Skill)
+            .where(Skill.id == any_(cast(skill_ids, ARRAY(Integer))), Skill.user_id == user_id)
+            .returning(Skill.id)
+            .execution_options(synchronize_session=False)
+        )
         result = await self.session.scalars(stmt)
-        skills = result.all()
-        for skill in skills:
-            await self.session.delete(skill)
-        await self.session.flush()
-        return len(skills)
+        return result.all()
@@ -0,0 +1,87 @@
+from collections.abc import Sequence
+from datetime import UTC, datetime
+
+from sqlalchemy import ARRAY, Integer, cast, delete, func, insert, literal, literal_column, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncSessionTransaction
+
+from src.models.skill_index_task import SkillIndexTask
+from src.models.skills import Skill
+
+# First key of the two-key advisory locks taken on skill ids, keeps them apart from any other advisory lock
+SKILL_SYNC_LOCK_NAMESPACE = 1
+
+
+class SkillIndexTaskRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def enqueue(self, skill_ids: list[int]) -> None:
+        if not skill_ids:
+            return
+        now = datetime.now(UTC)
+        await self.session.execute(
+            insert(SkillIndexTask).values(
+                [
+                    {"skill_id": skill_id, "attempts": 0, "available_at": now, "created_at": now, "updated_at": now}
+                    for skill_id in skill_ids
+                ]
+            )
+        )
+
+    async def enqueue_user_skills(self, user_id: int) -> None:
+        now = literal(datetime.now(UTC))
+        await self.session.execute(
+            insert(SkillIndexTask).from_select(
+                ["skill_id", "attempts", "available_at", "created_at", "updated_at"],
+                select(Skill.id, literal(0), now, now, now).where(Skill.user_id == user_id),
+            )
+        )
+
+    async def claim_batch(self, limit: int, max_attempts: int) -> Sequence[SkillIndexTask]:
+        stmt = (
+            select(SkillIndexTask)
+            .where(
+                SkillIndexTask.available_at <= func.now(),
+                SkillIndexTask.attempts < max_attempts,
+            )
+            .order_by(SkillIndexTask.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.scalars(stmt)
+        return result.all()
+
+    async def lock_skills(self, skill_ids: list[int]) -> set[int]:
+        """Take transaction-level sync locks on the skills that no other worker holds, return their ids."""
+        ids = func.unnest(cast(skill_ids, ARRAY(Integer))).table_valued("skill_id").render_derived()
+        stmt = select(ids.c.skill_id).where(func.pg_try_advisory_xact_lock(SKILL_SYNC_LOCK_NAMESPACE, ids.c.skill_id))
+        result = await self.session.scalars(stmt)
+        return set(result.all())
+
+    def savepoint(self) -> AsyncSessionTransaction:
+        """Savepoint for work that may fail after the claim, rolling back to it keeps the claim and sync locks."""
+        return self.session.begin_nested()
+
+    async def complete(self, task_ids: list[int]) -> None:
+        await self.session.execute(delete(SkillIndexTask).where(SkillIndexTask.id.in_(task_ids)))
+
+    async def reschedule(self, task_ids: list[int], error: str, base_delay: float, max_delay: float) -> None:
+        delay_seconds = func.least(base_delay * func.power(2, SkillIndexTask.attempts), max_delay)
+        await self.session.execute(
+            update(SkillIndexTask)
+            .where(SkillIndexTask.id.in_(task_ids))
+            .values(
+                attempts=SkillIndexTask.attempts + 1,
+                available_at=func.now() + delay_seconds * literal_column("interval '1 second'"),
+                last_error=error,
+            )
+        )
+
+    async def get_lag(self, max_attempts: int) -> tuple[int, int, datetime | None]:
+        stmt = select(
+            func.count().filter(SkillIndexTask.attempts < max_attempts),
+            func.count().filter(SkillIndexTask.attempts >= max_attempts),
+            func.min(SkillIndexTask.created_at).filter(SkillIndexTask.attempts < max_attempts),
+        )
+        pending, failed, oldest_pending_at = (await self.session.execute(stmt)).one()
+        return pending, failed, oldest_pending_at
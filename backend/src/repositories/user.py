@@ -13,6 +13,16 @@ class UserRepository:
     async def get(self, user_id: int) -> User | None:
         return await self.session.get(User, user_id)
 
+    async def get_by_ids(self, user_ids: list[int]) -> Sequence[User]:
+        stmt = select(User).where(User.id.in_(user_ids))
+        result = await self.session.scalars(stmt)
+        return result.all()
+
+    async def get_ids_after(self, after_id: int, limit: int) -> Sequence[int]:
+        stmt = select(User.id).where(User.id > after_id).order_by(User.id).limit(limit)
+        result = await self.session.scalars(stmt)
+        return result.all()
+
     async def get_by_email(self, email: str) -> User | None:
         stmt = select(User).where(User.email == email)
         return await self.session.scalar(stmt)
@@ -1,23 +1,286 @@
-from typing import Any
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any, Literal
 
 from qdrant_client.async_qdrant_client import AsyncQdrantClient
-from qdrant_client.conversions import common_types as qdrant_types
 from qdrant_client.http import models
 
 from src.enums.skill_type import SkillType
 
+logger = logging.getLogger(__name__)
 
-class VectorSearchRepository:
-    def __init__(self, client: AsyncQdrantClient) -> None:
+RELATIVE_SCORE_THRESHOLD = 0.5
+
+# Filtered fields get payload indexes, which also lets Qdrant build filter-aware HNSW links for them
+PAYLOAD_INDEXES = {
+    "type": models.PayloadSchemaType.KEYWORD,
+    "user_id": models.PayloadSchemaType.INTEGER,
+}
+
+QuantizationMode = Literal["none", "scalar", "binary"]
+
+SkillVector = tuple[int, list[float], dict[str, Any]]
+
+
+@dataclass
+class ScoredSkill:
+    id: int
+    score: float
+    payload: dict[str, Any] | None
+
+
+class VectorSearchRepository(ABC):
+    """Skill embeddings store. A collection is the unit a reindex fills in the background and swaps in."""
+
+    collection_name: str
+
+    def __init__(self, search_window_size: int = 1000, count_cache_ttl: float = 60) -> None:
+        self._search_window_size = search_window_size
+        self._count_cache_ttl = count_cache_ttl
+        self._count_cache: dict[SkillType | None, tuple[int, float]] = {}
+        self._count_refresh_tasks: dict[SkillType | None, asyncio.Task[int]] = {}
+
+    @abstractmethod
+    async def create_collection(self) -> None: ...
+
+    @abstractmethod
+    async def create_shadow_collection(self, collection_name: str) -> None: ...
+
+    @abstractmethod
+    async def swap_collection(self, collection_name: str) -> str | None:
+        """Make the shadow collection the live one, return the collection it replaced."""
+
+    @abstractmethod
+    async def drop_collection(self, collection_name: str) -> None: ...
+
+    @abstractmethod
+    async def add_skills(self, skills: list[SkillVector], collection_name: str | None = None) -> None: ...
+
+    @abstractmethod
+    async def delete_skills(self, skill_ids: list[int]) -> None: ...
+
+    @abstractmethod
+    async def get_vectors(self, skill_ids: list[int]) -> dict[int, list[float]]: ...
+
+    @abstractmethod
+    async def get_user_ids(self, skill_ids: list[int]) -> set[int]: ...
+
+    @abstractmethod
+    def stream_skill_ids(self, batch_size: int) -> AsyncIterator[list[int]]:
+        """Ids of every skill in the live collection, in batches."""
+
+    @abstractmethod
+    async def search_batch(
+        self, queries: list[tuple[list[float], SkillType]], exclude_user_id: int | None = None, limit: int = 10
+    ) -> list[list[ScoredSkill]]:
+        """Nearest skills of the given type for every query, every hit carries "user_id" in its payload."""
+
+    async def search(
+        self, query_vector: list[float], skilltype: SkillType | None = None, limit: int = 10, offset: int = 0
+    ) -> tuple[list[ScoredSkill], int]:
+        # The relative cutoff and the requested page are both derived from a single candidate window,
+        # and the total is an estimate cached per filter, so a search costs one round trip instead of three.
+        window_size = min(offset + limit, self._search_window_size)
+        if window_size <= offset:
+            return [], min(await self._get_estimated_count(skilltype), self._search_window_size)
+
+        hits, total = await asyncio.gather(
+            self._search_window(query_vector, skilltype, window_size),
+            self._get_estimated_count(skilltype),
+        )
+        if not hits:
+            return [], 0
+
+        threshold = hits[0].score * RELATIVE_SCORE_THRESHOLD
+        candidates = [hit for hit in hits if hit.score >= threshold]
+        # Nothing past the window is ever served, and a window left unfilled already holds every result
+        if len(candidates) < window_size:
+            total = len(candidates)
+        return candidates[offset : offset + limit], min(total, self._search_window_size)
+
+    @abstractmethod
+    async def _search_window(
+        self, query_vector: list[float], skilltype: SkillType | None, window_size: int
+    ) -> list[ScoredSkill]: ...
+
+    @abstractmethod
+    async def _count(self, skilltype: SkillType | None) -> int: ...
+
+    async def _get_estimated_count(self, skilltype: SkillType | None) -> int:
+        cached = self._count_cache.get(skilltype)
+        if cached is None:
+            return await self._refresh_count(skilltype)
+
+        total, cached_at = cached
+        if time.monotonic() - cached_at > self._count_cache_ttl and skilltype not in self._count_refresh_tasks:
+            task = asyncio.create_task(self._refresh_count(skilltype))
+            self._count_refresh_tasks[skilltype] = task
+            task.add_done_callback(lambda done: self._on_count_refreshed(skilltype, done))
+        return total
+
+    def _on_count_refreshed(self, skilltype: SkillType | None, task: asyncio.Task[int]) -> None:
+        self._count_refresh_tasks.pop(skilltype, None)
+        if not task.cancelled() and task.exception():
+            logger.warning("Failed to refresh skills count estimate", exc_info=task.exception())
+
+    async def _refresh_count(self, skilltype: SkillType | None) -> int:
+        count = await self._count(skilltype)
+        self._count_cache[skilltype] = (count, time.monotonic())
+        return count
+
+
+class QdrantVectorSearchRepository(VectorSearchRepository):
+    def __init__(
+        self,
+        client: AsyncQdrantClient,
+        search_window_size: int = 1000,
+        count_cache_ttl: float = 60,
+        *,
+        vector_size: int = 1024,
+        hnsw_m: int = 16,
+        hnsw_ef_construct: int = 100,
+        hnsw_ef: int | None = None,
+        quantization: QuantizationMode = "none",
+        quantization_oversampling: float = 2.0,
+        quantization_rescore: bool = True,
+    ) -> None:
+        super().__init__(search_window_size, count_cache_ttl)
         self._client = client
         self.collection_name = "skills"
+        self.vector_size = vector_size
+        self._hnsw_config = models.HnswConfigDiff(m=hnsw_m, ef_construct=hnsw_ef_construct)
+        self._quantization = quantization
+        self._search_params = None
+        if hnsw_ef is not None or quantization != "none":
+            self._search_params = models.SearchParams(
+                hnsw_ef=hnsw_ef,
+                # The quantized index picks oversampling * limit candidates, the originals on disk re-rank them
+                quantization=models.QuantizationSearchParams(
+                    rescore=quantization_rescore, oversampling=quantization_oversampling
+                )
+                if quantization != "none"
+                else None,
+            )
 
     async def create_collection(self) -> None:
-        if not await self._client.collection_exists(self.collection_name):
+        if not await self._collection_exists(self.collection_name):
+            await self.create_shadow_collection(self.collection_name)
+        else:
+            await self.migrate_collection(self.collection_name)
+
+    async def create_shadow_collection(self, collection_name: str) -> None:
+        if not await self._client.collection_exists(collection_name):
             await self._client.create_collection(
-                collection_name=self.collection_name,
-                vectors_config=models.VectorParams(size=1024, distance=models.Distance.COSINE),
+                collection_name=collection_name,
+                vectors_config=models.VectorParams(
+                    size=self.vector_size, distance=models.Distance.COSINE, on_disk=self._quantization != "none"
+                ),
+                hnsw_config=self._hnsw_config,
+                quantization_config=self._build_quantization_config(),
+            )
+        await self.migrate_collection(collection_name)
+
+    async def migrate_collection(self, collection_name: str) -> None:
+        """Bring an existing collection to the configured schema without recreating it.
+
+        Changed HNSW parameters and new payload indexes are applied in place, Qdrant rebuilds the index in the
+        background while the collection keeps serving searches.
+        """
+        info = await self._client.get_collection(collection_name)
+        vectors = info.config.params.vectors
+        if isinstance(vectors, models.VectorParams) and vectors.size != self.vector_size:
+            # A different embedding model, its vectors can't be compared with the stored ones
+            msg = (
+                f"Collection {collection_name} holds {vectors.size}-dimensional vectors, the embeddings backend "
+                f"produces {self.vector_size}. Rebuild the index with: python -m src.cli.reindex_skills"
+            )
+            raise RuntimeError(msg)
+
+        hnsw = info.config.hnsw_config
+        if (hnsw.m, hnsw.ef_construct) != (self._hnsw_config.m, self._hnsw_config.ef_construct):
+            logger.info(
+                "Updating HNSW config of %s from m=%s, ef_construct=%s to m=%s, ef_construct=%s",
+                collection_name,
+                hnsw.m,
+                hnsw.ef_construct,
+                self._hnsw_config.m,
+                self._hnsw_config.ef_construct,
             )
+            await self._client.update_collection(collection_name, hnsw_config=self._hnsw_config)
+
+        await self._migrate_quantization(collection_name, info)
+
+        for field_name, field_schema in PAYLOAD_INDEXES.items():
+            existing = info.payload_schema.get(field_name)
+            if existing is not None and existing.data_type == field_schema:
+                continue
+            logger.info("Creating %s payload index on %s.%s", field_schema.value, collection_name, field_name)
+            await self._client.create_payload_index(collection_name, field_name, field_schema=field_schema)
+
+    async def _migrate_quantization(self, collection_name: str, info: models.CollectionInfo) -> None:
+        current = info.config.quantization_config
+        current_mode: QuantizationMode = "none"
+        if isinstance(current, models.ScalarQuantization):
+            current_mode = "scalar"
+        elif isinstance(current, models.BinaryQuantization):
+            current_mode = "binary"
+        vectors = info.config.params.vectors
+        on_disk = bool(vectors.on_disk) if isinstance(vectors, models.VectorParams) else False
+        if current_mode == self._quantization and on_disk == (self._quantization != "none"):
+            return
+
+        logger.info("Switching quantization of %s from %s to %s", collection_name, current_mode, self._quantization)
+        await self._client.update_collection(
+            collection_name,
+            vectors_config={"": models.VectorParamsDiff(on_disk=self._quantization != "none")},
+            quantization_config=self._build_quantization_config() or models.Disabled.DISABLED,
+        )
+
+    def _build_quantization_config(self) -> models.ScalarQuantization | models.BinaryQuantization | None:
+        # Quantized vectors stay in RAM for the HNSW traversal, the full float32 vectors are only read to rescore
+        if self._quantization == "scalar":
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, quantile=0.99, always_ram=True)
+            )
+        if self._quantization == "binary":
+            return models.BinaryQuantization(binary=models.BinaryQuantizationConfig(always_ram=True))
+        return None
+
+    async def swap_collection(self, collection_name: str) -> str | None:
+        aliases = await self._client.get_aliases()
+        previous = next(
+            (alias.collection_name for alias in aliases.aliases if alias.alias_name == self.collection_name), None
+        )
+        operations: list[models.CreateAliasOperation | models.DeleteAliasOperation] = [
+            models.CreateAliasOperation(
+                create_alias=models.CreateAlias(collection_name=collection_name, alias_name=self.collection_name)
+            )
+        ]
+        if previous is not None:
+            operations.insert(
+                0, models.DeleteAliasOperation(delete_alias=models.DeleteAlias(alias_name=self.collection_name))
+            )
+        elif await self._client.collection_exists(self.collection_name):
+            # The first swap replaces the physical "skills" collection with an alias. This step can't be atomic
+            # because an alias and a collection can't share a name.
+            await self._client.delete_collection(self.collection_name)
+
+        await self._client.update_collection_aliases(change_aliases_operations=operations)
+        self._count_cache.clear()
+        return previous
+
+    async def drop_collection(self, collection_name: str) -> None:
+        await self._client.delete_collection(collection_name)
+
+    async def _collection_exists(self, name: str) -> bool:
+        if await self._client.collection_exists(name):
+            return True
+        aliases = await self._client.get_aliases()
+        return any(alias.alias_name == name for alias in aliases.aliases)
 
     async def add_skill(self, skill_id: int, embedding: list[float], payload: dict[str, Any] | None = None) -> None:
         await self._client.upsert(
@@ -31,38 +294,109 @@ class VectorSearchRepository:
             ],
         )
 
+    async def add_skills(self, skills: list[SkillVector], collection_name: str | None = None) -> None:
+        await self._client.upsert(
+            collection_name=collection_name or self.collection_name,
+            points=[
+                models.PointStruct(id=skill_id, vector=embedding, payload=payload)
+                for skill_id, embedding, payload in skills
+            ],
+        )
+
     async def delete_skill(self, skill_id: int) -> None:
         await self._client.delete(collection_name=self.collection_name, points_selector=[skill_id])
 
     async def delete_skills(self, skill_ids: list[int]) -> None:
         await self._client.delete(collection_name=self.collection_name, points_selector=skill_ids)
 
-    async def search(
-        self, query_vector: list[float], skilltype: SkillType | None = None, limit: int = 10, offset: int = 0
-    ) -> tuple[qdrant_types.QueryResponse, int]:
-        if skilltype:
-            query_filter = models.Filter(
-                must=[
-                    models.FieldCondition(
-                        key="type",
-                        match=models.MatchValue(value=skilltype.value),
-                    )
-                ]
+    async def _search_window(
+        self, query_vector: list[float], skilltype: SkillType | None, window_size: int
+    ) -> list[ScoredSkill]:
+        response = await self._client.query_points(
+            collection_name=self.collection_name,
+            query=query_vector,
+            query_filter=self._build_type_filter(skilltype),
+            search_params=self._search_params,
+            limit=window_size,
+        )
+        return [self._to_scored_skill(point) for point in response.points]
+
+    async def get_vectors(self, skill_ids: list[int]) -> dict[int, list[float]]:
+        records = await self._client.retrieve(
+            collection_name=self.collection_name, ids=skill_ids, with_payload=False, with_vectors=True
+        )
+        return {int(record.id): record.vector for record in records}
+
+    async def get_user_ids(self, skill_ids: list[int]) -> set[int]:
+        records = await self._client.retrieve(
+            collection_name=self.collection_name, ids=skill_ids, with_payload=["user_id"], with_vectors=False
+        )
+        return {record.payload["user_id"] for record in records if record.payload and "user_id" in record.payload}
+
+    async def stream_skill_ids(self, batch_size: int) -> AsyncIterator[list[int]]:
+        offset = None
+        while True:
+            records, offset = await self._client.scroll(
+                collection_name=self.collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=False,
+                with_vectors=False,
             )
-        else:
-            query_filter = None
-        result_best_score = await self._client.query_points(
-            collection_name=self.collection_name, query=query_vector, query_filter=query_filter, limit=1
+            if records:
+                yield [int(record.id) for record in records]
+            if offset is None:
+                return
+
+    async def search_batch(
+        self, queries: list[tuple[list[float], SkillType]], exclude_user_id: int | None = None, limit: int = 10
+    ) -> list[list[ScoredSkill]]:
+        if not queries:
+            return []
+        must_not = (
+            [models.FieldCondition(key="user_id", match=models.MatchValue(value=exclude_user_id))]
+            if exclude_user_id is not None
+            else None
         )
-        if not result_best_score:
-            return None, 0
-        threshold = result_best_score.points[0].score * 0.5
-        total = await self._client.count(collection_name=self.collection_name, count_filter=query_filter)
-        return await self._client.query_points(
+        responses = await self._client.query_batch_points(
             collection_name=self.collection_name,
-            query=query_vector,
-            limit=limit,
-            offset=offset,
-            query_filter=query_filter,
-            score_threshold=threshold,
-        ), total
+            requests=[
+                models.QueryRequest(
+                    query=query_vector,
+                    filter=models.Filter(
+                        must=self._build_type_filter(skilltype).must,
+                        must_not=must_not,
+                    ),
+                    params=self._search_params,
+                    limit=limit,
+                    with_payload=True,
+                )
+                for query_vector, skilltype in queries
+            ],
+        )
+        return [[self._to_scored_skill(point) for point in response.points] for response in responses]
+
+    async def _count(self, skilltype: SkillType | None) -> int:
+        result = await self._client.count(
+            collection_name=self.collection_name,
+            count_filter=self._build_type_filter(skilltype),
+            exact=False,
+        )
+        return result.count
+
+    @staticmethod
+    def _to_scored_skill(point: models.ScoredPoint) -> ScoredSkill:
+        return ScoredSkill(id=int(point.id), score=point.score, payload=point.payload)
+
+    @staticmethod
+    def _build_type_filter(skilltype: SkillType | None) -> models.Filter | None:
+        if not skilltype:
+            return None
+        return models.Filter(
+            must=[
+                models.FieldCondition(
+                    key="type",
+                    match=models.MatchValue(value=skilltype.value),
+                )
+            ]
+        )
@@ -0,0 +1,362 @@
+import logging
+from collections.abc import AsyncIterator
+from typing import Any
+
+from sqlalchemy import (
+    ARRAY,
+    Column,
+    Float,
+    Index,
+    Integer,
+    MetaData,
+    Table,
+    Text,
+    any_,
+    cast,
+    delete,
+    func,
+    literal,
+    select,
+    text,
+    true,
+    union_all,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy.types import UserDefinedType
+
+from src.db.manager import DatabaseManager
+from src.enums.skill_type import SkillType
+from src.models.skills import Skill
+from src.repositories.vector_search import ScoredSkill, SkillVector, VectorSearchRepository
+from src.schemas.skills import SkillSearchRead
+
+logger = logging.getLogger(__name__)
+
+_identifier_preparer = postgresql.dialect().identifier_preparer
+
+
+class Vector(UserDefinedType):
+    """pgvector column exchanged in its text form, so neither asyncpg nor the app needs the pgvector package."""
+
+    cache_ok = True
+
+    def __init__(self, dimension: int) -> None:
+        self.dimension = dimension
+
+    def get_col_spec(self, **_: Any) -> str:
+        return f"vector({self.dimension})"
+
+    def bind_processor(self, _dialect: Any) -> Any:
+        def process(value: list[float] | None) -> str | None:
+            return None if value is None else f"[{','.join(map(str, value))}]"
+
+        return process
+
+    def bind_expression(self, bindvalue: Any) -> Any:
+        return cast(cast(bindvalue, Text), self)
+
+    def column_expression(self, column: Any) -> Any:
+        return cast(column, Text)
+
+    def result_processor(self, _dialect: Any, _coltype: Any) -> Any:
+        def process(value: str | None) -> list[float] | None:
+            return None if value is None else [float(component) for component in value[1:-1].split(",")]
+
+        return process
+
+
+class PgVectorSearchRepository(VectorSearchRepository):
+    """Skill embeddings in a Postgres table next to "skills", searched with a pgvector HNSW index.
+
+    Rows keep "type" and "user_id" for filtering inside the index scan, everything else is joined from "skills"
+    and "users" in the same statement: search hydrates its hits in one round trip and never returns a deleted
+    or outdated skill. Like Qdrant collections, the tables are created at runtime because their dimension
+    depends on the embeddings backend.
+    """
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        search_window_size: int = 1000,
+        count_cache_ttl: float = 60,
+        *,
+        vector_size: int = 1024,
+        hnsw_m: int = 16,
+        hnsw_ef_construction: int = 64,
+        hnsw_ef_search: int = 100,
+        iterative_scan: bool = True,
+    ) -> None:
+        super().__init__(search_window_size, count_cache_ttl)
+        self.db_manager = db_manager
+        self.collection_name = "skill_embeddings"
+        self.vector_size = vector_size
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.hnsw_ef_search = hnsw_ef_search
+        self.iterative_scan = iterative_scan
+        # Statements are compiled once per Table object, so each table name keeps a single one
+        self._tables: dict[str, Table] = {}
+
+    async def create_collection(self) -> None:
+        async with self.db_manager.session_factory() as session:
+            extension = await session.scalar(text("SELECT extversion FROM pg_extension WHERE extname = 'vector'"))
+            if extension is None:
+                msg = (
+                    "The pgvector extension is not installed. Use a Postgres image that ships it "
+                    "(e.g. pgvector/pgvector:pg15) and run: CREATE EXTENSION vector"
+                )
+                raise RuntimeError(msg)
+        await self._create_table(self.collection_name)
+        await self._create_index(self.collection_name)
+
+    async def create_shadow_collection(self, collection_name: str) -> None:
+        # The HNSW index is built when the filled table is swapped in, bulk building is much faster than inserting
+        await self._create_table(collection_name)
+
+    async def swap_collection(self, collection_name: str) -> str | None:
+        await self._create_index(collection_name)
+        async with self.db_manager.session_factory() as session:
+            previous = None
+            if await self._table_exists(session, self.collection_name):
+                previous = f"{collection_name}_previous"
+                await self._rename_table(session, self.collection_name, previous)
+            # Both renames commit together, searches see either the old table or the new one
+            await self._rename_table(session, collection_name, self.collection_name)
+            await session.commit()
+        self._count_cache.clear()
+        return previous
+
+    async def drop_collection(self, collection_name: str) -> None:
+        async with self.db_manager.session_factory() as session:
+            await session.execute(text(f"DROP TABLE IF EXISTS {_identifier_preparer.quote(collection_name)}"))
+            await session.commit()
+
+    async def add_skills(self, skills: list[SkillVector], collection_name: str | None = None) -> None:
+        if not skills:
+            return
+        table = self._table(collection_name or self.collection_name)
+        stmt = postgresql.insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.skill_id], set_={"embedding": stmt.excluded.embedding}
+        )
+        async with self.db_manager.session_factory() as session:
+            await session.execute(
+                stmt,
+                [
+                    {
+                        "skill_id": skill_id,
+                        "type": SkillType(payload["type"]),
+                        "user_id": payload["user_id"],
+                        "embedding": embedding,
+                    }
+                    for skill_id, embedding, payload in skills
+                ],
+            )
+            await session.commit()
+
+    async def delete_skills(self, skill_ids: list[int]) -> None:
+        table = self._table(self.collection_name)
+        async with self.db_manager.session_factory() as session:
+            await session.execute(delete(table).where(table.c.skill_id == any_(cast(skill_ids, ARRAY(Integer)))))
+            await session.commit()
+
+    async def get_vectors(self, skill_ids: list[int]) -> dict[int, list[float]]:
+        table = self._table(self.collection_name)
+        stmt = select(table.c.skill_id, table.c.embedding).where(
+            table.c.skill_id == any_(cast(skill_ids, ARRAY(Integer)))
+        )
+        async with self.db_manager.session_factory() as session:
+            result = await session.execute(stmt)
+            return dict(result.tuples().all())
+
+    async def get_user_ids(self, skill_ids: list[int]) -> set[int]:
+        table = self._table(self.collection_name)
+        stmt = select(table.c.user_id).where(table.c.skill_id == any_(cast(skill_ids, ARRAY(Integer))))
+        async with self.db_manager.session_factory() as session:
+            return set((await session.scalars(stmt)).all())
+
+    async def stream_skill_ids(self, batch_size: int) -> AsyncIterator[list[int]]:
+        table = self._table(self.collection_name)
+        last_skill_id = 0
+        while True:
+            stmt = (
+                select(table.c.skill_id)
+                .where(table.c.skill_id > last_skill_id)
+                .order_by(table.c.skill_id)
+                .limit(batch_size)
+            )
+            async with self.db_manager.session_factory() as session:
+                skill_ids = list((await session.scalars(stmt)).all())
+            if not skill_ids:
+                return
+            yield skill_ids
+            last_skill_id = skill_ids[-1]
+
+    async def search_batch(
+        self, queries: list[tuple[list[float], SkillType]], exclude_user_id: int | None = None, limit: int = 10
+    ) -> list[list[ScoredSkill]]:
+        if not queries:
+            return []
+        table = self._table(self.collection_name)
+        selects = []
+        for query_index, (query_vector, skilltype) in enumerate(queries):
+            distance = self._distance(table, query_vector)
+            stmt = (
+                select(
+                    literal(query_index).label("query_index"),
+                    table.c.skill_id,
+                    table.c.user_id,
+                    (1 - distance).label("score"),
+                )
+                .join(Skill, Skill.id == table.c.skill_id)
+                .where(table.c.type == skilltype)
+                .order_by(distance)
+                .limit(limit)
+            )
+            if exclude_user_id is not None:
+                stmt = stmt.where(table.c.user_id != exclude_user_id)
+            selects.append(stmt)
+
+        results: list[list[ScoredSkill]] = [[] for _ in queries]
+        async with self.db_manager.session_factory() as session:
+            await self._configure_search(session)
+            rows = await session.execute(union_all(*selects))
+            for query_index, skill_id, user_id, score in rows.tuples():
+                results[query_index].append(ScoredSkill(id=skill_id, score=score, payload={"user_id": user_id}))
+        for hits in results:
+            hits.sort(key=lambda hit: hit.score, reverse=True)
+        return results
+
+    async def _search_window(
+        self, query_vector: list[float], skilltype: SkillType | None, window_size: int
+    ) -> list[ScoredSkill]:
+        table = self._table(self.collection_name)
+        distance = self._distance(table, query_vector)
+        stmt = (
+            select(Skill, (1 - distance).label("score"))
+            .join(table, table.c.skill_id == Skill.id)
+            .options(joinedload(Skill.user))
+            .order_by(distance)
+            .limit(window_size)
+        )
+        if skilltype:
+            stmt = stmt.where(table.c.type == skilltype)
+
+        async with self.db_manager.session_factory() as session:
+            await self._configure_search(session)
+            rows = (await session.execute(stmt)).tuples().all()
+        hits = [
+            ScoredSkill(
+                id=skill.id,
+                score=score,
+                payload=SkillSearchRead.model_validate(skill).model_dump(mode="json", exclude={"id"}),
+            )
+            for skill, score in rows
+        ]
+        # Iterative scans return hits in a relaxed order
+        hits.sort(key=lambda hit: hit.score, reverse=True)
+        return hits
+
+    async def _count(self, skilltype: SkillType | None) -> int:
+        table = self._table(self.collection_name)
+        stmt = select(func.count()).select_from(table)
+        if skilltype:
+            stmt = stmt.where(table.c.type == skilltype)
+        async with self.db_manager.session_factory() as session:
+            return await session.scalar(stmt) or 0
+
+    async def _configure_search(self, session: AsyncSession) -> None:
+        # The filter is applied to the hnsw.ef_search candidates, iterative scans (pgvector 0.8+) keep walking
+        # the graph until enough of them pass it instead of returning fewer rows than the limit.
+        # Both are transaction-local, pooled connections keep the server defaults.
+        options = [func.set_config("hnsw.ef_search", str(self.hnsw_ef_search), true())]
+        if self.iterative_scan:
+            options.append(func.set_config("hnsw.iterative_scan", "relaxed_order", true()))
+        await session.execute(select(*options))
+
+    async def _create_table(self, name: str) -> None:
+        async with self.db_manager.session_factory() as session:
+            existing = await session.scalar(
+                text(
+                    "SELECT format_type(atttypid, atttypmod) FROM pg_attribute "
+                    "WHERE attrelid = to_regclass(:name) AND attname = 'embedding'"
+                ),
+                {"name": _identifier_preparer.quote(name)},
+            )
+            if existing is None:
+                logger.info("Creating %s with %s-dimensional vectors", name, self.vector_size)
+                await session.run_sync(lambda sync_session: self._table(name).create(sync_session.connection()))
+                await session.commit()
+            elif existing != f"vector({self.vector_size})":
+                # A different embedding model, its vectors can't be compared with the stored ones
+                msg = (
+                    f"Table {name} holds {existing} embeddings, the embeddings backend produces {self.vector_size} "
+                    "dimensions. Rebuild the index with: python -m src.cli.reindex_skills"
+                )
+                raise RuntimeError(msg)
+
+    async def _create_index(self, name: str) -> None:
+        async with self.db_manager.session_factory() as session:
+            # Any HNSW index counts, whatever it is named: building a second one would block writes for the whole build
+            existing = await session.scalar(
+                text(
+                    "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = :name "
+                    "AND indexdef LIKE '%USING hnsw%'"
+                ),
+                {"name": name},
+            )
+            if existing is not None:
+                return
+            index = Index(
+                f"ix_{name}_embedding",
+                self._table(name).c.embedding,
+                postgresql_using="hnsw",
+                postgresql_with={"m": self.hnsw_m, "ef_construction": self.hnsw_ef_construction},
+                postgresql_ops={"embedding": "vector_cosine_ops"},
+            )
+            await session.run_sync(lambda sync_session: index.create(sync_session.connection()))
+            await session.commit()
+
+    def _table(self, name: str) -> Table:
+        if name not in self._tables:
+            self._tables[name] = Table(
+                name,
+                MetaData(),
+                Column("skill_id", Integer, primary_key=True, autoincrement=False),
+                Column("type", postgresql.ENUM(SkillType, name="skilltype", create_type=False), nullable=False),
+                Column("user_id", Integer, nullable=False),
+                Column("embedding", Vector(self.vector_size), nullable=False),
+            )
+        return self._tables[name]
+
+    @staticmethod
+    def _distance(table: Table, query_vector: list[float]) -> Any:
+        # Cosine distance, 1 - distance is the cosine similarity Qdrant reports as the score
+        return table.c.embedding.op("<=>", return_type=Float)(query_vector)
+
+    @staticmethod
+    async def _table_exists(session: AsyncSession, name: str) -> bool:
+        return await session.scalar(select(func.to_regclass(_identifier_preparer.quote(name)))) is not None
+
+    @staticmethod
+    async def _rename_table(session: AsyncSession, name: str, new_name: str) -> None:
+        await session.execute(
+            text(f"ALTER TABLE {_identifier_preparer.quote(name)} RENAME TO {_identifier_preparer.quote(new_name)}")
+        )
+        # Index names are derived from the table name and stay behind on a rename, move them along so the live
+        # table's index keeps the name create_collection expects and a reused table name never collides with them
+        indexes = await session.scalars(
+            text("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = :name"),
+            {"name": new_name},
+        )
+        for index_name in indexes.all():
+            if name in index_name:
+                new_index_name = index_name.replace(name, new_name, 1)
+                await session.execute(
+                    text(
+                        f"ALTER INDEX {_identifier_preparer.quote(index_name)} "
+                        f"RENAME TO {_identifier_preparer.quote(new_index_name)}"
+                    )
+                )
@@ -1,6 +1,6 @@
 from src.schemas.base import BaseReadSchema, BaseSchema
-from src.schemas.skills import SkillBulkDelete, SkillCreate, SkillRead, SkillUpdate
-from src.schemas.user import UserCreate, UserRead, UserUpdate
+from src.schemas.skills import SkillBulkDelete, SkillCreate, SkillRead, SkillSearchRead, SkillUpdate
+from src.schemas.user import UserCreate, UserRead, UserSummary, UserUpdate
 
 __all__ = [
     "BaseReadSchema",
@@ -8,8 +8,10 @@ __all__ = [
     "SkillBulkDelete",
     "SkillCreate",
     "SkillRead",
+    "SkillSearchRead",
     "SkillUpdate",
     "UserCreate",
     "UserRead",
+    "UserSummary",
     "UserUpdate",
 ]
@@ -28,6 +28,14 @@ class MessageRead(BaseReadSchema):
     sender: UserRead | None = Field(None, description="Информация об отправителе")
 
 
+class MessagesPage(BaseModel):
+    items: list[MessageRead] = Field(description="Сообщения, от новых к старым")
+    total: int | None = Field(None, description="Общее количество сообщений, только при пагинации через offset")
+    has_more: bool = Field(description="Есть ли еще сообщения в направлении прокрутки")
+    before_cursor: str | None = Field(None, description="Курсор для загрузки более старых сообщений (параметр before)")
+    after_cursor: str | None = Field(None, description="Курсор для загрузки более новых сообщений (параметр after)")
+
+
 class ChatCreate(BaseModel):
     user1_id: int = Field(..., gt=0, description="ID первого пользователя")
     user2_id: int = Field(..., gt=0, description="ID второго пользователя")
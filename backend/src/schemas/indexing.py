@@ -0,0 +1,10 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class IndexingLagRead(BaseModel):
+    pending: int = Field(description="Количество навыков, ожидающих индексации")
+    failed: int = Field(description="Количество задач индексации, исчерпавших попытки")
+    oldest_pending_at: datetime | None = Field(None, description="Время постановки самой старой ожидающей задачи")
+    lag_seconds: float = Field(description="Отставание индекса от базы данных в секундах")
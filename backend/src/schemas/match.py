@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+
+from src.schemas.user import UserRead
+
+
+class MatchRead(BaseModel):
+    user: UserRead
+    score: float = Field(description="Взаимная оценка совпадения (гармоническое среднее offer_score и demand_score)")
+    offer_score: float = Field(
+        description="Насколько навыки пользователя покрывают то, чему хочет научиться текущий пользователь"
+    )
+    demand_score: float = Field(
+        description="Насколько навыки текущего пользователя покрывают то, чему хочет научиться пользователь"
+    )
+    offered_skill_ids: list[int] = Field(
+        description="OUTGOING-навыки пользователя, совпавшие с INCOMING-навыками текущего"
+    )
+    wanted_skill_ids: list[int] = Field(
+        description="INCOMING-навыки пользователя, совпавшие с OUTGOING-навыками текущего"
+    )
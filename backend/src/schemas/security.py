@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+
+
+class PasswordHashingStatsRead(BaseModel):
+    workers: int = Field(description="Количество потоков хеширования паролей")
+    max_queue_size: int = Field(description="Максимальное количество операций, ожидающих свободного потока")
+    running: int = Field(description="Операций хеширования, выполняющихся сейчас")
+    queued: int = Field(description="Операций хеширования, ожидающих свободного потока")
+    completed: int = Field(description="Завершенных операций с момента запуска")
+    rejected: int = Field(description="Операций, отклоненных из-за переполнения очереди")
+    avg_wait_ms: float = Field(description="Среднее время ожидания в очереди, мс")
+    max_wait_ms: float = Field(description="Максимальное время ожидания в очереди, мс")
+    avg_run_ms: float = Field(description="Среднее время хеширования, мс")
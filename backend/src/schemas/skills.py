@@ -2,7 +2,7 @@ from pydantic import BaseModel, Field
 
 from src.enums.skill_type import SkillType
 from src.schemas.base import BaseReadSchema, BaseSchema
-from src.schemas.user import UserRead
+from src.schemas.user import UserRead, UserSummary
 
 
 class SkillCreate(BaseSchema):
@@ -11,6 +11,10 @@ class SkillCreate(BaseSchema):
     description: str | None = Field(None, max_length=1000)
 
 
+class SkillBulkCreate(BaseModel):
+    skills: list[SkillCreate] = Field(min_length=1, max_length=100)
+
+
 class SkillUpdate(BaseModel):
     name: str | None = Field(None, min_length=1, max_length=255)
     description: str | None = Field(None, max_length=1000)
@@ -24,5 +28,13 @@ class SkillRead(BaseReadSchema):
     user: UserRead | None = None
 
 
+class SkillSearchRead(BaseReadSchema):
+    type: SkillType
+    name: str
+    description: str | None = None
+    user_id: int
+    user: UserSummary | None = None
+
+
 class SkillBulkDelete(BaseModel):
     skill_ids: list[int] = Field(min_length=1)
@@ -35,6 +35,10 @@ class UserRead(BaseReadSchema):
     email: EmailStr
 
 
+class UserSummary(BaseReadSchema):
+    username: str
+
+
 class UserUpdate(BaseModel):
     username: str | None = Field(None, min_length=3, max_length=50)
     email: EmailStr | None = Field(None, min_length=3, max_length=255)
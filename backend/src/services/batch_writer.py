@@ -0,0 +1,119 @@
+import asyncio
+import contextlib
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Generic, TypeVar
+
+from sqlalchemy.exc import DataError, IntegrityError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Errors caused by the rows themselves, retrying the same batch can't fix them but its other rows can still be written
+ROW_ERRORS = (DataError, IntegrityError)
+
+
+class BatchWriter(Generic[T]):
+    """Buffers items and writes them in batches from a background task, draining the buffer on stop."""
+
+    def __init__(
+        self,
+        write: Callable[[list[T]], Awaitable[None]],
+        *,
+        name: str,
+        flush_interval: float,
+        max_batch_size: int,
+        max_flush_attempts: int = 3,
+        on_written: Callable[[list[T]], None] | None = None,
+        on_failed: Callable[[list[T], Exception], None] | None = None,
+    ) -> None:
+        self._write = write
+        self.name = name
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.max_flush_attempts = max_flush_attempts
+        self._on_written = on_written
+        self._on_failed = on_failed
+        self._items: list[T] = []
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        # The loop is never cancelled: a batch it has taken from the buffer is written before it exits
+        self._stopping = True
+        self._wakeup.set()
+        await asyncio.shield(self._task)
+        self._task = None
+        await self._drain()
+
+    def append(self, item: T) -> None:
+        self._items.append(item)
+        if len(self._items) >= self.max_batch_size:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            self._wakeup.clear()
+            await self._drain()
+
+    async def _drain(self) -> None:
+        while self._items:
+            batch, self._items = self._items[: self.max_batch_size], self._items[self.max_batch_size :]
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[T]) -> None:
+        for attempt in range(1, self.max_flush_attempts + 1):
+            error = await self._try_write(batch)
+            if error is None:
+                self._written(batch)
+                return
+            if isinstance(error, ROW_ERRORS):
+                await self._bisect(batch, error)
+                return
+            if attempt == self.max_flush_attempts:
+                self._fail(batch, error)
+                return
+            logger.warning("Failed to persist %s %s, retrying", len(batch), self.name, exc_info=error)
+            await asyncio.sleep(self.flush_interval * 2**attempt)
+
+    async def _bisect(self, batch: list[T], error: Exception) -> None:
+        # Halves are written in order, so a single bad item costs O(log n) extra statements instead of the batch
+        if len(batch) == 1:
+            self._fail(batch, error)
+            return
+        middle = len(batch) // 2
+        for half in (batch[:middle], batch[middle:]):
+            half_error = await self._try_write(half)
+            if half_error is None:
+                self._written(half)
+            elif isinstance(half_error, ROW_ERRORS):
+                await self._bisect(half, half_error)
+            else:
+                self._fail(half, half_error)
+
+    async def _try_write(self, batch: list[T]) -> Exception | None:
+        try:
+            await self._write(batch)
+        except Exception as e:  # noqa: BLE001
+            return e
+        return None
+
+    def _written(self, batch: list[T]) -> None:
+        if self._on_written is not None:
+            self._on_written(batch)
+
+    def _fail(self, batch: list[T], error: Exception) -> None:
+        logger.error("Failed to persist %s %s", len(batch), self.name, exc_info=error)
+        if self._on_failed is not None:
+            self._on_failed(batch, error)
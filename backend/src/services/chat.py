@@ -1,8 +1,10 @@
 from collections.abc import Sequence
 
 from src.exceptions.chat import ChatAccessDeniedError, ChatNotFoundError, InvalidChatMembersError
+from src.exceptions.pagination import InvalidCursorError
 from src.repositories.chat import ChatRepository, MessageRepository
-from src.schemas.chat import ChatListItem, ChatRead, MessageRead
+from src.repositories.pagination import decode_cursor, encode_cursor
+from src.schemas.chat import ChatListItem, ChatRead, MessageRead, MessagesPage
 
 
 class ChatService:
@@ -43,31 +45,19 @@ class ChatService:
     async def get_user_chats_with_messages(
         self, current_user_id: int, limit: int = 50, offset: int = 0
     ) -> tuple[Sequence[ChatListItem], int]:
-        chats, total = await self.chat_repository.get_user_chats(current_user_id, limit, offset)
-        result = []
-
-        for chat in chats:
-            other_user = chat.user2 if chat.user1_id == current_user_id else chat.user1
-
-            messages, _ = await self.message_repository.get_chat_messages(chat.id, limit=1, offset=0)
-            last_message = None
-            last_message_at = None
-
-            if messages:
-                last_msg = messages[0]
-                last_message = MessageRead.model_validate(last_msg)
-                last_message_at = last_msg.created_at.isoformat() if last_msg.created_at else None
-
-            chat_item = ChatListItem(
+        chats, total = await self.chat_repository.get_user_chats_with_last_message(current_user_id, limit, offset)
+        result = [
+            ChatListItem(
                 id=chat.id,
                 created_at=chat.created_at,
                 user1_id=chat.user1_id,
                 user2_id=chat.user2_id,
-                other_user=other_user,
-                last_message=last_message,
-                last_message_at=last_message_at,
+                other_user=chat.user2 if chat.user1_id == current_user_id else chat.user1,
+                last_message=MessageRead.model_validate(chat.last_message) if chat.last_message else None,
+                last_message_at=chat.last_message_at.isoformat() if chat.last_message_at else None,
             )
-            result.append(chat_item)
+            for chat in chats
+        ]
 
         return result, total
 
@@ -102,3 +92,40 @@ class ChatService:
 
         messages, total = await self.message_repository.get_chat_messages(chat_id, limit, offset)
         return [MessageRead.model_validate(msg) for msg in messages], total
+
+    async def get_chat_messages_page(
+        self,
+        chat_id: int,
+        current_user_id: int,
+        limit: int = 100,
+        offset: int = 0,
+        *,
+        before: str | None = None,
+        after: str | None = None,
+    ) -> MessagesPage:
+        if before is not None and after is not None:
+            msg = "Only one of before and after cursors can be used"
+            raise InvalidCursorError(msg)
+
+        if before is None and after is None:
+            messages, total = await self.get_chat_messages(chat_id, current_user_id, limit, offset)
+            return MessagesPage(
+                items=messages,
+                total=total,
+                has_more=offset + len(messages) < total,
+                before_cursor=encode_cursor(messages[-1].created_at, messages[-1].id) if messages else None,
+                after_cursor=encode_cursor(messages[0].created_at, messages[0].id) if messages else None,
+            )
+
+        before_key = decode_cursor(before) if before is not None else None
+        after_key = decode_cursor(after) if after is not None else None
+        await self.get_chat(chat_id, current_user_id)
+        messages, has_more = await self.message_repository.get_chat_messages_by_cursor(
+            chat_id, limit, before=before_key, after=after_key
+        )
+        return MessagesPage(
+            items=[MessageRead.model_validate(message) for message in messages],
+            has_more=has_more,
+            before_cursor=encode_cursor(messages[-1].created_at, messages[-1].id) if messages else before,
+            after_cursor=encode_cursor(messages[0].created_at, messages[0].id) if messages else after,
+        )
@@ -0,0 +1,128 @@
+from collections import defaultdict
+from collections.abc import Sequence
+
+from src.enums.skill_type import SkillType
+from src.models.skills import Skill
+from src.repositories.embeddings import EmbeddingsRepository
+from src.repositories.match_recommendations import MatchRecommendationsRepository
+from src.repositories.skill import SkillRepository
+from src.repositories.user import UserRepository
+from src.repositories.vector_search import ScoredSkill, VectorSearchRepository
+from src.schemas.match import MatchRead
+from src.schemas.user import UserRead
+
+OPPOSITE_SKILL_TYPE = {
+    SkillType.INCOMING: SkillType.OUTGOING,
+    SkillType.OUTGOING: SkillType.INCOMING,
+}
+
+
+class _SideScore:
+    def __init__(self) -> None:
+        self.best: dict[int, float] = {}
+        self.skill_ids: set[int] = set()
+
+    def add(self, own_skill_id: int, point: ScoredSkill) -> None:
+        if point.score > self.best.get(own_skill_id, 0.0):
+            self.best[own_skill_id] = point.score
+        self.skill_ids.add(point.id)
+
+    def score(self, total_skills: int) -> float:
+        return sum(self.best.values()) / total_skills if total_skills else 0.0
+
+
+class MatchService:
+    def __init__(
+        self,
+        skill_repository: SkillRepository,
+        user_repository: UserRepository,
+        vector_search_repository: VectorSearchRepository,
+        embeddings_repository: EmbeddingsRepository,
+        match_recommendations_repository: MatchRecommendationsRepository,
+        *,
+        candidates_per_skill: int = 50,
+        top_k: int = 100,
+    ) -> None:
+        self.skill_repository = skill_repository
+        self.user_repository = user_repository
+        self.vector_search_repository = vector_search_repository
+        self.embeddings_repository = embeddings_repository
+        self.match_recommendations_repository = match_recommendations_repository
+        self.candidates_per_skill = candidates_per_skill
+        self.top_k = top_k
+
+    async def get_matches(self, user_id: int, limit: int = 20, offset: int = 0) -> tuple[Sequence[MatchRead], int]:
+        skills = await self.skill_repository.get_all_by_user_id(user_id)
+        wanted = [skill for skill in skills if skill.type == SkillType.INCOMING]
+        offered = [skill for skill in skills if skill.type == SkillType.OUTGOING]
+        if not wanted or not offered:
+            return [], 0
+
+        vectors = await self._get_vectors(skills)
+        # One batched request for all own skills: every INCOMING skill looks for OUTGOING skills of other
+        # users and vice versa, so the cost doesn't grow with a round trip per skill.
+        results = await self.vector_search_repository.search_batch(
+            [(vectors[skill.id], OPPOSITE_SKILL_TYPE[skill.type]) for skill in skills],
+            exclude_user_id=user_id,
+            limit=self.candidates_per_skill,
+        )
+
+        offer_scores: defaultdict[int, _SideScore] = defaultdict(_SideScore)
+        demand_scores: defaultdict[int, _SideScore] = defaultdict(_SideScore)
+        for skill, points in zip(skills, results, strict=True):
+            side_scores = offer_scores if skill.type == SkillType.INCOMING else demand_scores
+            for point in points:
+                candidate_id = (point.payload or {}).get("user_id")
+                if candidate_id is None or candidate_id == user_id:
+                    continue
+                side_scores[candidate_id].add(skill.id, point)
+
+        ranked = []
+        for candidate_id in offer_scores.keys() & demand_scores.keys():
+            offer_score = offer_scores[candidate_id].score(len(wanted))
+            demand_score = demand_scores[candidate_id].score(len(offered))
+            if offer_score <= 0 or demand_score <= 0:
+                continue
+            score = 2 * offer_score * demand_score / (offer_score + demand_score)
+            ranked.append((score, offer_score, demand_score, candidate_id))
+        ranked.sort(reverse=True)
+
+        page = ranked[offset : offset + limit]
+        users = {user.id: user for user in await self.user_repository.get_by_ids([item[3] for item in page])}
+        matches = [
+            MatchRead(
+                user=UserRead.model_validate(users[candidate_id]),
+                score=score,
+                offer_score=offer_score,
+                demand_score=demand_score,
+                offered_skill_ids=sorted(offer_scores[candidate_id].skill_ids),
+                wanted_skill_ids=sorted(demand_scores[candidate_id].skill_ids),
+            )
+            for score, offer_score, demand_score, candidate_id in page
+            if candidate_id in users
+        ]
+        return matches, len(ranked)
+
+    async def get_recommendations(
+        self, user_id: int, limit: int = 20, offset: int = 0
+    ) -> tuple[Sequence[MatchRead], int]:
+        cached = await self.match_recommendations_repository.get(user_id, limit, offset)
+        if cached is not None:
+            return cached
+
+        matches = await self.refresh_recommendations(user_id)
+        return matches[offset : offset + limit], len(matches)
+
+    async def refresh_recommendations(self, user_id: int) -> Sequence[MatchRead]:
+        matches, _ = await self.get_matches(user_id, limit=self.top_k)
+        await self.match_recommendations_repository.replace(user_id, matches)
+        return matches
+
+    async def _get_vectors(self, skills: Sequence[Skill]) -> dict[int, list[float]]:
+        # Indexed skills reuse the stored vectors, the ones still waiting in the outbox are embedded on the fly
+        vectors = await self.vector_search_repository.get_vectors([skill.id for skill in skills])
+        missing = [skill for skill in skills if skill.id not in vectors]
+        if missing:
+            embeddings = await self.embeddings_repository.get_embeddings([skill.name for skill in missing])
+            vectors.update({skill.id: embedding for skill, embedding in zip(missing, embeddings, strict=True)})
+        return vectors
@@ -0,0 +1,109 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import UTC, datetime
+
+from src.db.manager import DatabaseManager
+from src.repositories.chat import MessageRepository
+from src.schemas.chat import MessageRead
+from src.services.batch_writer import BatchWriter
+
+
+class MessageWriter(ABC):
+    async def start(self) -> None:  # noqa: B027
+        pass
+
+    async def stop(self) -> None:  # noqa: B027
+        pass
+
+    @abstractmethod
+    async def write(self, chat_id: int, sender_id: int, text: str) -> MessageRead: ...
+
+
+class ImmediateMessageWriter(MessageWriter):
+    def __init__(self, db_manager: DatabaseManager) -> None:
+        self.db_manager = db_manager
+
+    async def write(self, chat_id: int, sender_id: int, text: str) -> MessageRead:
+        # Membership is checked once when the websocket connects, so a message costs a single statement
+        async with self.db_manager.session_factory() as session:
+            message = await MessageRepository(session).create(chat_id, sender_id, text)
+            await session.commit()
+        return MessageRead.model_validate(message)
+
+
+class WriteBehindMessageWriter(MessageWriter):
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        *,
+        ack_after_flush: bool = True,
+        flush_interval: float = 0.005,
+        max_batch_size: int = 500,
+        id_block_size: int = 100,
+        max_flush_attempts: int = 3,
+    ) -> None:
+        self.db_manager = db_manager
+        self.ack_after_flush = ack_after_flush
+        self.id_block_size = id_block_size
+        self._ids: deque[int] = deque()
+        self._ids_lock = asyncio.Lock()
+        self._writer = BatchWriter[tuple[dict, asyncio.Future[None]]](
+            self._insert,
+            name="chat messages",
+            flush_interval=flush_interval,
+            max_batch_size=max_batch_size,
+            max_flush_attempts=max_flush_attempts,
+            on_written=self._resolve,
+            on_failed=self._reject,
+        )
+
+    async def start(self) -> None:
+        await self._writer.start()
+
+    async def stop(self) -> None:
+        await self._writer.stop()
+
+    async def write(self, chat_id: int, sender_id: int, text: str) -> MessageRead:
+        now = datetime.now(UTC)
+        row = {
+            "id": await self._next_id(),
+            "chat_id": chat_id,
+            "sender_id": sender_id,
+            "text": text,
+            "created_at": now,
+            "updated_at": now,
+        }
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        # Without ack_after_flush nobody awaits the future, keep a failed flush from logging it as unretrieved
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._writer.append((row, future))
+
+        if self.ack_after_flush:
+            await asyncio.shield(future)
+        return MessageRead.model_validate(row)
+
+    async def _next_id(self) -> int:
+        # Ids come from the messages sequence in blocks, so a message can be broadcast before it is inserted
+        async with self._ids_lock:
+            if not self._ids:
+                async with self.db_manager.session_factory() as session:
+                    self._ids.extend(await MessageRepository(session).allocate_ids(self.id_block_size))
+            return self._ids.popleft()
+
+    async def _insert(self, batch: list[tuple[dict, asyncio.Future[None]]]) -> None:
+        async with self.db_manager.session_factory() as session:
+            await MessageRepository(session).bulk_create([row for row, _ in batch])
+            await session.commit()
+
+    @staticmethod
+    def _resolve(batch: list[tuple[dict, asyncio.Future[None]]]) -> None:
+        for _, future in batch:
+            if not future.done():
+                future.set_result(None)
+
+    @staticmethod
+    def _reject(batch: list[tuple[dict, asyncio.Future[None]]], error: Exception) -> None:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
@@ -0,0 +1,61 @@
+from datetime import datetime
+
+from src.db.manager import DatabaseManager
+from src.repositories.refresh_token import RefreshTokenRepository
+from src.services.batch_writer import BatchWriter
+
+Rotation = tuple[str, str, datetime]
+
+
+class RefreshTokenAuditWriter:
+    """Mirrors Redis refresh token rotations and revocations into Postgres off the request path."""
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        *,
+        flush_interval: float = 0.05,
+        max_batch_size: int = 500,
+        max_flush_attempts: int = 3,
+    ) -> None:
+        self.db_manager = db_manager
+        # Redis stays authoritative for token validity, a lost event only leaves the audit trail stale
+        self._writer = BatchWriter[Rotation | int](
+            self._persist,
+            name="refresh token events",
+            flush_interval=flush_interval,
+            max_batch_size=max_batch_size,
+            max_flush_attempts=max_flush_attempts,
+        )
+
+    async def start(self) -> None:
+        await self._writer.start()
+
+    async def stop(self) -> None:
+        await self._writer.stop()
+
+    def record_rotation(self, old_token: str, new_token: str, expires_at: datetime) -> None:
+        self._writer.append((old_token, new_token, expires_at))
+
+    def record_revocation(self, user_id: int) -> None:
+        self._writer.append(user_id)
+
+    async def _persist(self, batch: list[Rotation | int]) -> None:
+        async with self.db_manager.session_factory() as session:
+            await self._apply(RefreshTokenRepository(session), batch)
+            await session.commit()
+
+    @staticmethod
+    async def _apply(repository: RefreshTokenRepository, batch: list[Rotation | int]) -> None:
+        # Events are applied in order, a token can be rotated more than once within a batch
+        rotations: list[Rotation] = []
+        for event in batch:
+            if isinstance(event, tuple):
+                rotations.append(event)
+                continue
+            if rotations:
+                await repository.rotate_many(rotations)
+                rotations = []
+            await repository.deactivate_by_user_ids([event])
+        if rotations:
+            await repository.rotate_many(rotations)
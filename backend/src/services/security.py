@@ -1,13 +1,95 @@
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TypeVar
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from src.exceptions.auth import PasswordHashingOverloadedError
+from src.schemas.security import PasswordHashingStatsRead
+
+T = TypeVar("T")
+
+# argon2 hashes new passwords, bcrypt hashes from before the switch still verify and get replaced on login
+pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
 
 
 class SecurityService:
-    @staticmethod
-    def verify_password(plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+    def __init__(self, *, max_workers: int = 4, max_queue_size: int = 32) -> None:
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        # argon2-cffi and bcrypt release the GIL, so threads hash in parallel without blocking the event loop
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hashing")
+        self._in_flight = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_run = 0.0
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+        """Return whether the password matches and, if the hash uses outdated settings, a replacement hash."""
+        return await self._run(pwd_context.verify_and_update, plain_password, hashed_password)
+
+    async def get_password_hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    def get_stats(self) -> PasswordHashingStatsRead:
+        return PasswordHashingStatsRead(
+            workers=self.max_workers,
+            max_queue_size=self.max_queue_size,
+            running=self._running,
+            queued=self._in_flight - self._running,
+            completed=self._completed,
+            rejected=self._rejected,
+            avg_wait_ms=self._total_wait / self._completed * 1000 if self._completed else 0.0,
+            max_wait_ms=self._max_wait * 1000,
+            avg_run_ms=self._total_run / self._completed * 1000 if self._completed else 0.0,
+        )
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    async def _run(self, func: Callable[..., T], *args: str) -> T:
+        # Admission control: past the queue limit a login fails fast instead of waiting behind seconds of hashing
+        if self._in_flight >= self.max_workers + self.max_queue_size:
+            self._rejected += 1
+            msg = "Too many password hashing requests, try again later"
+            raise PasswordHashingOverloadedError(msg)
+
+        loop = asyncio.get_running_loop()
+        submitted_at = time.perf_counter()
+
+        def job() -> T:
+            started_at = time.perf_counter()
+            loop.call_soon_threadsafe(self._on_started, started_at - submitted_at)
+            try:
+                return func(*args)
+            finally:
+                loop.call_soon_threadsafe(self._on_finished, time.perf_counter() - started_at)
+
+        self._in_flight += 1
+        try:
+            future: Future[T] = self._executor.submit(job)
+        except RuntimeError:
+            self._in_flight -= 1
+            raise
+        # A cancelled request doesn't stop the hash already queued, so the slot is freed only when the job is done
+        future.add_done_callback(lambda done: done.cancelled() and loop.call_soon_threadsafe(self._on_cancelled))
+        return await asyncio.wrap_future(future)
+
+    def _on_started(self, wait: float) -> None:
+        self._running += 1
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+
+    def _on_finished(self, run: float) -> None:
+        self._running -= 1
+        self._in_flight -= 1
+        self._completed += 1
+        self._total_run += run
 
-    @staticmethod
-    def get_password_hash(password: str) -> str:
-        return pwd_context.hash(password)
+    def _on_cancelled(self) -> None:
+        self._in_flight -= 1
@@ -1,11 +1,14 @@
 from collections.abc import Sequence
 
+from pydantic import ValidationError
+
 from src.enums.skill_type import SkillType
 from src.exceptions.skill import SkillAccessDeniedError, SkillNotFoundError
 from src.repositories.embeddings import EmbeddingsRepository
 from src.repositories.skill import SkillRepository
+from src.repositories.skill_index_task import SkillIndexTaskRepository
 from src.repositories.vector_search import VectorSearchRepository
-from src.schemas.skills import SkillRead, SkillUpdate
+from src.schemas.skills import SkillCreate, SkillRead, SkillSearchRead, SkillUpdate
 
 
 class SkillService:
@@ -14,10 +17,15 @@ class SkillService:
         skill_repository: SkillRepository,
         vector_search_repository: VectorSearchRepository,
         embeddings_repository: EmbeddingsRepository,
+        skill_index_task_repository: SkillIndexTaskRepository,
+        *,
+        verify_search_results: bool = False,
     ) -> None:
         self.skill_repository = skill_repository
         self.vector_search_repository = vector_search_repository
         self.embeddings_repository = embeddings_repository
+        self.skill_index_task_repository = skill_index_task_repository
+        self.verify_search_results = verify_search_results
 
     async def create_skill(
         self, user_id: int, current_user_id: int, name: str, skill_type: SkillType, description: str | None = None
@@ -27,10 +35,18 @@ class SkillService:
             raise SkillAccessDeniedError(msg)
 
         skill = await self.skill_repository.create(user_id=user_id, name=name, type=skill_type, description=description)
-        embedding = await self.embeddings_repository.get_embedding(name)
-        await self.vector_search_repository.add_skill(skill.id, embedding, payload={"type": skill_type.value})
+        await self.skill_index_task_repository.enqueue([skill.id])
         return SkillRead.model_validate(skill)
 
+    async def bulk_create_skills(self, user_id: int, skills: list[SkillCreate]) -> Sequence[SkillRead]:
+        # Embedding and the Qdrant upsert happen in the indexing worker, which handles the whole batch in one call each
+        created = await self.skill_repository.bulk_create(
+            user_id,
+            [{"name": skill.name, "type": skill.type, "description": skill.description} for skill in skills],
+        )
+        await self.skill_index_task_repository.enqueue([skill.id for skill in created])
+        return [SkillRead.model_validate(skill) for skill in created]
+
     async def get_user_skills(
         self, user_id: int, skill_type: SkillType | None = None, limit: int = 100, offset: int = 0
     ) -> tuple[Sequence[SkillRead], int]:
@@ -67,18 +83,34 @@ class SkillService:
         skill_type: SkillType | None = None,
         limit: int = 10,
         offset: int = 0,
-    ) -> tuple[Sequence[SkillRead], int]:
+    ) -> tuple[Sequence[SkillSearchRead], int]:
         embedding = await self.embeddings_repository.get_embedding(query)
-        response, total = await self.vector_search_repository.search(embedding, skill_type, limit, offset)
-        skill_ids = [point.id for point in response.points]
-        skills = await self.get_skills_by_id(skill_ids)
-        skills_in_correct_order = []
-        for skill_id in skill_ids:
-            next_elem = next(filter(lambda skill: skill.id == skill_id, skills), None)
-            if next_elem:
-                skills_in_correct_order.append(next_elem)
-
-        return skills_in_correct_order, total
+        points, total = await self.vector_search_repository.search(embedding, skill_type, limit, offset)
+        skill_ids = [point.id for point in points]
+
+        skills_by_id: dict[int, SkillSearchRead] = {}
+        if not self.verify_search_results:
+            for point in points:
+                snapshot = self._read_snapshot(point.id, point.payload)
+                if snapshot is not None:
+                    skills_by_id[snapshot.id] = snapshot
+
+        # Verify mode reads every hit from Postgres, otherwise only points indexed before payloads carried a snapshot
+        missing_ids = [skill_id for skill_id in skill_ids if skill_id not in skills_by_id]
+        if missing_ids:
+            skills = await self.skill_repository.get_by_ids(missing_ids)
+            skills_by_id.update((skill.id, SkillSearchRead.model_validate(skill)) for skill in skills)
+
+        return [skills_by_id[skill_id] for skill_id in skill_ids if skill_id in skills_by_id], total
+
+    @staticmethod
+    def _read_snapshot(skill_id: int, payload: dict | None) -> SkillSearchRead | None:
+        if not payload or "name" not in payload or "user" not in payload:
+            return None
+        try:
+            return SkillSearchRead.model_validate({**payload, "id": skill_id})
+        except ValidationError:
+            return None
 
     async def update_skill(self, skill_id: int, current_user_id: int, update_data: SkillUpdate) -> SkillRead:
         skill = await self.skill_repository.get(skill_id)
@@ -93,10 +125,7 @@ class SkillService:
         updated_skill = await self.skill_repository.update(
             skill_id=skill_id, name=update_data.name, description=update_data.description
         )
-        embedding = await self.embeddings_repository.get_embedding(updated_skill.name)
-        await self.vector_search_repository.add_skill(
-            updated_skill.id, embedding, payload={"type": updated_skill.type.value}
-        )
+        await self.skill_index_task_repository.enqueue([updated_skill.id])
         return SkillRead.model_validate(updated_skill)
 
     async def delete_skill(self, skill_id: int, current_user_id: int) -> None:
@@ -110,19 +139,23 @@ class SkillService:
             raise SkillAccessDeniedError(msg)
 
         await self.skill_repository.delete(skill_id)
-        await self.vector_search_repository.delete_skill(skill_id)
+        await self.skill_index_task_repository.enqueue([skill_id])
 
     async def bulk_delete_skills(self, skill_ids: list[int], current_user_id: int) -> None:
-        skills = []
+        # Three statements whatever the size: ownership check, DELETE ... RETURNING, outbox insert.
+        # Qdrant points are removed by the indexing worker in one call per batch.
+        skill_ids = list(dict.fromkeys(skill_ids))
+        if not skill_ids:
+            return
+
+        owner_ids = await self.skill_repository.get_owner_ids(skill_ids)
         for skill_id in skill_ids:
-            skill = await self.skill_repository.get(skill_id)
-            if not skill:
+            if skill_id not in owner_ids:
                 msg = f"Skill {skill_id} not found"
                 raise SkillNotFoundError(msg)
-            if skill.user_id != current_user_id:
-                msg = "You can only delete your own skills"
-                raise SkillAccessDeniedError(msg)
-            skills.append(skill)
+        if any(owner_id != current_user_id for owner_id in owner_ids.values()):
+            msg = "You can only delete your own skills"
+            raise SkillAccessDeniedError(msg)
 
-        await self.skill_repository.bulk_delete(skill_ids)
-        await self.vector_search_repository.delete_skills(skill_ids)
+        deleted_ids = await self.skill_repository.bulk_delete(skill_ids, current_user_id)
+        await self.skill_index_task_repository.enqueue(list(deleted_ids))
@@ -0,0 +1,132 @@
+import logging
+from collections.abc import Sequence
+from datetime import UTC, datetime
+
+from redis.exceptions import RedisError
+
+from src.models.skills import Skill
+from src.repositories.embeddings import EmbeddingsRepository
+from src.repositories.match_recommendations import MatchRecommendationsRepository
+from src.repositories.skill import SkillRepository
+from src.repositories.skill_index_task import SkillIndexTaskRepository
+from src.repositories.vector_search import VectorSearchRepository
+from src.schemas.indexing import IndexingLagRead
+from src.schemas.skills import SkillSearchRead
+from src.services.match import OPPOSITE_SKILL_TYPE
+
+logger = logging.getLogger(__name__)
+
+
+class SkillIndexingService:
+    def __init__(
+        self,
+        skill_index_task_repository: SkillIndexTaskRepository,
+        skill_repository: SkillRepository,
+        embeddings_repository: EmbeddingsRepository,
+        vector_search_repository: VectorSearchRepository,
+        match_recommendations_repository: MatchRecommendationsRepository,
+        *,
+        neighbours_limit: int = 50,
+        max_attempts: int = 10,
+        retry_base_delay: float = 1.0,
+        retry_max_delay: float = 300.0,
+    ) -> None:
+        self.skill_index_task_repository = skill_index_task_repository
+        self.skill_repository = skill_repository
+        self.embeddings_repository = embeddings_repository
+        self.vector_search_repository = vector_search_repository
+        self.match_recommendations_repository = match_recommendations_repository
+        self.neighbours_limit = neighbours_limit
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+
+    @staticmethod
+    def build_payload(skill: Skill) -> dict:
+        # The search snapshot lets search answer from Qdrant alone, the owner is reduced to id and username so no
+        # contact data is copied into the vector store. "type" and "user_id" double as filter keys
+        return SkillSearchRead.model_validate(skill).model_dump(mode="json", exclude={"id"})
+
+    async def process_batch(self, batch_size: int) -> int:
+        tasks = await self.skill_index_task_repository.claim_batch(batch_size, self.max_attempts)
+        if not tasks:
+            return 0
+
+        # A task only says "this skill changed", the current Postgres row decides whether to upsert or delete,
+        # so duplicated or reordered tasks for the same skill converge to the same state. Two workers may still
+        # claim different tasks of one skill: the sync lock keeps an older snapshot from being written last, the
+        # tasks of skills locked elsewhere stay queued and are claimed again once that worker commits.
+        locked_ids = await self.skill_index_task_repository.lock_skills(
+            list(dict.fromkeys(task.skill_id for task in tasks))
+        )
+        tasks = [task for task in tasks if task.skill_id in locked_ids]
+        if not tasks:
+            return 0
+
+        task_ids = [task.id for task in tasks]
+        skill_ids = list(dict.fromkeys(task.skill_id for task in tasks))
+        try:
+            # A failed statement aborts the transaction, the savepoint keeps it usable for the reschedule
+            async with self.skill_index_task_repository.savepoint():
+                await self._sync_skills(skill_ids)
+        except Exception as e:
+            logger.exception("Failed to index skills %s", skill_ids)
+            await self.skill_index_task_repository.reschedule(
+                task_ids, repr(e), self.retry_base_delay, self.retry_max_delay
+            )
+        else:
+            await self.skill_index_task_repository.complete(task_ids)
+        return len(tasks)
+
+    async def _sync_skills(self, skill_ids: list[int]) -> None:
+        skills = await self.skill_repository.get_by_ids(skill_ids)
+        existing_ids = {skill.id for skill in skills}
+        deleted_ids = [skill_id for skill_id in skill_ids if skill_id not in existing_ids]
+        affected_user_ids = {skill.user_id for skill in skills}
+
+        if skills:
+            embeddings = await self.embeddings_repository.get_embeddings([skill.name for skill in skills])
+            await self.vector_search_repository.add_skills(
+                [
+                    (skill.id, embedding, self.build_payload(skill))
+                    for skill, embedding in zip(skills, embeddings, strict=True)
+                ]
+            )
+            affected_user_ids |= await self._get_neighbour_user_ids(skills, embeddings)
+        if deleted_ids:
+            affected_user_ids |= await self.vector_search_repository.get_user_ids(deleted_ids)
+            await self.vector_search_repository.delete_skills(deleted_ids)
+
+        await self._mark_recommendations_dirty(affected_user_ids)
+
+    async def _get_neighbour_user_ids(self, skills: Sequence[Skill], embeddings: list[list[float]]) -> set[int]:
+        # Users close to the new vector may start matching the owner, users that matched the old one
+        # are found through the reverse index when the owner is marked dirty.
+        results = await self.vector_search_repository.search_batch(
+            [(embedding, OPPOSITE_SKILL_TYPE[skill.type]) for skill, embedding in zip(skills, embeddings, strict=True)],
+            limit=self.neighbours_limit,
+        )
+        return {
+            point.payload["user_id"]
+            for points in results
+            for point in points
+            if point.payload and "user_id" in point.payload
+        }
+
+    async def _mark_recommendations_dirty(self, user_ids: set[int]) -> None:
+        try:
+            await self.match_recommendations_repository.mark_dirty(sorted(user_ids))
+        except RedisError:
+            logger.warning("Failed to mark match recommendations of users %s as dirty", user_ids, exc_info=True)
+
+    async def get_lag(self) -> IndexingLagRead:
+        pending, failed, oldest_pending_at = await self.skill_index_task_repository.get_lag(self.max_attempts)
+        lag_seconds = 0.0
+        if oldest_pending_at is not None:
+            lag_seconds = max((datetime.now(UTC) - oldest_pending_at).total_seconds(), 0.0)
+        return IndexingLagRead(
+            pending=pending,
+            failed=failed,
+            oldest_pending_at=oldest_pending_at,
+            lag_seconds=lag_seconds,
+        )
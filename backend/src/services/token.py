@@ -1,29 +1,38 @@
+import secrets
 from datetime import UTC, datetime, timedelta
 
-from jose import ExpiredSignatureError, JWTError, jwt
-
 from src.core.config import settings
+from src.core.jwt import JWTBackend
 from src.exceptions.auth import (
     InactiveOrNotExistingUserError,
     InvalidJWTError,
     InvalidTokenError,
     JWTSignatureExpiredError,
+    RefreshTokenReusedError,
 )
-from src.models.token import RefreshToken
-from src.models.user import User
+from src.repositories.principal_cache import PrincipalCacheRepository
 from src.repositories.refresh_token import RefreshTokenRepository
+from src.repositories.refresh_token_cache import RefreshTokenCacheRepository, RotationResult
 from src.repositories.user import UserRepository
 from src.schemas.token import Token
+from src.schemas.user import UserRead
+from src.services.refresh_token_audit import RefreshTokenAuditWriter
 
 
 class TokenService:
     def __init__(
         self,
         refresh_token_repository: RefreshTokenRepository,
+        refresh_token_cache_repository: RefreshTokenCacheRepository,
         user_repository: UserRepository,
+        principal_cache_repository: PrincipalCacheRepository,
+        jwt_backend: JWTBackend,
     ) -> None:
         self.refresh_token_repository = refresh_token_repository
+        self.refresh_token_cache_repository = refresh_token_cache_repository
         self.user_repository = user_repository
+        self.principal_cache_repository = principal_cache_repository
+        self.jwt_backend = jwt_backend
 
     def create_access_token(self, data: dict, expires_delta: timedelta | None = None) -> str:
         to_encode = data.copy()
@@ -32,23 +41,12 @@ class TokenService:
         else:
             expire = datetime.now(tz=UTC) + timedelta(minutes=settings.jwt.access_token_expire_minutes)
         to_encode.update({"exp": expire})
-        return jwt.encode(to_encode, settings.jwt.secret_key, algorithm=settings.jwt.algorithm)
+        return self.jwt_backend.encode(to_encode)
 
     async def verify_token(self, token: str) -> dict:
-        try:
-            return jwt.decode(
-                token,
-                settings.jwt.secret_key,
-                algorithms=settings.jwt.algorithm,
-            )
-        except ExpiredSignatureError:
-            msg = "Could not validate credentials: token has expired"
-            raise JWTSignatureExpiredError(msg) from None
-        except JWTError:
-            msg = "Could not validate credentials: invalid jwt"
-            raise InvalidJWTError(msg) from None
-
-    async def get_current_user(self, token: str | None) -> User:
+        return self.jwt_backend.decode(token)
+
+    async def get_current_user(self, token: str | None) -> UserRead:
         if not token:
             msg = "Could not validate credentials: no scheme or token in Authorization header"
             raise InvalidTokenError(msg)
@@ -60,26 +58,27 @@ class TokenService:
             raise InvalidTokenError(msg)
 
         user_id = int(user_id_str)
+        cached_user = await self.principal_cache_repository.get(user_id)
+        if cached_user is not None:
+            return cached_user
+
         user = await self.user_repository.get(user_id)
 
         if not user:
             msg = "Could not validate credentials: user is inactive or user does not exists"
             raise InactiveOrNotExistingUserError(msg)
 
-        return user
+        principal = UserRead.model_validate(user)
+        await self.principal_cache_repository.set(principal)
+        return principal
 
     async def create_tokens(self, user_id: int) -> Token:
         access_token = self.create_access_token(data={"sub": str(user_id)})
         refresh_token = self.create_access_token(
-            data={"sub": str(user_id)},
+            data={"sub": str(user_id), "jti": secrets.token_urlsafe(16)},
             expires_delta=timedelta(days=settings.jwt.refresh_token_expire_days),
         )
 
-        await self.refresh_token_repository.cache_refresh_token(
-            token=refresh_token,
-            expires_in=settings.jwt.refresh_token_expire_days * 24 * 60 * 60,
-        )
-
         expires_at = datetime.now(tz=UTC) + timedelta(days=settings.jwt.refresh_token_expire_days)
         await self.refresh_token_repository.create(
             user_id=user_id,
@@ -92,52 +91,56 @@ class TokenService:
             refresh_token=refresh_token,
         )
 
+    async def activate_refresh_token(self, user_id: int, refresh_token: str) -> None:
+        # Called once the audit row is committed, a token live in Redis must never lack one
+        await self.refresh_token_cache_repository.add(
+            refresh_token,
+            user_id,
+            expires_in=settings.jwt.refresh_token_expire_days * 24 * 60 * 60,
+        )
 
-class RefreshTokenService:
-    def __init__(self, refresh_token_repository: RefreshTokenRepository) -> None:
-        self.refresh_token_repository = refresh_token_repository
-
-    async def verify_refresh_token(self, token: str) -> RefreshToken:
-        token_in_cache = await self.refresh_token_repository.get_cached_refresh_token(token)
-        if not token_in_cache:
-            msg = "Invalid refresh token"
-            raise InvalidTokenError(msg)
-
-        refresh_token = await self.refresh_token_repository.get_by_token(token)
-        if not refresh_token:
-            msg = "Invalid refresh token"
-            raise InvalidTokenError(msg)
-
-        return refresh_token
-
-    async def update_token(self, refresh_token: RefreshToken, new_token: str, new_expires_at: datetime) -> RefreshToken:
-        await self.refresh_token_repository.update(refresh_token, new_token=new_token, new_expires_at=new_expires_at)
-        return refresh_token
 
-    async def deactivate(self, refresh_token: RefreshToken) -> None:
-        await self.refresh_token_repository.deactivate(refresh_token)
+class RefreshTokenService:
+    def __init__(
+        self,
+        refresh_token_cache_repository: RefreshTokenCacheRepository,
+        audit_writer: RefreshTokenAuditWriter,
+    ) -> None:
+        self.refresh_token_cache_repository = refresh_token_cache_repository
+        self.audit_writer = audit_writer
 
     async def generate_new_refresh_token(self, refresh_token_str: str, token_service: TokenService) -> Token:
-        refresh_token_model = await self.verify_refresh_token(refresh_token_str)
+        # Hot path touches Redis only: the signature gives the user, the rotation script checks and swaps the token
+        try:
+            payload = await token_service.verify_token(refresh_token_str)
+            user_id = int(payload["sub"])
+        except (InvalidJWTError, JWTSignatureExpiredError, KeyError, TypeError, ValueError):
+            msg = "Invalid refresh token"
+            raise InvalidTokenError(msg) from None
 
-        access_token = token_service.create_access_token(data={"sub": str(refresh_token_model.user_id)})
+        access_token = token_service.create_access_token(data={"sub": str(user_id)})
+        # jti keeps two refresh tokens issued within the same second distinct, the rotation relies on it
         new_refresh_token = token_service.create_access_token(
-            data={"sub": str(refresh_token_model.user_id)},
+            data={"sub": str(user_id), "jti": secrets.token_urlsafe(16)},
             expires_delta=timedelta(days=settings.jwt.refresh_token_expire_days),
         )
 
-        expires_at = datetime.now(tz=UTC) + timedelta(days=settings.jwt.refresh_token_expire_days)
-        await self.update_token(
-            refresh_token=refresh_token_model,
-            new_token=new_refresh_token,
-            new_expires_at=expires_at,
-        )
-
-        await self.refresh_token_repository.delete_cached_refresh_token(refresh_token_str)
-        await self.refresh_token_repository.cache_refresh_token(
-            token=new_refresh_token,
+        result = await self.refresh_token_cache_repository.rotate(
+            refresh_token_str,
+            new_refresh_token,
+            user_id,
             expires_in=settings.jwt.refresh_token_expire_days * 24 * 60 * 60,
         )
+        if result is RotationResult.REUSED:
+            self.audit_writer.record_revocation(user_id)
+            msg = "Refresh token has already been used, all sessions were revoked"
+            raise RefreshTokenReusedError(msg)
+        if result is not RotationResult.ROTATED:
+            msg = "Invalid refresh token"
+            raise InvalidTokenError(msg)
+
+        expires_at = datetime.now(tz=UTC) + timedelta(days=settings.jwt.refresh_token_expire_days)
+        self.audit_writer.record_rotation(refresh_token_str, new_refresh_token, expires_at)
 
         return Token(
             access_token=access_token,
@@ -8,14 +8,25 @@ from src.exceptions.user import (
     UserNicknameAlreadyExistsError,
     UserNotFoundError,
 )
+from src.repositories.principal_cache import PrincipalCacheRepository
+from src.repositories.skill_index_task import SkillIndexTaskRepository
 from src.repositories.user import UserRepository
 from src.schemas.user import UserRead
 from src.services.security import SecurityService
 
 
 class UserService:
-    def __init__(self, user_repository: UserRepository) -> None:
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        principal_cache_repository: PrincipalCacheRepository,
+        security_service: SecurityService,
+        skill_index_task_repository: SkillIndexTaskRepository,
+    ) -> None:
         self.user_repository = user_repository
+        self.principal_cache_repository = principal_cache_repository
+        self.security_service = security_service
+        self.skill_index_task_repository = skill_index_task_repository
 
     async def create(self, username: str, email: str, hashed_password: str) -> UserRead:
         if await self.user_repository.get_by_username(username):
@@ -34,9 +45,17 @@ class UserService:
             user = await self.user_repository.get_by_email(email)
         if not user and username:
             user = await self.user_repository.get_by_username(username)
-        if not user or not SecurityService.verify_password(password, user.hashed_password):
+        if not user:
+            msg = "Incorrect email/username or password"
+            raise IncorrectCredentialsError(msg)
+
+        verified, new_hash = await self.security_service.verify_password(password, user.hashed_password)
+        if not verified:
             msg = "Incorrect email/username or password"
             raise IncorrectCredentialsError(msg)
+        if new_hash:
+            # The password is known only here, so hashes from a deprecated scheme are upgraded on login
+            user = await self.user_repository.edit(user.id, hashed_password=new_hash) or user
         return UserRead.model_validate(user)
 
     async def update_user(
@@ -70,8 +89,14 @@ class UserService:
             msg = "Failed to update user"
             raise InvalidUserDataError(msg)
 
+        # Search results are served from the owner snapshot stored with each indexed skill
+        await self.skill_index_task_repository.enqueue_user_skills(user_id)
+
         return UserRead.model_validate(updated_user)
 
+    async def invalidate_principal(self, user_id: int) -> None:
+        await self.principal_cache_repository.invalidate(user_id)
+
     async def edit_user(
         self,
         user_id: int,
@@ -112,4 +137,6 @@ class UserService:
             msg = "Failed to update user"
             raise InvalidUserDataError(msg)
 
+        await self.skill_index_task_repository.enqueue_user_skills(user_id)
+
         return UserRead.model_validate(updated_user)
@@ -0,0 +1,64 @@
+import asyncio
+import contextlib
+import logging
+
+from dishka import AsyncContainer
+
+from src.db.uow import SQLAlchemyUnitOfWork
+from src.repositories.match_recommendations import MatchRecommendationsRepository
+from src.services.match import MatchService
+
+logger = logging.getLogger(__name__)
+
+
+class MatchRecommendationsWorker:
+    def __init__(self, container: AsyncContainer, batch_size: int = 32, poll_interval: float = 1.0) -> None:
+        self._container = container
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                processed = await self._process_batch()
+            except Exception:
+                logger.exception("Match recommendations worker iteration failed")
+                processed = 0
+
+            if processed < self._batch_size:
+                await asyncio.sleep(self._poll_interval)
+
+    async def _process_batch(self) -> int:
+        recommendations_repository = await self._container.get(MatchRecommendationsRepository)
+        user_ids = await recommendations_repository.pop_dirty(self._batch_size)
+        failed = []
+        for user_id in user_ids:
+            try:
+                await self._refresh(user_id)
+            except Exception:
+                logger.exception("Failed to refresh match recommendations of user %s", user_id)
+                failed.append(user_id)
+
+        # Only the user itself is retried, its neighbours were already queued when it was first marked
+        await recommendations_repository.mark_dirty(failed, include_matched_by=False)
+        return len(user_ids)
+
+    async def _refresh(self, user_id: int) -> None:
+        async with self._container() as request_container:
+            match_service = await request_container.get(MatchService)
+            uow = await request_container.get(SQLAlchemyUnitOfWork)
+            async with uow:
+                await match_service.refresh_recommendations(user_id)
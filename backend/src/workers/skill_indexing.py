@@ -0,0 +1,50 @@
+import asyncio
+import contextlib
+import logging
+
+from dishka import AsyncContainer
+
+from src.db.uow import SQLAlchemyUnitOfWork
+from src.services.skill_indexing import SkillIndexingService
+
+logger = logging.getLogger(__name__)
+
+
+class SkillIndexingWorker:
+    def __init__(self, container: AsyncContainer, batch_size: int = 128, poll_interval: float = 0.5) -> None:
+        self._container = container
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                processed = await self._process_batch()
+            except Exception:
+                logger.exception("Skill indexing worker iteration failed")
+                processed = 0
+
+            if processed < self._batch_size:
+                await asyncio.sleep(self._poll_interval)
+
+    async def _process_batch(self) -> int:
+        async with self._container() as request_container:
+            indexing_service = await request_container.get(SkillIndexingService)
+            uow = await request_container.get(SQLAlchemyUnitOfWork)
+            async with uow:
+                processed = await indexing_service.process_batch(self._batch_size)
+                await uow.commit()
+        return processed
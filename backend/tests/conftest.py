@@ -0,0 +1,27 @@
+import os
+
+import pytest
+
+# src.core builds Settings at import time, the unit tests never reach these services
+for name, value in {
+    "SERVER__URL": "http://localhost:8000",
+    "SERVER__HOST": "127.0.0.1",
+    "SERVER__PORT": "8000",
+    "SERVER__ALLOWED_ORIGINS": '["http://localhost:3000"]',
+    "POSTGRES__USER": "postgres",
+    "POSTGRES__PASSWORD": "postgres",
+    "POSTGRES__HOST": "localhost",
+    "POSTGRES__PORT": "5432",
+    "POSTGRES__DB": "peermatch",
+    "JWT__SECRET_KEY": "test-secret",
+    "REDIS__HOST": "localhost",
+    "REDIS__PORT": "6379",
+    "REDIS__DB": "0",
+    "MODE": "test",
+}.items():
+    os.environ.setdefault(name, value)
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from src.services.batch_writer import BatchWriter
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeTable:
+    """Rejects a whole statement if any of its rows is bad, like a multi-row INSERT."""
+
+    def __init__(self, bad: set[int] | None = None, transient_failures: int = 0) -> None:
+        self.bad = bad or set()
+        self.transient_failures = transient_failures
+        self.rows: list[int] = []
+        self.statements = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def write(self, batch: list[int]) -> None:
+        self.statements += 1
+        self.started.set()
+        await self.release.wait()
+        if self.transient_failures:
+            self.transient_failures -= 1
+            msg = "connection reset"
+            raise OperationalError(msg, {}, Exception(msg))
+        if self.bad & set(batch):
+            msg = "duplicate key"
+            raise IntegrityError(msg, {}, Exception(msg))
+        self.rows.extend(batch)
+
+
+def make_writer(
+    table: FakeTable, *, flush_interval: float = 0.001, max_batch_size: int = 100, max_flush_attempts: int = 3
+) -> tuple[BatchWriter[int], list[int], list[int]]:
+    written: list[int] = []
+    failed: list[int] = []
+    writer = BatchWriter[int](
+        table.write,
+        name="rows",
+        flush_interval=flush_interval,
+        max_batch_size=max_batch_size,
+        max_flush_attempts=max_flush_attempts,
+        on_written=written.extend,
+        on_failed=lambda batch, _: failed.extend(batch),
+    )
+    return writer, written, failed
+
+
+async def test_stop_drains_the_buffer() -> None:
+    table = FakeTable()
+    writer, written, _ = make_writer(table, flush_interval=60, max_batch_size=3)
+    await writer.start()
+
+    for row in range(7):
+        writer.append(row)
+    await writer.stop()
+
+    assert table.rows == list(range(7))
+    assert written == list(range(7))
+
+
+async def test_stop_waits_for_the_batch_in_flight() -> None:
+    table = FakeTable()
+    table.release.clear()
+    writer, _, _ = make_writer(table, max_batch_size=2)
+    await writer.start()
+
+    writer.append(1)
+    writer.append(2)
+    await table.started.wait()
+    writer.append(3)
+    stop = asyncio.create_task(writer.stop())
+    await asyncio.sleep(0.01)
+    assert not stop.done()
+
+    table.release.set()
+    await asyncio.wait_for(stop, 1)
+    assert table.rows == [1, 2, 3]
+
+
+async def test_cancelled_stop_still_writes_the_batch_in_flight() -> None:
+    table = FakeTable()
+    table.release.clear()
+    writer, _, _ = make_writer(table, max_batch_size=2)
+    await writer.start()
+
+    writer.append(1)
+    writer.append(2)
+    await table.started.wait()
+    stop = asyncio.create_task(writer.stop())
+    await asyncio.sleep(0)
+    stop.cancel()
+    table.release.set()
+
+    with pytest.raises(asyncio.CancelledError):
+        await stop
+    await asyncio.sleep(0.01)
+    assert table.rows == [1, 2]
+
+
+async def test_bisection_isolates_bad_rows() -> None:
+    table = FakeTable(bad={3, 12})
+    writer, written, failed = make_writer(table, flush_interval=60, max_batch_size=16)
+    await writer.start()
+
+    for row in range(16):
+        writer.append(row)
+    await writer.stop()
+
+    assert failed == [3, 12]
+    assert sorted(written) == sorted(table.rows) == [row for row in range(16) if row not in {3, 12}]
+    # Bisection costs a few statements per bad row, not one per row
+    assert table.statements < 16
+
+
+async def test_transient_errors_are_retried() -> None:
+    table = FakeTable(transient_failures=2)
+    writer, written, failed = make_writer(table, flush_interval=0.001, max_flush_attempts=3)
+    await writer.start()
+
+    writer.append(1)
+    await writer.stop()
+
+    assert written == [1]
+    assert not failed
+    assert table.statements == 3
+
+
+async def test_batch_fails_after_the_last_attempt() -> None:
+    table = FakeTable(transient_failures=10)
+    writer, written, failed = make_writer(table, flush_interval=0.001, max_flush_attempts=2)
+    await writer.start()
+
+    writer.append(1)
+    writer.append(2)
+    await writer.stop()
+
+    assert not written
+    assert failed == [1, 2]
+    assert table.statements == 2
@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+from src.repositories.embeddings_batcher import EmbeddingsBatcher
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeBackend:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(texts)
+        await self.release.wait()
+        return [[float(len(text))] for text in texts]
+
+
+async def test_coalesces_concurrent_requests_into_one_batch() -> None:
+    backend = FakeBackend()
+    batcher = EmbeddingsBatcher(backend.embed_documents, max_batch_size=10, max_delay=0.01)
+
+    results = await asyncio.gather(batcher.embed("python"), batcher.embed("  Python "), batcher.embed("go"))
+
+    assert results == [[6.0], [6.0], [2.0]]
+    assert backend.calls == [["python", "go"]]
+
+
+async def test_joins_a_batch_already_in_flight() -> None:
+    backend = FakeBackend()
+    backend.release.clear()
+    batcher = EmbeddingsBatcher(backend.embed_documents, max_batch_size=1, max_delay=0.01)
+
+    first = asyncio.create_task(batcher.embed("python"))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(batcher.embed("python"))
+    await asyncio.sleep(0)
+    backend.release.set()
+
+    assert await asyncio.gather(first, second) == [[6.0], [6.0]]
+    assert backend.calls == [["python"]]
+
+
+async def test_flushes_full_batches_without_waiting() -> None:
+    backend = FakeBackend()
+    batcher = EmbeddingsBatcher(backend.embed_documents, max_batch_size=2, max_delay=60)
+
+    results = await asyncio.wait_for(batcher.embed_many(["a", "bb", "ccc", "dddd"]), 1)
+
+    assert results == [[1.0], [2.0], [3.0], [4.0]]
+    assert backend.calls == [["a", "bb"], ["ccc", "dddd"]]
+
+
+async def test_length_mismatch_fails_every_waiter() -> None:
+    async def embed_documents(texts: list[str]) -> list[list[float]]:
+        return [[0.0]]
+
+    batcher = EmbeddingsBatcher(embed_documents, max_batch_size=10, max_delay=0.001)
+
+    results = await asyncio.wait_for(asyncio.gather(batcher.embed("a"), batcher.embed("b"), return_exceptions=True), 1)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert not batcher._futures  # noqa: SLF001
+
+
+async def test_backend_error_fails_the_batch_and_is_retried_next_time() -> None:
+    calls = 0
+
+    async def embed_documents(texts: list[str]) -> list[list[float]]:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            msg = "backend is down"
+            raise ConnectionError(msg)
+        return [[1.0] for _ in texts]
+
+    batcher = EmbeddingsBatcher(embed_documents, max_batch_size=10, max_delay=0.001)
+
+    with pytest.raises(ConnectionError):
+        await batcher.embed("a")
+    assert await batcher.embed("a") == [1.0]
+
+
+@pytest.mark.parametrize("started", [False, True], ids=["before-start", "in-flight"])
+async def test_cancelled_batch_cancels_its_waiters(started: bool) -> None:  # noqa: FBT001
+    backend = FakeBackend()
+    backend.release.clear()
+    batcher = EmbeddingsBatcher(backend.embed_documents, max_batch_size=1, max_delay=0.001)
+
+    waiter = asyncio.create_task(batcher.embed("a"))
+    await asyncio.sleep(0)
+    if started:
+        await asyncio.sleep(0)
+        assert backend.calls == [["a"]]
+    for task in list(batcher._tasks):  # noqa: SLF001
+        task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(waiter, 1)
+    assert not batcher._futures  # noqa: SLF001
+
+
+async def test_cancelled_waiter_does_not_cancel_the_batch() -> None:
+    backend = FakeBackend()
+    backend.release.clear()
+    batcher = EmbeddingsBatcher(backend.embed_documents, max_batch_size=1, max_delay=0.001)
+
+    first = asyncio.create_task(batcher.embed("a"))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(batcher.embed("a"))
+    await asyncio.sleep(0)
+    first.cancel()
+    backend.release.set()
+
+    assert await asyncio.wait_for(second, 1) == [1.0]
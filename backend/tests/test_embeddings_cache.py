@@ -0,0 +1,100 @@
+import time
+
+import fakeredis
+import pytest
+
+from src.core.cache import LRUCache
+from src.repositories.embeddings import EmbeddingsRepository
+from src.repositories.embeddings_batcher import EmbeddingsBatcher
+from src.repositories.embeddings_cache import EmbeddingsCacheRepository
+
+pytestmark = pytest.mark.anyio
+
+EMBEDDING = [0.5, -1.25, 3.0]
+
+
+@pytest.fixture
+def redis() -> fakeredis.FakeAsyncRedis:
+    return fakeredis.FakeAsyncRedis()
+
+
+def test_lru_evicts_least_recently_used() -> None:
+    cache: LRUCache[str, int] = LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_lru_expires_entries(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache: LRUCache[str, int] = LRUCache(10, ttl=30)
+    cache.set("a", 1)
+
+    monotonic = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: monotonic + 31)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_lru_with_zero_size_stores_nothing() -> None:
+    cache: LRUCache[str, int] = LRUCache(0)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+
+
+async def test_roundtrip_through_redis(redis: fakeredis.FakeAsyncRedis) -> None:
+    await EmbeddingsCacheRepository(redis, model_id="model").set("Python", EMBEDDING)
+
+    # A fresh repository has an empty LRU, so the hit comes from Redis
+    assert await EmbeddingsCacheRepository(redis, model_id="model").get("  python ") == EMBEDDING
+
+
+async def test_keys_are_scoped_by_model(redis: fakeredis.FakeAsyncRedis) -> None:
+    await EmbeddingsCacheRepository(redis, model_id="model").set("python", EMBEDDING)
+
+    assert await EmbeddingsCacheRepository(redis, model_id="other-model").get("python") is None
+
+
+async def test_get_many_keeps_positions(redis: fakeredis.FakeAsyncRedis) -> None:
+    cache = EmbeddingsCacheRepository(redis, model_id="model")
+    await cache.set("b", EMBEDDING)
+
+    assert await cache.get_many(["a", "b", "c"]) == [None, EMBEDDING, None]
+
+
+async def test_lru_answers_without_redis(redis: fakeredis.FakeAsyncRedis) -> None:
+    cache = EmbeddingsCacheRepository(redis, model_id="model")
+    await cache.set("python", EMBEDDING)
+    await redis.flushall()
+
+    assert await cache.get("python") == EMBEDDING
+
+
+async def test_unavailable_redis_is_a_miss() -> None:
+    cache = EmbeddingsCacheRepository(fakeredis.FakeAsyncRedis(connected=False), model_id="model")
+
+    await cache.set("python", EMBEDDING)
+    assert await cache.get("go") is None
+    assert await cache.get("python") == EMBEDDING
+
+
+async def test_repository_embeds_only_misses(redis: fakeredis.FakeAsyncRedis) -> None:
+    calls: list[list[str]] = []
+
+    async def embed_documents(texts: list[str]) -> list[list[float]]:
+        calls.append(texts)
+        return [[float(len(text))] for text in texts]
+
+    cache = EmbeddingsCacheRepository(redis, model_id="model")
+    await cache.set("cached", EMBEDDING)
+    repository = EmbeddingsRepository(EmbeddingsBatcher(embed_documents, max_delay=0.001), cache)
+
+    assert await repository.get_embeddings(["cached", "new"]) == [EMBEDDING, [3.0]]
+    assert await repository.get_embeddings(["new"]) == [[3.0]]
+    assert calls == [["new"]]
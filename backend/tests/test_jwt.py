@@ -0,0 +1,159 @@
+import base64
+import json
+import time
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.core.jwt import CachingJWTBackend, HMACJWTBackend, JoseJWTBackend, JWTBackend
+from src.exceptions.auth import InvalidJWTError, JWTSignatureExpiredError
+
+SECRET = "test-secret"
+
+
+def b64(data: dict | list | bytes) -> str:
+    raw = data if isinstance(data, bytes) else json.dumps(data, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def claims(**overrides: object) -> dict:
+    return {"sub": "42", "exp": datetime.now(UTC) + timedelta(minutes=5)} | overrides
+
+
+@pytest.fixture
+def backend() -> HMACJWTBackend:
+    return HMACJWTBackend(SECRET)
+
+
+def test_roundtrip(backend: HMACJWTBackend) -> None:
+    decoded = backend.decode(backend.encode(claims(role="user")))
+
+    assert decoded["sub"] == "42"
+    assert decoded["role"] == "user"
+    assert isinstance(decoded["exp"], int)
+
+
+@pytest.mark.parametrize("algorithm", ["HS256", "HS384", "HS512"])
+@pytest.mark.parametrize(
+    ("signer", "verifier"),
+    [(JoseJWTBackend, HMACJWTBackend), (HMACJWTBackend, JoseJWTBackend)],
+    ids=["jose-to-hmac", "hmac-to-jose"],
+)
+def test_interoperates_with_jose(algorithm: str, signer: type[JWTBackend], verifier: type[JWTBackend]) -> None:
+    token = signer(SECRET, algorithm).encode(claims())
+
+    assert verifier(SECRET, algorithm).decode(token)["sub"] == "42"
+
+
+def test_rejects_alg_none(backend: HMACJWTBackend) -> None:
+    token = f"{b64({'alg': 'none', 'typ': 'JWT'})}.{b64(claims(exp=int(time.time()) + 60))}."
+
+    with pytest.raises(InvalidJWTError):
+        backend.decode(token)
+
+
+def test_rejects_alg_none_with_valid_signature_segment(backend: HMACJWTBackend) -> None:
+    # The signature is only trusted for the configured algorithm, whatever the header claims
+    _, payload, signature = backend.encode(claims()).split(".")
+    token = f"{b64({'alg': 'none', 'typ': 'JWT'})}.{payload}.{signature}"
+
+    with pytest.raises(InvalidJWTError):
+        backend.decode(token)
+
+
+def test_rejects_other_hmac_algorithm() -> None:
+    token = HMACJWTBackend(SECRET, "HS512").encode(claims())
+
+    with pytest.raises(InvalidJWTError):
+        HMACJWTBackend(SECRET, "HS256").decode(token)
+
+
+def test_rejects_wrong_secret(backend: HMACJWTBackend) -> None:
+    token = HMACJWTBackend("another-secret").encode(claims())
+
+    with pytest.raises(InvalidJWTError):
+        backend.decode(token)
+
+
+def test_rejects_tampered_payload(backend: HMACJWTBackend) -> None:
+    header, _, signature = backend.encode(claims()).split(".")
+    token = f"{header}.{b64(claims(sub='1', exp=int(time.time()) + 60))}.{signature}"
+
+    with pytest.raises(InvalidJWTError):
+        backend.decode(token)
+
+
+def test_rejects_unsupported_algorithm() -> None:
+    with pytest.raises(ValueError, match="RS256"):
+        HMACJWTBackend(SECRET, "RS256")
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "",
+        "abc",
+        "a.b",
+        "a.b.c.d",
+        "!!!.???.***",
+        f"{b64({'alg': 'HS256'})}.not-base64!.sig",
+        f"{b64(b'not json')}.{b64({'sub': '42'})}.sig",
+        b64({"alg": "HS256"}) + "." + b64(b"\xff\xfe") + ".sig",
+        f"{b64([1, 2])}.{b64({'sub': '42'})}.sig",
+        "ключ.ключ.ключ",
+    ],
+)
+def test_rejects_malformed_tokens(backend: HMACJWTBackend, token: str) -> None:
+    with pytest.raises(InvalidJWTError):
+        backend.decode(token)
+
+
+def test_rejects_non_object_payload(backend: HMACJWTBackend) -> None:
+    signing_input = f"{b64({'alg': 'HS256', 'typ': 'JWT'})}.{b64(b'[1,2]')}"
+    token = f"{signing_input}.{backend._sign(signing_input.encode()).decode()}"  # noqa: SLF001
+
+    with pytest.raises(InvalidJWTError):
+        backend.decode(token)
+
+
+def test_rejects_expired_token(backend: HMACJWTBackend) -> None:
+    token = backend.encode(claims(exp=datetime.now(UTC) - timedelta(seconds=1)))
+
+    with pytest.raises(JWTSignatureExpiredError):
+        backend.decode(token)
+
+
+def test_rejects_non_numeric_exp(backend: HMACJWTBackend) -> None:
+    token = backend.encode(claims(exp="tomorrow"))
+
+    with pytest.raises(JWTSignatureExpiredError):
+        backend.decode(token)
+
+
+def test_rejects_token_before_nbf(backend: HMACJWTBackend) -> None:
+    token = backend.encode(claims(nbf=datetime.now(UTC) + timedelta(minutes=1)))
+
+    with pytest.raises(InvalidJWTError):
+        backend.decode(token)
+
+
+def test_expired_token_agrees_with_jose() -> None:
+    token = JoseJWTBackend(SECRET).encode(claims(exp=datetime.now(UTC) - timedelta(seconds=1)))
+
+    with pytest.raises(JWTSignatureExpiredError):
+        HMACJWTBackend(SECRET).decode(token)
+    with pytest.raises(JWTSignatureExpiredError):
+        JoseJWTBackend(SECRET).decode(token)
+
+
+def test_cache_does_not_serve_expired_tokens(backend: HMACJWTBackend, monkeypatch: pytest.MonkeyPatch) -> None:
+    caching = CachingJWTBackend(backend)
+    exp = int(time.time()) + 60
+    token = backend.encode(claims(exp=exp))
+    assert caching.decode(token)["sub"] == "42"
+
+    monotonic = time.monotonic()
+    monkeypatch.setattr(time, "time", lambda: exp + 1)
+    monkeypatch.setattr(time, "monotonic", lambda: monotonic + 61)
+    with pytest.raises(JWTSignatureExpiredError):
+        caching.decode(token)
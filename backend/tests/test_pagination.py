@@ -0,0 +1,71 @@
+import base64
+from datetime import UTC, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import Select
+from sqlalchemy.dialects import postgresql
+
+from src.exceptions.pagination import InvalidCursorError
+from src.repositories import chat
+from src.repositories.pagination import decode_cursor, encode_cursor
+
+
+@pytest.mark.parametrize(
+    "created_at",
+    [
+        datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=UTC),
+        datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=3))),
+    ],
+)
+def test_cursor_roundtrip(created_at: datetime) -> None:
+    cursor = encode_cursor(created_at, 42)
+
+    assert decode_cursor(cursor) == (created_at, 42)
+
+
+def test_cursor_is_url_safe() -> None:
+    cursor = encode_cursor(datetime(2025, 1, 2, tzinfo=UTC), 2**62)
+
+    assert "=" not in cursor
+    assert base64.urlsafe_b64encode(base64.urlsafe_b64decode(cursor + "==")).decode().rstrip("=") == cursor
+    assert set(cursor) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+
+
+def b64(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "not a cursor",
+        "!!!",
+        b64(b"\xff\xfe"),
+        b64(b"{}"),
+        b64(b"[1]"),
+        b64(b'["2025-01-02T00:00:00+00:00"]'),
+        b64(b'["yesterday", 1]'),
+        b64(b'["2025-01-02T00:00:00+00:00", "one"]'),
+        b64(b'["2025-01-02T00:00:00+00:00", null]'),
+        b64(b'["2025-01-02T00:00:00+00:00", 1, 2]'),
+    ],
+)
+def test_invalid_cursor(cursor: str) -> None:
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.anyio
+async def test_offset_pages_order_by_the_cursor_key(monkeypatch: pytest.MonkeyPatch) -> None:
+    statements: list[Select] = []
+
+    async def paginate(session: object, stmt: Select, limit: int, offset: int) -> tuple[list, int]:
+        statements.append(stmt)
+        return [], 0
+
+    monkeypatch.setattr(chat, "paginate", paginate)
+    await chat.MessageRepository(None).get_chat_messages(1)  # type: ignore[arg-type]
+
+    order_by = str(statements[0].compile(dialect=postgresql.dialect())).split("ORDER BY")[1]
+    assert order_by.split(",")[:2] == [" messages.created_at DESC", " messages.id DESC"]
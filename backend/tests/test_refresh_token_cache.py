@@ -0,0 +1,69 @@
+import fakeredis
+import pytest
+
+from src.repositories.refresh_token_cache import (
+    KEY_PREFIX,
+    ROTATED_KEY_PREFIX,
+    USER_KEY_PREFIX,
+    RefreshTokenCacheRepository,
+    RotationResult,
+)
+
+pytestmark = pytest.mark.anyio
+
+USER_ID = 7
+TTL = 3600
+
+
+@pytest.fixture
+def redis() -> fakeredis.FakeAsyncRedis:
+    return fakeredis.FakeAsyncRedis(decode_responses=True)
+
+
+@pytest.fixture
+def cache(redis: fakeredis.FakeAsyncRedis) -> RefreshTokenCacheRepository:
+    return RefreshTokenCacheRepository(redis, reuse_grace_period=10)
+
+
+async def test_rotates_a_live_token(redis: fakeredis.FakeAsyncRedis, cache: RefreshTokenCacheRepository) -> None:
+    await cache.add("old", USER_ID, TTL)
+
+    assert await cache.rotate("old", "new", USER_ID, TTL) == RotationResult.ROTATED
+    assert await redis.get(f"{KEY_PREFIX}old") is None
+    assert await redis.get(f"{KEY_PREFIX}new") == str(USER_ID)
+    assert await redis.exists(f"{ROTATED_KEY_PREFIX}old")
+    assert await redis.smembers(f"{USER_KEY_PREFIX}{USER_ID}") == {"new"}
+
+
+async def test_unknown_token_is_not_found(cache: RefreshTokenCacheRepository) -> None:
+    assert await cache.rotate("missing", "new", USER_ID, TTL) == RotationResult.NOT_FOUND
+
+
+async def test_reuse_within_grace_period_is_concurrent(
+    redis: fakeredis.FakeAsyncRedis, cache: RefreshTokenCacheRepository
+) -> None:
+    await cache.add("old", USER_ID, TTL)
+    await cache.rotate("old", "new", USER_ID, TTL)
+
+    assert await cache.rotate("old", "newer", USER_ID, TTL) == RotationResult.CONCURRENT
+    # A concurrent refresh of the same token revokes nothing and issues nothing
+    assert await redis.get(f"{KEY_PREFIX}new") == str(USER_ID)
+    assert await redis.get(f"{KEY_PREFIX}newer") is None
+
+
+async def test_reuse_after_grace_period_revokes_every_token(
+    redis: fakeredis.FakeAsyncRedis, cache: RefreshTokenCacheRepository
+) -> None:
+    await cache.add("old", USER_ID, TTL)
+    await cache.add("other-device", USER_ID, TTL)
+    await cache.add("someone-else", USER_ID + 1, TTL)
+    await cache.rotate("old", "new", USER_ID, TTL)
+    seconds, _ = await redis.time()
+    await redis.set(f"{ROTATED_KEY_PREFIX}old", seconds - 11)
+
+    assert await cache.rotate("old", "newer", USER_ID, TTL) == RotationResult.REUSED
+    assert await redis.get(f"{KEY_PREFIX}new") is None
+    assert await redis.get(f"{KEY_PREFIX}other-device") is None
+    assert not await redis.exists(f"{USER_KEY_PREFIX}{USER_ID}", f"{ROTATED_KEY_PREFIX}old")
+    assert await redis.get(f"{KEY_PREFIX}someone-else") == str(USER_ID + 1)
+    assert await cache.rotate("new", "newest", USER_ID, TTL) == RotationResult.NOT_FOUND
@@ -0,0 +1,115 @@
+import contextlib
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import DataError
+
+from src.services.skill_indexing import SkillIndexingService
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeTransaction:
+    """Mimics Postgres: after a failed statement everything but a rollback fails until the rollback."""
+
+    def __init__(self) -> None:
+        self.aborted = False
+
+    def execute(self) -> None:
+        if self.aborted:
+            msg = "current transaction is aborted, commands ignored until end of transaction block"
+            raise DataError(msg, {}, Exception(msg))
+
+
+class FakeTaskRepository:
+    def __init__(self, transaction: FakeTransaction, tasks: list[SimpleNamespace]) -> None:
+        self.transaction = transaction
+        self.tasks = tasks
+        self.completed: list[int] = []
+        self.rescheduled: list[tuple[list[int], str]] = []
+
+    async def claim_batch(self, limit: int, max_attempts: int) -> list[SimpleNamespace]:
+        return self.tasks[:limit]
+
+    async def lock_skills(self, skill_ids: list[int]) -> set[int]:
+        return set(skill_ids)
+
+    @contextlib.asynccontextmanager
+    async def savepoint(self) -> AsyncIterator[None]:
+        try:
+            yield
+        except Exception:
+            self.transaction.aborted = False
+            raise
+
+    async def complete(self, task_ids: list[int]) -> None:
+        self.transaction.execute()
+        self.completed.extend(task_ids)
+
+    async def reschedule(self, task_ids: list[int], error: str, base_delay: float, max_delay: float) -> None:
+        self.transaction.execute()
+        self.rescheduled.append((task_ids, error))
+
+
+class FailingSkillRepository:
+    def __init__(self, transaction: FakeTransaction) -> None:
+        self.transaction = transaction
+
+    async def get_by_ids(self, skill_ids: list[int]) -> list:
+        self.transaction.aborted = True
+        msg = "invalid input"
+        raise DataError(msg, {}, Exception(msg))
+
+
+class EmptySkillRepository:
+    async def get_by_ids(self, skill_ids: list[int]) -> list:
+        return []
+
+
+class FakeVectorSearchRepository:
+    async def get_user_ids(self, skill_ids: list[int]) -> set[int]:
+        return set()
+
+    async def delete_skills(self, skill_ids: list[int]) -> None:
+        pass
+
+
+class FakeMatchRecommendationsRepository:
+    async def mark_dirty(self, user_ids: list[int]) -> None:
+        pass
+
+
+def make_service(task_repository: FakeTaskRepository, skill_repository: object) -> SkillIndexingService:
+    return SkillIndexingService(
+        task_repository,  # type: ignore[arg-type]
+        skill_repository,  # type: ignore[arg-type]
+        None,  # type: ignore[arg-type]
+        FakeVectorSearchRepository(),  # type: ignore[arg-type]
+        FakeMatchRecommendationsRepository(),  # type: ignore[arg-type]
+    )
+
+
+TASKS = [SimpleNamespace(id=1, skill_id=10), SimpleNamespace(id=2, skill_id=10), SimpleNamespace(id=3, skill_id=11)]
+
+
+async def test_failed_sync_is_rescheduled_in_the_same_transaction() -> None:
+    transaction = FakeTransaction()
+    tasks = FakeTaskRepository(transaction, TASKS)
+
+    processed = await make_service(tasks, FailingSkillRepository(transaction)).process_batch(10)
+
+    assert processed == len(TASKS)
+    assert not tasks.completed
+    assert [task_ids for task_ids, _ in tasks.rescheduled] == [[1, 2, 3]]
+    assert "invalid input" in tasks.rescheduled[0][1]
+
+
+async def test_synced_tasks_are_completed() -> None:
+    tasks = FakeTaskRepository(FakeTransaction(), TASKS)
+
+    processed = await make_service(tasks, EmptySkillRepository()).process_batch(10)
+
+    assert processed == len(TASKS)
+    assert tasks.completed == [1, 2, 3]
+    assert not tasks.rescheduled